@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Compare single-pass chain grouping in `BaseModel.process_algorithm_data` with
+the previous per-chain boolean-mask filtering on synthetic assemblies.
+
+Usage:
+    python benchmarks/bench_chain_grouping.py
+"""
+import timeit
+
+import numpy as np
+
+from struct_draw.algorithms.base_algorithm import ResidueRecords
+from struct_draw.structures.pdb_model import BaseModel, Chain
+
+CHAIN_COUNTS = [10, 100, 500]
+RESIDUES_PER_CHAIN = 300
+REPEATS = 5
+LEGACY_DTYPE = [('residue_index', 'i4'), ('insertion_code', 'U1'), ('chain_id', 'U4'),
+                ('AA', 'U1'), ('SS', 'U6'), ('SS_code', 'U1')]
+
+
+class PrecomputedModel(BaseModel):
+    """
+    Model whose algorithm data is handed in directly.
+    """
+    def load_algorithm_data(self) -> ResidueRecords:
+        return self._algorithm_out
+
+    def parse_b_factor(self) -> None:
+        pass
+
+
+def make_assembly(n_chains: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    n_residues = n_chains * RESIDUES_PER_CHAIN
+    data = np.zeros(n_residues, dtype=LEGACY_DTYPE)
+    # Multi-character IDs, as used by mmCIF assemblies with more than 62 chains
+    data['chain_id'] = np.repeat([f"{chr(ord('A') + i % 26)}{i // 26 or ''}" for i in range(n_chains)],
+                                 RESIDUES_PER_CHAIN)
+    data['residue_index'] = np.tile(np.arange(1, RESIDUES_PER_CHAIN + 1), n_chains)
+    data['insertion_code'] = ' '
+    data['AA'] = rng.choice(list("ACDEFGHIKLMNPQRSTVWY"), n_residues)
+    data['SS_code'] = rng.choice(list("HE-"), n_residues)
+    data['SS'] = np.select([data['SS_code'] == 'H', data['SS_code'] == 'E'], ['Helix', 'Strand'], 'Other')
+    return data
+
+
+def legacy_grouping(dssp_data: np.ndarray) -> dict:
+    chains = {}
+    for chain_id in np.unique(dssp_data['chain_id']):
+        chain_data = dssp_data[dssp_data['chain_id'] == chain_id]
+        chains[chain_id] = Chain(chain_id, 'dssp', None, chain_data)
+    return chains
+
+
+def main() -> None:
+    print(f"{'chains':>8} {'residues':>10} {'legacy, ms':>12} {'by chain code, ms':>18} {'speedup':>8}")
+    for n_chains in CHAIN_COUNTS:
+        data = make_assembly(n_chains)
+        model = PrecomputedModel('dssp', algorithm_out=ResidueRecords.from_array(data))
+        expected = legacy_grouping(data)
+        assert list(model.get_chain_list()) == list(expected)
+        assert all(np.array_equal(chain.dssp_data['residue_index'], expected[chain_id].dssp_data['residue_index'])
+                   for chain_id, chain in model.get_chain_list().items())
+        legacy = min(timeit.repeat(lambda: legacy_grouping(data), number=1, repeat=REPEATS))
+        single_pass = min(timeit.repeat(model.process_algorithm_data, number=1, repeat=REPEATS))
+        print(f"{n_chains:>8} {len(data):>10} {legacy * 1e3:>12.2f} {single_pass * 1e3:>18.2f} "
+              f"{legacy / single_pass:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
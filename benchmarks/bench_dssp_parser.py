@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Compare the columnar DSSP parser with the previous line-by-line implementation.
+
+Usage:
+    python benchmarks/bench_dssp_parser.py
+"""
+import re
+import timeit
+
+import numpy as np
+
+from struct_draw.algorithms import DSSP
+
+SIZES = [1_000, 10_000, 100_000]
+REPEATS = 5
+LEGACY_DTYPE = [('residue_index', 'i4'), ('insertion_code', 'U1'), ('chain_id', 'U1'),
+                ('AA', 'U1'), ('SS', 'U6'), ('SS_code', 'U1')]
+HEADER = ("  #  RESIDUE AA STRUCTURE BP1 BP2  ACC     N-H-->O    O-->H-N    N-H-->O    O-->H-N"
+          "    TCO  KAPPA ALPHA  PHI   PSI    X-CA   Y-CA   Z-CA\n")
+
+
+def make_dssp_output(n_residues: int, seed: int = 0) -> str:
+    rng = np.random.default_rng(seed)
+    aa = rng.choice(list("ACDEFGHIKLMNPQRSTVWY"), n_residues)
+    ss = rng.choice(list("HGIEBTS "), n_residues)
+    chains = rng.choice(list("ABCD"), n_residues)
+    lines = ["==== Secondary Structure Definition by the program DSSP ====", HEADER.rstrip('\n')]
+    for i in range(n_residues):
+        if i and i % 500 == 0:
+            lines.append(f"{len(lines) % 100000:5d}        !              0   0    0      0, 0.0     0, 0.0"
+                         "     0, 0.0     0, 0.0   0.000 360.0 360.0 360.0 360.0    0.0    0.0    0.0")
+        lines.append(f"{len(lines) % 100000:5d}{(i + 1) % 100000:5d} {chains[i]} {aa[i]}  {ss[i]}           0   0   42"
+                     "      0, 0.0     2,-0.3     0, 0.0     0, 0.0   0.000 360.0 360.0 360.0  64.2"
+                     "   11.0   25.4   -5.2")
+    return "\n".join(lines) + "\n"
+
+
+def legacy_process_data(algorithm_out: str, ss_translation: dict) -> np.ndarray:
+    is_start = False
+    data = []
+    for line in algorithm_out.split('\n'):
+        if re.search(r"RESIDUE AA STRUCTURE", line):
+            is_start = True
+            continue
+        if not is_start:
+            continue
+        if re.search(r"^$", line):
+            continue
+        if line[11] == ' ':
+            continue
+        residue_index = int(line[5:10])
+        insertion_code = line[10]
+        chain_id = line[11]
+        AA = line[13]
+        SS_code = line[16] if line[16] != ' ' else '-'
+        SS = ss_translation.get(SS_code, 'Other')
+        data.append((residue_index, insertion_code, chain_id, AA, SS, SS_code))
+    return np.array(data, dtype=LEGACY_DTYPE)
+
+
+def main() -> None:
+    dssp = DSSP('mkdssp')
+    print(f"{'residues':>10} {'legacy, ms':>12} {'columnar, ms':>14} {'speedup':>8}")
+    for size in SIZES:
+        text = make_dssp_output(size)
+        expected = legacy_process_data(text, dssp.SS_TRANSLATION)
+        assert np.array_equal(dssp.process_data(text).to_array(), expected)
+        legacy = min(timeit.repeat(lambda: legacy_process_data(text, dssp.SS_TRANSLATION),
+                                   number=1, repeat=REPEATS))
+        columnar = min(timeit.repeat(lambda: dssp.process_data(text), number=1, repeat=REPEATS))
+        print(f"{size:>10} {legacy * 1e3:>12.2f} {columnar * 1e3:>14.2f} {legacy / columnar:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
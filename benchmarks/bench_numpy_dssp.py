@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Measure agreement and speed of the NumPy DSSP implementation against mkdssp
+on a reference set of structure files.
+
+Agreement is the fraction of residues (matched by chain, number and
+insertion code) with the same 8-state code, and with the same 3-state class
+(helix H/G/I, strand E/B, other). Timings cover the whole run: reading the
+file, the assignment and, for mkdssp, starting the process and parsing its output.
+
+Usage:
+    python benchmarks/bench_numpy_dssp.py [--mkdssp PATH] FILE [FILE ...]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from struct_draw.algorithms import DSSP
+from struct_draw.algorithms.numpy_dssp import NumpyDSSP
+
+THREE_STATE = {'H': 'H', 'G': 'H', 'I': 'H', 'E': 'E', 'B': 'E'}
+
+
+def timed(run, pdb_file):
+    start = time.perf_counter()
+    records = run(pdb_file)
+    return records, time.perf_counter() - start
+
+
+def residue_codes(records) -> dict:
+    return {(chain_id, int(row['residue_index']), row['insertion_code']): row['SS_code']
+            for chain_id, row in zip(records.chain_id.tolist(), records.data)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--mkdssp', default='mkdssp')
+    args = parser.parse_args()
+    reference, numpy_dssp = DSSP(args.mkdssp), NumpyDSSP()
+    totals = np.zeros(3)
+    print(f"{'file':<30} {'residues':>9} {'Q8':>7} {'Q3':>7} {'mkdssp, ms':>11} {'numpy, ms':>10}")
+    for pdb_file in args.files:
+        expected, reference_time = timed(reference.run_streaming, pdb_file)
+        computed, numpy_time = timed(numpy_dssp.run_streaming, pdb_file)
+        expected, computed = residue_codes(expected), residue_codes(computed)
+        shared = expected.keys() & computed.keys()
+        same8 = sum(expected[key] == computed[key] for key in shared)
+        same3 = sum(THREE_STATE.get(expected[key], '-') == THREE_STATE.get(computed[key], '-') for key in shared)
+        totals += (len(shared), same8, same3)
+        print(f"{pdb_file[-30:]:<30} {len(shared):>9} {same8 / max(len(shared), 1):>7.1%} "
+              f"{same3 / max(len(shared), 1):>7.1%} {reference_time * 1e3:>11.1f} {numpy_time * 1e3:>10.1f}")
+    print(f"{'total':<30} {int(totals[0]):>9} {totals[1] / max(totals[0], 1):>7.1%} "
+          f"{totals[2] / max(totals[0], 1):>7.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,4 @@
 from .dssp import DSSP
-from .stride import Stride
\ No newline at end of file
+from .stride import Stride
+from .cache import AlgorithmCache, CacheStats
+from .base_algorithm import AlgorithmError, AlgorithmTimeoutError
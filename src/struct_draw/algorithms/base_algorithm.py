@@ -1,8 +1,216 @@
+import asyncio
+import contextlib
+import os
+import shutil
+import subprocess
+import threading
+import weakref
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 
+from ..compression import InMemoryFile, algorithm_input
+from .columns import text_to_buffer, residue_range_mask
+
+RESIDUE_DTYPE = [('residue_index', 'i4'),
+                 ('insertion_code', 'U1'),
+                 ('chain_code', 'u2'),
+                 ('AA', 'U1'),
+                 ('SS', 'U6'),
+                 ('SS_code', 'U1')]
+MAX_CHAINS = np.iinfo(np.uint16).max + 1
+
+STREAM_CHUNK_SIZE = 1 << 22
+
+
+def executable_fingerprint(executable: str) -> str:
+    """
+    Identify a program without a version flag by its resolved path, size and
+    modification time, so that replacing the binary changes the fingerprint.
+
+    Args:
+        executable (str): Name or path of the program.
+
+    Returns:
+        str: 'path:size:mtime_ns', or '' if the program cannot be found.
+    """
+    path = shutil.which(executable)
+    if path is None:
+        return ''
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    return f"{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class AlgorithmError(RuntimeError):
+    """
+    Raised when an algorithm program fails.
+
+    Attributes:
+        command (List[str]): Command line that was run.
+        returncode (Optional[int]): Exit status, None if the program was killed on timeout.
+        stderr (str): Error output of the program.
+    """
+    def __init__(self, command: Sequence[str], returncode: Optional[int], stderr: str, message: Optional[str] = None):
+        if message is None:
+            message = f"{command[0]} exited with status {returncode}"
+        details = stderr.strip()
+        super().__init__(f"{message}: {details}" if details else message)
+        self.command = list(command)
+        self.returncode = returncode
+        self.stderr = stderr
+
+
+class AlgorithmTimeoutError(AlgorithmError, TimeoutError):
+    """
+    Raised when an algorithm program is killed for exceeding its timeout.
+    """
+    def __init__(self, command: Sequence[str], timeout: float, stderr: str):
+        super().__init__(command, None, stderr, f"{command[0]} killed after {timeout} s")
+        self.timeout = timeout
+
+
+@dataclass
+class ResidueRecords:
+    """
+    Residue rows of an algorithm run with categorical chain IDs.
+
+    Chain IDs of any length are stored once in a sorted dictionary; every row
+    holds the uint16 code of its chain, so grouping and filtering by chain
+    work on integers.
+
+    Attributes:
+        data (np.ndarray): Structured array with RESIDUE_DTYPE; `chain_code` indexes `chain_ids`.
+        chain_ids (np.ndarray): Sorted unique chain IDs ('U' array).
+    """
+    data: np.ndarray
+    chain_ids: np.ndarray
+
+    @classmethod
+    def empty(cls) -> 'ResidueRecords':
+        return cls(np.array([], dtype=RESIDUE_DTYPE), np.array([], dtype='U1'))
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> 'ResidueRecords':
+        """
+        Encode a structured array with a string 'chain_id' field (e.g. from a
+        custom algorithm's `process_data`).
+        """
+        chain_ids, chain_code = np.unique(array['chain_id'], return_inverse=True)
+        if len(chain_ids) > MAX_CHAINS:
+            raise ValueError(f"More than {MAX_CHAINS} chains are not supported")
+        data = np.empty(len(array), dtype=RESIDUE_DTYPE)
+        for name in data.dtype.names:
+            if name != 'chain_code':
+                data[name] = array[name]
+        data['chain_code'] = chain_code.ravel()
+        return cls(data, chain_ids.astype(str))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def chain_id(self) -> np.ndarray:
+        """
+        Chain ID of every row.
+        """
+        return self.chain_ids[self.data['chain_code']]
+
+    def codes_of(self, chain_ids: Iterable[str]) -> np.ndarray:
+        """
+        Codes of those of the given chain IDs that occur in the dictionary.
+        """
+        return np.flatnonzero(np.isin(self.chain_ids, list(chain_ids)))
+
+    def select(self, rows: np.ndarray) -> 'ResidueRecords':
+        return ResidueRecords(self.data[rows], self.chain_ids)
+
+    def to_array(self) -> np.ndarray:
+        """
+        Rows as a structured array with a string 'chain_id' field instead of codes.
+        """
+        width = max(1, self.chain_ids.dtype.itemsize // np.dtype('U1').itemsize)
+        dtype = [('chain_id', f'U{width}') if name == 'chain_code' else (name, dtype)
+                 for name, dtype in RESIDUE_DTYPE]
+        array = np.empty(len(self.data), dtype=dtype)
+        for name in array.dtype.names:
+            array[name] = self.chain_id if name == 'chain_id' else self.data[name]
+        return array
+
+
+def encode_chains(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build the chain dictionary and codes from raw chain ID bytes.
+
+    Args:
+        keys (np.ndarray): 'S' array with the chain ID of every row.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Sorted unique chain IDs ('U' array) and
+        the uint16 code of every row.
+    """
+    chain_ids, chain_code = np.unique(keys, return_inverse=True)
+    if len(chain_ids) > MAX_CHAINS:
+        raise ValueError(f"More than {MAX_CHAINS} chains are not supported")
+    return chain_ids.astype(str), chain_code.ravel().astype(np.uint16)
+
+
+def as_records(output: Union[ResidueRecords, np.ndarray]) -> ResidueRecords:
+    """
+    Normalize a `process_data` result to ResidueRecords.
+    """
+    if isinstance(output, ResidueRecords):
+        return output
+    return ResidueRecords.from_array(output)
+
+
+def concatenate_residues(parts: List[ResidueRecords]) -> ResidueRecords:
+    """
+    Join residue records parsed from consecutive output chunks, merging their chain dictionaries.
+    """
+    if not parts:
+        return ResidueRecords.empty()
+    if len(parts) == 1:
+        return parts[0]
+    chain_ids = np.unique(np.concatenate([part.chain_ids for part in parts]))
+    data = np.concatenate([part.data for part in parts])
+    start = 0
+    for part in parts:
+        end = start + len(part.data)
+        remap = np.searchsorted(chain_ids, part.chain_ids).astype(np.uint16)
+        data['chain_code'][start:end] = remap[part.data['chain_code']]
+        start = end
+    return ResidueRecords(data, chain_ids)
+
+
+def _select_rows(records: ResidueRecords, include_only: Optional[Sequence[str]],
+                 residue_range: Optional[Tuple[int, int]]) -> ResidueRecords:
+    selected = residue_range_mask(records.data['residue_index'], residue_range)
+    if include_only is not None:
+        selected &= np.isin(records.data['chain_code'], records.codes_of(include_only))
+    return records.select(selected)
+
+
+def _iter_pipe_chunks(stream, chunk_size: int) -> Iterator[np.ndarray]:
+    """
+    Read a binary pipe as consecutive buffers of whole lines (see `text_to_buffer`).
+
+    Chunks are cut after a newline, so a multi-byte character is never split.
+    """
+    tail = b''
+    for block in iter(lambda: stream.read(chunk_size), b''):
+        cut = block.rfind(b'\n') + 1
+        if cut == 0:
+            tail += block
+            continue
+        yield text_to_buffer((tail + block[:cut]).decode(errors='replace'))
+        tail = block[cut:]
+    if tail:
+        yield text_to_buffer(tail.decode(errors='replace'))
+
+
 class BaseAlgorithm(ABC):
     """
     Abstract base class for secondary‐structure prediction algorithms.
@@ -17,13 +225,304 @@ class BaseAlgorithm(ABC):
         Identifier or sub‑name of the specific algorithm implementation.
     _ss_translation : Optional[Dict[str, str]]
         Dictionary for translating secondary‑structure codes (SS_code) into human‑readable labels.
+    PIPE_INPUT : bool
+        Whether compressed input may be streamed to the program through a pipe;
+        otherwise it is decompressed into a scratch file for the run.
+    cache : Optional[AlgorithmCache]
+        On-disk cache consulted by `run_cached`; None disables caching.
+    max_concurrent_runs : int
+        Number of `run_async` subprocesses allowed at once per event loop.
+    timeout : Optional[float]
+        Wall-clock limit in seconds of `run` and `run_streaming`; the program is killed on expiry.
+    STREAMING : bool
+        Whether `parse_stream` parses output chunk by chunk.
+    FILTERS_ROWS : bool
+        Whether `process_data` and `parse_stream` accept `include_only` and
+        `residue_range` and skip rows outside them while scanning.
+    READS_ATOMS : bool
+        Whether the algorithm runs in-process on an atom table through its own
+        `run_atoms` method, so a model can hand it the table it has already read
+        instead of the file.
+    VERSION_FLAG : Optional[str]
+        Flag printing the version banner of the executable; None for programs
+        without one, which are identified by a fingerprint of the executable.
     """
-    def __init__(self, algorithm_sub_name: str, ss_translation: Optional[Dict[str,str]]):
+    PIPE_INPUT = True
+    STREAMING = False
+    FILTERS_ROWS = False
+    READS_ATOMS = False
+    VERSION_FLAG = '--version'
+    cache = None
+    timeout = None
+    max_concurrent_runs = os.cpu_count() or 1
+    _version = None
+    _semaphores = None
+
+    def __init__(self, algorithm_sub_name: str, ss_translation: Optional[Dict[str,str]],
+                 cache: Optional['AlgorithmCache'] = None, timeout: Optional[float] = None):
         self._algorithm_sub_name = algorithm_sub_name
         self.SS_TRANSLATION = ss_translation
+        self.cache = cache
+        self.timeout = timeout
 	
     def __str__(self):
         return self._algorithm_sub_name
+
+    def command(self, pdb_file: str) -> List[str]:
+        """
+        Command line running the algorithm on a file; the input path comes last.
+        """
+        return [self._algorithm_sub_name, pdb_file]
+
+    def version(self) -> str:
+        """
+        Version banner of the executable (first line of the output of `VERSION_FLAG`),
+        or its fingerprint (see `executable_fingerprint`) if the program has no version
+        flag; '' if it cannot be run.
+        """
+        if self._version is None:
+            if self.VERSION_FLAG is None:
+                self._version = executable_fingerprint(self._algorithm_sub_name)
+                return self._version
+            try:
+                p = subprocess.run([self._algorithm_sub_name, self.VERSION_FLAG], capture_output=True,
+                                   universal_newlines=True, timeout=30)
+                banner = (p.stdout or p.stderr).strip()
+                self._version = banner.splitlines()[0] if banner else ''
+            except (OSError, subprocess.TimeoutExpired):
+                self._version = ''
+        return self._version
+
+    def run_cached(self, pdb_file: Union[str, InMemoryFile]) -> str:
+        """
+        Run the algorithm through its cache, if one is set.
+        """
+        if self.cache is None:
+            return self.run(pdb_file)
+        return self.cache.run(self, pdb_file)
+
+    def _run_command(self, pdb_file: Union[str, InMemoryFile]) -> str:
+        """
+        Run `command` on a file and return its whole output.
+
+        Raises:
+            AlgorithmTimeoutError: If the program exceeded `timeout`.
+            AlgorithmError: If the program exited with a non-zero status.
+        """
+        with algorithm_input(pdb_file, self.PIPE_INPUT) as source:
+            command = self.command(source.path)
+            p = subprocess.Popen(command, universal_newlines=True, pass_fds=source.pass_fds,
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            try:
+                out, err = p.communicate(timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                p.kill()
+                out, err = p.communicate()
+                raise AlgorithmTimeoutError(command, self.timeout, err or '')
+        if p.returncode:
+            raise AlgorithmError(command, p.returncode, err or '')
+        return out
+
+    def run_streaming(self, pdb_file: Union[str, InMemoryFile], chunk_size: int = STREAM_CHUNK_SIZE,
+                      include_only: Optional[Sequence[str]] = None,
+                      residue_range: Optional[Tuple[int, int]] = None) -> ResidueRecords:
+        """
+        Run the algorithm and parse its output straight from the stdout pipe.
+
+        The output is never held as a whole: every chunk of whole lines is
+        parsed into residue rows as soon as it arrives (see `parse_stream`).
+        stderr is drained in the background. Algorithms without streaming
+        support, and subclasses overriding the `run` of the class that enabled
+        `STREAMING`, fall back to `parse_output(run(pdb_file))`.
+
+        Args:
+            pdb_file (Union[str, InMemoryFile]): Path to the input structure file, optionally
+                compressed, or its content.
+            chunk_size (int): Bytes read from the pipe at a time.
+            include_only (Optional[Sequence[str]]): Chain IDs to keep; None keeps all.
+            residue_range (Optional[Tuple[int, int]]): First and last residue number
+                to keep; None keeps all.
+
+        Returns:
+            ResidueRecords: Residue rows with categorical chain IDs.
+
+        Raises:
+            AlgorithmTimeoutError: If the program exceeded `timeout`.
+            AlgorithmError: If the program exited with a non-zero status.
+        """
+        if not self._streams_command():
+            return self.parse_output(self.run(pdb_file), include_only, residue_range)
+        with algorithm_input(pdb_file, self.PIPE_INPUT) as source:
+            command = self.command(source.path)
+            p = subprocess.Popen(command, pass_fds=source.pass_fds,
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            stderr = []
+            drain = threading.Thread(target=lambda: stderr.append(p.stderr.read()), daemon=True)
+            drain.start()
+            timed_out = threading.Event()
+            timer = None
+            if self.timeout is not None:
+                timer = threading.Timer(self.timeout, lambda: (timed_out.set(), p.kill()))
+                timer.start()
+            try:
+                with p.stdout:
+                    data = self._parse_chunks(_iter_pipe_chunks(p.stdout, chunk_size),
+                                              include_only, residue_range)
+            except Exception:
+                # A parse error caused by a failing program is reported as that failure
+                try:
+                    status = p.wait(timeout=1)
+                except subprocess.TimeoutExpired:
+                    status = None
+                p.kill()
+                if not timed_out.is_set() and not status:
+                    raise
+            except BaseException:
+                p.kill()
+                raise
+            finally:
+                p.wait()
+                if timer is not None:
+                    timer.cancel()
+                drain.join()
+        err = b''.join(stderr).decode(errors='replace')
+        if timed_out.is_set():
+            raise AlgorithmTimeoutError(command, self.timeout, err)
+        if p.returncode:
+            raise AlgorithmError(command, p.returncode, err)
+        return data
+
+    def _streams_command(self) -> bool:
+        """
+        Whether `run_streaming` may read `command` output from the pipe: `STREAMING`
+        is set and `run` is not overridden below the class that set it, so the
+        rows always match what `run` returns.
+        """
+        if not self.STREAMING:
+            return False
+        mro = type(self).__mro__
+        streaming_owner = next(cls for cls in mro if 'STREAMING' in vars(cls))
+        run_owner = next(cls for cls in mro if 'run' in vars(cls))
+        return issubclass(streaming_owner, run_owner)
+
+    def parse_stream(self, chunks: Iterable[np.ndarray]) -> Union[ResidueRecords, np.ndarray]:
+        """
+        Parse algorithm output given as consecutive buffers of whole lines.
+
+        The default joins the chunks and calls `process_data`; streaming
+        algorithms override it to parse every chunk on its own.
+
+        Args:
+            chunks (Iterable[np.ndarray]): uint8 buffers (see `text_to_buffer`).
+
+        Returns:
+            Union[ResidueRecords, np.ndarray]: Rows, as returned by `process_data`.
+        """
+        return self.process_data(b''.join(chunk.tobytes() for chunk in chunks).decode())
+
+    def parse_output(self, algorithm_out: str, include_only: Optional[Sequence[str]] = None,
+                     residue_range: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """
+        `process_data` restricted to some chains and a residue number range.
+
+        Algorithms with `FILTERS_ROWS` skip the other rows while scanning;
+        for the others the parsed rows are filtered afterwards. A plain
+        structured array from `process_data` is encoded into ResidueRecords.
+
+        Args:
+            algorithm_out (str): Raw algorithm output.
+            include_only (Optional[Sequence[str]]): Chain IDs to keep; None keeps all.
+            residue_range (Optional[Tuple[int, int]]): First and last residue number
+                to keep (inclusive); None keeps all.
+
+        Returns:
+            ResidueRecords: Residue rows with categorical chain IDs.
+        """
+        if include_only is None and residue_range is None:
+            return as_records(self.process_data(algorithm_out))
+        if self.FILTERS_ROWS:
+            return self.process_data(algorithm_out, include_only, residue_range)
+        return _select_rows(as_records(self.process_data(algorithm_out)), include_only, residue_range)
+
+    def _parse_chunks(self, chunks: Iterable[np.ndarray], include_only: Optional[Sequence[str]],
+                      residue_range: Optional[Tuple[int, int]]) -> ResidueRecords:
+        if include_only is None and residue_range is None:
+            return as_records(self.parse_stream(chunks))
+        if self.FILTERS_ROWS:
+            return self.parse_stream(chunks, include_only, residue_range)
+        return _select_rows(as_records(self.parse_stream(chunks)), include_only, residue_range)
+
+    async def run_async(self, pdb_file: Union[str, InMemoryFile], timeout: Optional[float] = None) -> str:
+        """
+        Run the algorithm without blocking the event loop.
+
+        The command line is the one of `command`. At most `max_concurrent_runs`
+        subprocesses of this algorithm run at once; further calls wait for a slot.
+
+        Args:
+            pdb_file (Union[str, InMemoryFile]): Path to the input structure file, optionally
+                compressed, or its content.
+            timeout (Optional[float]): Seconds to wait for the program; it is killed on expiry.
+                Defaults to the algorithm's `timeout`.
+
+        Returns:
+            str: The raw output produced by the algorithm.
+
+        Raises:
+            AlgorithmTimeoutError: If the program did not finish within `timeout`.
+            AlgorithmError: If the program exited with a non-zero status.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        async with self._run_semaphore():
+            # Writing a scratch file or joining the pipe pump blocks, so both run in threads
+            inputs = contextlib.ExitStack()
+            source = await asyncio.to_thread(inputs.enter_context, algorithm_input(pdb_file, self.PIPE_INPUT))
+            try:
+                command = self.command(source.path)
+                process = await asyncio.create_subprocess_exec(
+                    *command, pass_fds=source.pass_fds,
+                    stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+                try:
+                    out, err = await asyncio.wait_for(process.communicate(), timeout)
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
+                    raise AlgorithmTimeoutError(command, timeout, '') from None
+                except BaseException:
+                    if process.returncode is None:
+                        process.kill()
+                        await process.wait()
+                    raise
+            finally:
+                await asyncio.to_thread(inputs.close)
+        if process.returncode:
+            raise AlgorithmError(command, process.returncode, err.decode(errors='replace'))
+        return out.decode(errors='replace').replace('\r\n', '\n')
+
+    async def run_cached_async(self, pdb_file: Union[str, InMemoryFile], timeout: Optional[float] = None) -> str:
+        """
+        Asynchronous counterpart of `run_cached`.
+        """
+        if self.cache is None:
+            return await self.run_async(pdb_file, timeout)
+        return await self.cache.run_async(self, pdb_file, timeout)
+
+    def _run_semaphore(self) -> asyncio.Semaphore:
+        """
+        Semaphore limiting `run_async` calls, one per running event loop.
+        """
+        if self._semaphores is None:
+            self._semaphores = weakref.WeakKeyDictionary()
+        loop = asyncio.get_running_loop()
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrent_runs)
+        return self._semaphores[loop]
+
+    def __getstate__(self) -> dict:
+        # Semaphores belong to event loops of this process
+        state = self.__dict__.copy()
+        state.pop('_semaphores', None)
+        return state
     
     @abstractmethod	
     def run(self, pdb_file: str) -> str:
@@ -32,9 +531,11 @@ class BaseAlgorithm(ABC):
 
         Parameters
         ----------
-        pdb_file : str
-            Path to the input structure file. Can be in CIF or PDB format,
-            depending on what the algorithm accepts.
+        pdb_file : str or InMemoryFile
+            Path to the input structure file, or its content held in memory.
+            Can be in CIF or PDB format, depending on what the algorithm
+            accepts, optionally gzip/bz2/xz compressed. Hand it to the program
+            through `algorithm_input` (as `_run_command` does).
 
         Returns
         -------
@@ -44,9 +545,9 @@ class BaseAlgorithm(ABC):
         pass
      
     @abstractmethod  
-    def process_data(self, algorithm_out: str) -> np.ndarray:
+    def process_data(self, algorithm_out: str) -> Union[ResidueRecords, np.ndarray]:
         """
-        Process the raw output of the algorithm into a structured array.
+        Process the raw output of the algorithm into residue rows.
 
         Parameters
         ----------
@@ -56,8 +557,9 @@ class BaseAlgorithm(ABC):
 
         Returns
         -------
-        np.ndarray
-            A structured NumPy array with dtype:
+        ResidueRecords or np.ndarray
+            ResidueRecords (rows with RESIDUE_DTYPE and a chain dictionary), or,
+            for simple algorithms, a structured NumPy array with dtype:
             
                 dtype = [
                     ('residue_index',   'i4'),
@@ -70,7 +572,8 @@ class BaseAlgorithm(ABC):
 
             Notes
             -----
-            - 'SS_code', 'chain_id' and 'AA' must be extracted from the algorithm output.
+            - 'SS_code', 'chain_id' and 'AA' must be extracted from the algorithm output;
+              'chain_id' may be any string width.
             - 'SS' is obtained by mapping 'SS_code' through the provided
               `ss_translation` dictionary.
         """
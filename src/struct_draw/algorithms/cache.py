@@ -0,0 +1,211 @@
+import asyncio
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Tuple, Union
+
+from ..compression import InMemoryFile
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'struct_draw')
+DEFAULT_MAX_BYTES = 1 << 30
+CACHE_SUFFIX = '.out.gz'
+HASH_BLOCK_SIZE = 1 << 20
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters of an AlgorithmCache since it was created.
+
+    Attributes:
+        hits (int): Runs answered from the cache.
+        misses (int): Runs that had to spawn the program.
+        evictions (int): Entries removed to respect the size limit.
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class AlgorithmCache:
+    """
+    Content-addressed on-disk cache of raw algorithm outputs.
+
+    Entries are keyed by a SHA-256 of the input file contents, the executable
+    name and version and the command-line arguments, and stored gzip
+    compressed. The total size is kept under `max_bytes` by evicting the least
+    recently used entries; a hit refreshes the entry's modification time.
+
+    Attributes:
+        cache_dir (str): Directory holding the entries.
+        max_bytes (int): Size limit of the stored (compressed) entries.
+        stats (CacheStats): Hit, miss and eviction counters. They and the size
+            accounting are updated under a lock, since runs may share the
+            cache across threads.
+    """
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir (Optional[str]): Cache directory; `~/.cache/struct_draw` by default.
+            max_bytes (int): Size limit of the cache in bytes.
+        """
+        self.cache_dir = cache_dir if cache_dir is not None else DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+
+    def key(self, algorithm: 'BaseAlgorithm', pdb_file: Union[str, InMemoryFile]) -> str:
+        """
+        Cache key of running an algorithm on a file.
+
+        Args:
+            algorithm (BaseAlgorithm): Algorithm to run.
+            pdb_file (Union[str, InMemoryFile]): Path to the input structure file, or its content.
+
+        Returns:
+            str: Hex digest identifying the output.
+        """
+        digest = hashlib.sha256()
+        if isinstance(pdb_file, InMemoryFile):
+            digest.update(pdb_file.data)
+        else:
+            with open(pdb_file, 'rb') as fh:
+                for block in iter(lambda: fh.read(HASH_BLOCK_SIZE), b''):
+                    digest.update(block)
+        # Arguments without the input path, which does not affect the output
+        for part in [algorithm.version()] + algorithm.command('')[:-1]:
+            digest.update(b'\0' + part.encode())
+        return digest.hexdigest()
+
+    def run(self, algorithm: 'BaseAlgorithm', pdb_file: Union[str, InMemoryFile]) -> str:
+        """
+        Return the cached output of an algorithm run, running it on a miss.
+
+        Empty outputs (e.g. a failed run) are not stored.
+
+        Args:
+            algorithm (BaseAlgorithm): Algorithm to run.
+            pdb_file (str): Path to the input structure file.
+
+        Returns:
+            str: Raw algorithm output.
+        """
+        key = self.key(algorithm, pdb_file)
+        cached = self.get(key)
+        if cached is not None:
+            self._count('hits')
+            return cached
+        self._count('misses')
+        out = algorithm.run(pdb_file)
+        if out:
+            self.put(key, out)
+        return out
+
+    async def run_async(self, algorithm: 'BaseAlgorithm', pdb_file: Union[str, InMemoryFile],
+                        timeout: Optional[float] = None) -> str:
+        """
+        Asynchronous counterpart of `run`; a miss awaits `algorithm.run_async`.
+
+        Hashing the input, probing the executable version and reading or
+        writing the compressed entry run in worker threads, so the event loop
+        is never blocked on them.
+        """
+        key = await asyncio.to_thread(self.key, algorithm, pdb_file)
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            self._count('hits')
+            return cached
+        self._count('misses')
+        out = await algorithm.run_async(pdb_file, timeout)
+        if out:
+            await asyncio.to_thread(self.put, key, out)
+        return out
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rt') as fh:
+                out = fh.read()
+            os.utime(path)
+        except (FileNotFoundError, EOFError, OSError):
+            return None
+        return out
+
+    def put(self, key: str, out: str) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as fh, gzip.GzipFile(fileobj=fh, mode='wb', mtime=0) as gz:
+            gz.write(out.encode())
+        with self._lock:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self._size += os.path.getsize(path) - previous
+            full = self._size > self.max_bytes
+        if full:
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            for path, _, _ in self._entries():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._size = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + CACHE_SUFFIX)
+
+    def _entries(self) -> List[Tuple[str, float, int]]:
+        """
+        All stored entries as (path, last use time, size).
+        """
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(CACHE_SUFFIX):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _evict(self) -> None:
+        """
+        Remove least recently used entries until the cache fits its size limit.
+
+        The directory is rescanned, so entries written by other processes are
+        accounted for as well. The scan and the removals hold the lock, so
+        threads going over the limit together evict (and count) every entry once.
+        """
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda entry: entry[1])
+            self._size = sum(size for _, _, size in entries)
+            for path, _, size in entries:
+                if self._size <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    # Removed by another process since the scan
+                    continue
+                self._size -= size
+                self.stats.evictions += 1
@@ -0,0 +1,395 @@
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+SPACE = ord(' ')
+NEWLINE = ord('\n')
+CARRIAGE_RETURN = ord('\r')
+
+
+def text_to_buffer(text: str) -> np.ndarray:
+    """
+    Convert algorithm output into a flat uint8 buffer with one byte per character.
+
+    Non-ASCII characters are replaced with '?', so character offsets inside
+    a line stay the same as in the original string.
+
+    Args:
+        text (str): Raw algorithm output.
+
+    Returns:
+        np.ndarray: 1-D uint8 array.
+    """
+    return np.frombuffer(text.encode('ascii', 'replace'), dtype=np.uint8)
+
+
+def iter_line_chunks(buf: np.ndarray, chunk_size: int = 1 << 26):
+    """
+    Split a buffer into consecutive views of about `chunk_size` bytes that end on a line break.
+
+    Keeps temporary arrays of column helpers bounded for very large files.
+
+    Args:
+        buf (np.ndarray): 1-D uint8 buffer.
+        chunk_size (int): Approximate chunk size in bytes.
+
+    Yields:
+        np.ndarray: Views of `buf` made of whole lines.
+    """
+    start = 0
+    while start < buf.size:
+        stop = start + chunk_size
+        while stop < buf.size:
+            tail = np.flatnonzero(buf[stop:stop + chunk_size] == NEWLINE)
+            if tail.size:
+                stop += int(tail[0]) + 1
+                break
+            stop += chunk_size
+        stop = min(stop, buf.size)
+        yield buf[start:stop]
+        start = stop
+
+
+def line_bounds(buf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Locate every line of a byte buffer.
+
+    Args:
+        buf (np.ndarray): 1-D uint8 buffer.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Start offsets and end offsets (exclusive,
+        without the trailing '\\n' or '\\r\\n') of each line.
+    """
+    newlines = np.flatnonzero(buf == NEWLINE)
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [buf.size]))
+    if starts.size and starts[-1] == buf.size:
+        starts, ends = starts[:-1], ends[:-1]
+    has_cr = np.zeros(ends.size, dtype=bool)
+    non_empty = ends > starts
+    has_cr[non_empty] = buf[ends[non_empty] - 1] == CARRIAGE_RETURN
+    ends = ends - has_cr
+    return starts, ends
+
+
+def fixed_width_rows(buf: np.ndarray, min_width: int = 0) -> Optional[np.ndarray]:
+    """
+    View a buffer as a (lines, width) matrix when all its lines share the same length.
+
+    Every stride-th byte must be a newline and there must be no other
+    newline; the returned matrix is a zero-copy view of `buf` without the
+    newline column.
+
+    Args:
+        buf (np.ndarray): 1-D uint8 buffer.
+        min_width (int): Minimal accepted line length.
+
+    Returns:
+        Optional[np.ndarray]: uint8 matrix view, or None if the lines are not fixed-width.
+    """
+    first_newline = np.flatnonzero(buf[:4096] == NEWLINE)
+    if first_newline.size == 0:
+        return None
+    stride = int(first_newline[0]) + 1
+    if stride - 1 < min_width:
+        return None
+    size = buf.size
+    if size % stride != 0:
+        if (size + 1) % stride != 0:
+            return None
+        size += 1
+    n_rows = size // stride
+    if not np.all(buf[stride - 1::stride] == NEWLINE):
+        return None
+    # Short lines adding up to the stride would also put a newline there
+    if np.count_nonzero(buf == NEWLINE) != n_rows - (size != buf.size):
+        return None
+    return np.lib.stride_tricks.as_strided(buf, shape=(n_rows, stride - 1), strides=(stride, 1),
+                                           writeable=False)
+
+
+def column_matrix(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                  first: int, last: int) -> np.ndarray:
+    """
+    Cut the fixed-width columns [first, last) of the selected lines into a byte matrix.
+
+    Characters past the end of a line are filled with spaces.
+
+    Args:
+        buf (np.ndarray): 1-D uint8 buffer.
+        starts (np.ndarray): Start offsets of the selected lines.
+        ends (np.ndarray): End offsets (exclusive) of the selected lines.
+        first (int): First column (0-based, inclusive).
+        last (int): Last column (0-based, exclusive).
+
+    Returns:
+        np.ndarray: uint8 matrix of shape (len(starts), last - first).
+    """
+    offsets = starts[:, None] + np.arange(first, last)
+    if ends.size and np.min(ends - starts) >= last:
+        return buf[offsets]
+    inside = offsets < ends[:, None]
+    matrix = np.full(offsets.shape, SPACE, dtype=np.uint8)
+    matrix[inside] = buf[offsets[inside]]
+    return matrix
+
+
+def column_block(buf: np.ndarray, first: int, last: int) -> np.ndarray:
+    """
+    Cut columns [first, last) of every line of a buffer into a byte matrix.
+
+    Fixed-width output (the usual case for DSSP) is sliced from a zero-copy
+    view; otherwise lines are located individually.
+
+    Args:
+        buf (np.ndarray): 1-D uint8 buffer.
+        first (int): First column (0-based, inclusive).
+        last (int): Last column (0-based, exclusive).
+
+    Returns:
+        np.ndarray: uint8 matrix with one row per line.
+    """
+    rows = fixed_width_rows(buf, min_width=last)
+    if rows is not None:
+        return rows[:, first:last]
+    starts, ends = line_bounds(buf)
+    return column_matrix(buf, starts, ends, first, last)
+
+
+def prefixed_block(buf: np.ndarray, prefix: bytes, first: int, last: int) -> np.ndarray:
+    """
+    Cut columns [first, last) of the lines starting with `prefix` into a byte matrix.
+
+    Args:
+        buf (np.ndarray): 1-D uint8 buffer.
+        prefix (bytes): Record name the lines must start with (e.g. b'ASG').
+        first (int): First column (0-based, inclusive).
+        last (int): Last column (0-based, exclusive).
+
+    Returns:
+        np.ndarray: uint8 matrix with one row per matching line.
+    """
+    prefix_codes = np.frombuffer(prefix, dtype=np.uint8)
+    rows = fixed_width_rows(buf, min_width=max(last, prefix_codes.size))
+    if rows is not None:
+        return rows[np.all(rows[:, :prefix_codes.size] == prefix_codes, axis=1), first:last]
+    starts, ends = line_bounds(buf)
+    heads = column_matrix(buf, starts, ends, 0, prefix_codes.size)
+    selected = np.all(heads == prefix_codes, axis=1)
+    return column_matrix(buf, starts[selected], ends[selected], first, last)
+
+
+def prefixed_line_bounds(buf: np.ndarray, prefix: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Locate the lines starting with `prefix`.
+
+    Args:
+        buf (np.ndarray): 1-D uint8 buffer.
+        prefix (bytes): Record name the lines must start with (e.g. b'MODEL').
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Start offsets of the matching lines and the
+        offsets where the following lines start (`buf.size` for the last line).
+    """
+    prefix_codes = np.frombuffer(prefix, dtype=np.uint8)
+    starts, ends = line_bounds(buf)
+    next_starts = np.append(starts[1:], buf.size)
+    heads = column_matrix(buf, starts, ends, 0, prefix_codes.size)
+    selected = np.all(heads == prefix_codes, axis=1)
+    return starts[selected], next_starts[selected]
+
+
+def prefixed_columns(buf: np.ndarray, prefix: bytes, columns: Sequence[int]) -> np.ndarray:
+    """
+    Gather selected columns of the lines starting with `prefix`, one contiguous row per column.
+
+    Args:
+        buf (np.ndarray): 1-D uint8 buffer.
+        prefix (bytes): Record name the lines must start with (e.g. b'ATOM').
+        columns (Sequence[int]): Columns (0-based) to gather.
+
+    Returns:
+        np.ndarray: uint8 matrix of shape (len(columns), number of matching lines).
+    """
+    prefix_codes = np.frombuffer(prefix, dtype=np.uint8)
+    columns = np.asarray(columns)
+    width = int(max(columns.max() + 1, prefix_codes.size))
+    rows = fixed_width_rows(buf, min_width=width)
+    if rows is not None:
+        selected = np.flatnonzero(np.all(rows[:, :prefix_codes.size] == prefix_codes, axis=1))
+        first = int(columns.min())
+        block = rows[selected, first:width]
+        return np.ascontiguousarray(block.T[columns - first])
+    starts, ends = line_bounds(buf)
+    heads = column_matrix(buf, starts, ends, 0, prefix_codes.size)
+    selected = np.all(heads == prefix_codes, axis=1)
+    starts, ends = starts[selected], ends[selected]
+    out = np.full((columns.size, starts.size), SPACE, dtype=np.uint8)
+    for k, column in enumerate(columns):
+        inside = starts + column < ends
+        out[k, inside] = buf[starts[inside] + column]
+    return out
+
+
+def pack_columns(matrix: np.ndarray) -> np.ndarray:
+    """
+    Pack up to four bytes of every row into a single integer key.
+
+    Args:
+        matrix (np.ndarray): uint8 matrix with at most four columns.
+
+    Returns:
+        np.ndarray: uint32 array of keys, one per row.
+    """
+    keys = np.zeros(matrix.shape[0], dtype=np.uint32)
+    for j in range(matrix.shape[1]):
+        keys = (keys << 8) | matrix[:, j]
+    return keys
+
+
+def parse_int_columns(matrix: np.ndarray) -> np.ndarray:
+    """
+    Decode a byte matrix of right- or left-padded integer fields.
+
+    Spaces are ignored and a '-' anywhere in the field makes the value negative.
+
+    Args:
+        matrix (np.ndarray): uint8 matrix, one field per row.
+
+    Returns:
+        np.ndarray: int32 array of decoded values.
+
+    Raises:
+        ValueError: If a field contains no digits or characters other than
+            digits, spaces and '-'.
+    """
+    digits = matrix.astype(np.int32) - ord('0')
+    is_digit = (digits >= 0) & (digits <= 9)
+    is_minus = matrix == ord('-')
+    if not np.all(is_digit | is_minus | (matrix == SPACE)) or not np.all(is_digit.any(axis=1)):
+        raise ValueError("Invalid integer field in fixed-column data")
+    values = np.zeros(matrix.shape[0], dtype=np.int64)
+    for j in range(matrix.shape[1]):
+        column_digits = is_digit[:, j]
+        values[column_digits] = values[column_digits] * 10 + digits[column_digits, j]
+    values[is_minus.any(axis=1)] *= -1
+    return values.astype(np.int32)
+
+
+def chars_to_unicode(codes: np.ndarray) -> np.ndarray:
+    """
+    Reinterpret one byte per row as a 'U1' column without a Python-level loop.
+
+    A zero byte becomes an empty string.
+
+    Args:
+        codes (np.ndarray): uint8 array of character codes.
+
+    Returns:
+        np.ndarray: Array with dtype 'U1'.
+    """
+    return np.ascontiguousarray(codes, dtype=np.uint32).view('U1')
+
+
+def build_ss_lookup(ss_translation: Dict[str, str], default: str = 'Other') -> np.ndarray:
+    """
+    Build a 256-entry table mapping single-byte SS codes to their translated labels.
+
+    Args:
+        ss_translation (Dict[str, str]): SS code to label mapping.
+        default (str): Label used for codes missing from the mapping.
+
+    Returns:
+        np.ndarray: 'U6' array indexed by character code.
+    """
+    lookup = np.full(256, default, dtype='U6')
+    for code, label in ss_translation.items():
+        if len(code) == 1 and ord(code) < 256:
+            lookup[ord(code)] = label
+    return lookup
+
+
+def chain_code_mask(chain_codes: np.ndarray, include_only: Optional[Sequence[str]]) -> np.ndarray:
+    """
+    Select rows whose one-byte chain column is one of the requested chain IDs.
+
+    The empty chain ID matches a blank (space) column. IDs longer than one
+    character can never match a one-byte column and are ignored.
+
+    Args:
+        chain_codes (np.ndarray): uint8 chain ID column.
+        include_only (Optional[Sequence[str]]): Chain IDs to keep; None keeps every row.
+
+    Returns:
+        np.ndarray: Boolean mask over `chain_codes`.
+    """
+    if include_only is None:
+        return np.ones(len(chain_codes), dtype=bool)
+    wanted = [ord(chain_id) if chain_id else SPACE for chain_id in include_only
+              if len(chain_id) <= 1 and ord(chain_id or ' ') < 256]
+    return np.isin(chain_codes, np.array(wanted, dtype=np.uint8))
+
+
+def residue_range_mask(residue_index: np.ndarray, residue_range: Optional[Tuple[int, int]]) -> np.ndarray:
+    """
+    Select rows whose residue number lies in an inclusive range.
+
+    Args:
+        residue_index (np.ndarray): Residue numbers.
+        residue_range (Optional[Tuple[int, int]]): First and last residue number to keep;
+            None keeps every row.
+
+    Returns:
+        np.ndarray: Boolean mask over `residue_index`.
+    """
+    if residue_range is None:
+        return np.ones(len(residue_index), dtype=bool)
+    first, last = residue_range
+    return (residue_index >= first) & (residue_index <= last)
+
+
+def byte_keys(matrix: np.ndarray) -> np.ndarray:
+    """
+    View every row of a uint8 matrix as one bytes value.
+
+    Trailing zero bytes are not part of the value, so left-aligned fields of
+    different lengths padded with zeros compare as expected.
+
+    Args:
+        matrix (np.ndarray): uint8 matrix of shape (rows, width).
+
+    Returns:
+        np.ndarray: 'S{width}' array with one value per row.
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=np.uint8)
+    if matrix.shape[1] == 0:
+        return np.zeros(matrix.shape[0], dtype='S1')
+    return matrix.view(f'S{matrix.shape[1]}').ravel()
+
+
+def last_token(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Extract the last whitespace-delimited token of every row of a byte matrix.
+
+    Args:
+        matrix (np.ndarray): uint8 matrix of shape (rows, width).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: uint8 matrix of the same shape with the token
+        left-aligned and zero-padded, and a mask of rows that have a token.
+    """
+    n_rows, width = matrix.shape
+    if width == 0:
+        return matrix.copy(), np.zeros(n_rows, dtype=bool)
+    non_space = (matrix != SPACE) & (matrix != 0)
+    found = non_space.any(axis=1)
+    last = width - 1 - np.argmax(non_space[:, ::-1], axis=1)
+    columns = np.arange(width)
+    blank_before = ~non_space & (columns < last[:, None])
+    first = np.where(blank_before.any(axis=1),
+                     width - np.argmax(blank_before[:, ::-1], axis=1), 0)
+    source = first[:, None] + columns
+    inside = found[:, None] & (source <= last[:, None])
+    token = np.where(inside, matrix[np.arange(n_rows)[:, None], np.minimum(source, width - 1)], 0)
+    return token.astype(np.uint8), found
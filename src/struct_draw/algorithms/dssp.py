@@ -1,10 +1,12 @@
-import subprocess
-import re
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import numpy as np
 
-from .base_algorithm import BaseAlgorithm
+from .cache import AlgorithmCache
+from .base_algorithm import BaseAlgorithm, ResidueRecords, RESIDUE_DTYPE, concatenate_residues, encode_chains
+from .columns import (SPACE, text_to_buffer, column_block, parse_int_columns,
+                      chars_to_unicode, build_ss_lookup, residue_range_mask,
+                      byte_keys, last_token)
 
 
 DEFAULT_SS_TRANSLATION = {'H': 'Helix',
@@ -15,52 +17,100 @@ DEFAULT_SS_TRANSLATION = {'H': 'Helix',
                           'T': 'Other',
                           'S': 'Other'}
 
+# Extra columns read past the AUTHCHAIN header label, in case IDs overhang it
+AUTH_CHAIN_SLACK = 8
+
 
 class DSSP(BaseAlgorithm):
-    def __init__(self, algorithm_sub_name: str, ss_translation: Optional[Dict[str,str]] = None):
-        super().__init__(algorithm_sub_name, ss_translation)
+    # mkdssp picks the input format from the file name, so compressed input goes to a scratch file
+    PIPE_INPUT = False
+    STREAMING = True
+    FILTERS_ROWS = True
+
+    def __init__(self, algorithm_sub_name: str, ss_translation: Optional[Dict[str,str]] = None,
+                 cache: Optional[AlgorithmCache] = None, timeout: Optional[float] = None):
+        super().__init__(algorithm_sub_name, ss_translation, cache, timeout)
         if self.SS_TRANSLATION is None:
             self.SS_TRANSLATION = DEFAULT_SS_TRANSLATION
         
     
+    def command(self, pdb_file: str) -> List[str]:
+        return [self._algorithm_sub_name, "--output-format=dssp", pdb_file]
+
     def run(self, pdb_file: str) -> str:
-        command = [self._algorithm_sub_name, "--output-format=dssp", pdb_file]
-        p = subprocess.Popen(command, universal_newlines=True,
-                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                         
-        out, err = p.communicate()
-        return out
+        return self._run_command(pdb_file)
+        
+    def process_data(self, algorithm_out: str, include_only: Optional[Sequence[str]] = None,
+                     residue_range: Optional[Tuple[int, int]] = None) -> ResidueRecords:
+        return self.parse_stream([text_to_buffer(algorithm_out)], include_only, residue_range)
+    
+    def parse_stream(self, chunks: Iterable[np.ndarray], include_only: Optional[Sequence[str]] = None,
+                     residue_range: Optional[Tuple[int, int]] = None) -> ResidueRecords:
+        parts = []
+        chain_columns = None
+        for buf in chunks:
+            if chain_columns is None:
+                header = self._find_header(buf)
+                if header is None:
+                    continue
+                body_start, chain_columns = header
+                buf = buf[body_start:]
+            parts.append(self._parse_body(buf, chain_columns, include_only, residue_range))
+        return concatenate_residues(parts)
+    
+    @staticmethod
+    def _find_header(buf: np.ndarray) -> Optional[Tuple[int, Tuple[int, int]]]:
+        """
+        Locate the "  #  RESIDUE AA STRUCTURE" header.
+
+        Returns:
+            Optional[Tuple[int, Tuple[int, int]]]: Offset of the first residue line and the
+            columns holding the chain ID. Without an AUTHCHAIN column that is the
+            one-character chain column; with it, the region after Z-CA whose last
+            token is the full author chain ID.
+        """
+        text = buf.tobytes()
+        header = text.find(b"RESIDUE AA STRUCTURE")
+        if header == -1:
+            return None
+        line_start = text.rfind(b'\n', 0, header) + 1
+        line_end = text.find(b'\n', header)
+        line_end = len(text) if line_end == -1 else line_end
+        chain_columns = (11, 12)
+        header_line = text[line_start:line_end].rstrip(b'\r')
+        coordinates_end = header_line.find(b"Z-CA")
+        if b"AUTHCHAIN" in header_line and coordinates_end != -1:
+            chain_columns = (coordinates_end + 4, len(header_line) + AUTH_CHAIN_SLACK)
+        return min(line_end + 1, len(text)), chain_columns
+    
+    def _parse_body(self, buf: np.ndarray, chain_columns: Tuple[int, int] = (11, 12),
+                    include_only: Optional[Sequence[str]] = None,
+                    residue_range: Optional[Tuple[int, int]] = None) -> ResidueRecords:
+        # Residue block as a fixed-width matrix of columns 5..16
+        block = column_block(buf, 5, 17)
+        has_residue = block[:, 11 - 5] != SPACE #Skip lines without residue
+        block = block[has_residue]
+        chain_keys = byte_keys(block[:, 11 - 5:12 - 5])
+        if chain_columns != (11, 12):
+            tokens, has_token = last_token(column_block(buf, *chain_columns)[has_residue])
+            chain_keys = np.where(has_token, byte_keys(tokens), chain_keys)
+        residue_index = parse_int_columns(block[:, 0:5])
+        selected = residue_range_mask(residue_index, residue_range)
+        if include_only is not None:
+            selected &= np.isin(chain_keys, [chain_id.encode() for chain_id in include_only])
+        if not selected.all():
+            block, chain_keys, residue_index = block[selected], chain_keys[selected], residue_index[selected]
+        chain_ids, chain_code = encode_chains(chain_keys)
+        
+        ss_codes = block[:, 16 - 5].copy()
+        ss_codes[ss_codes == SPACE] = ord('-')
+        ss_lookup = build_ss_lookup(self.SS_TRANSLATION)
         
-    def process_data(self, algorithm_out: str) -> np.ndarray:
-        is_start = False
-        data = []
-        for line in algorithm_out.split('\n'):
-            if re.search(r"RESIDUE AA STRUCTURE", line):
-                is_start = True
-                continue
-					    
-            if not is_start:
-                continue
-			    
-            if re.search(r"^$", line):
-                continue
-			    
-            if line[11] == ' ': #Skip line if no reidue
-                continue
-	    
-            residue_index = int(line[5:10])
-            insertion_code = line[10]
-            chain_id = line[11]
-            AA = line[13]
-            SS_code = line[16] if line[16] != ' ' else '-'
-            SS = self.SS_TRANSLATION.get(SS_code, 'Other')
-            data.append((residue_index, insertion_code, chain_id, AA, SS, SS_code))
-            
-        dtype = [('residue_index', 'i4'),
-                ('insertion_code', 'U1'),
-                ('chain_id', 'U1'),
-                ('AA', 'U1'),
-                ('SS', 'U6'),
-                ('SS_code', 'U1')]
-        np_data = np.array(data, dtype=dtype)
-        return np_data
+        np_data = np.empty(len(block), dtype=RESIDUE_DTYPE)
+        np_data['residue_index'] = residue_index
+        np_data['insertion_code'] = chars_to_unicode(block[:, 10 - 5])
+        np_data['chain_code'] = chain_code
+        np_data['AA'] = chars_to_unicode(block[:, 13 - 5])
+        np_data['SS'] = ss_lookup[ss_codes]
+        np_data['SS_code'] = chars_to_unicode(ss_codes)
+        return ResidueRecords(np_data, chain_ids)
@@ -0,0 +1,442 @@
+import asyncio
+import os
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..compression import InMemoryFile, strip_compression_suffix
+from ..structures.cif_reader import read_cif_backbone
+from ..structures.readers import AtomTable, Backbone, read_buffer, read_pdb_backbone
+from ..structures.spatial import CellList
+from .cache import AlgorithmCache
+from .base_algorithm import ResidueRecords, RESIDUE_DTYPE, _select_rows
+from .columns import build_ss_lookup, chars_to_unicode
+from .dssp import DSSP
+from .stride import AMINO_ACIDS
+
+# Bumped whenever the assignment changes, so cached outputs are not reused
+NUMPY_DSSP_VERSION = '1'
+CIF_SUFFIXES = ('.cif', '.mmcif')
+
+# Kabsch-Sander electrostatic model: partial charges 0.42e and 0.20e, factor 332 (kcal/mol)
+COUPLING_CONSTANT = -27.888
+MIN_HBOND_ENERGY = -9.9
+MAX_HBOND_ENERGY = -0.5
+MIN_ATOM_DISTANCE = 0.5
+MAX_CA_DISTANCE = 9.0
+# Longest C-N distance (Å) of a peptide bond; longer gaps are chain breaks
+MAX_PEPTIDE_BOND = 2.5
+MIN_BEND_ANGLE = 70.0
+# Largest gap (residues) of the wider side of a beta bulge
+MAX_BULGE_GAP = 5
+HBONDS_PER_DONOR = 2
+N, CA, C, O = range(4)
+PARALLEL, ANTIPARALLEL = 1, 2
+LOOP = ord(' ')
+
+
+def chain_breaks(backbone: Backbone) -> np.ndarray:
+    """
+    Whether residue k and k + 1 are not linked by a peptide bond.
+
+    Args:
+        backbone (Backbone): Residues in file order.
+
+    Returns:
+        np.ndarray: bool array of len(backbone) - 1 entries.
+    """
+    xyz = backbone.coordinates
+    peptide = np.linalg.norm(xyz[1:, N] - xyz[:-1, C], axis=1)
+    return (backbone.chain_code[1:] != backbone.chain_code[:-1]) | ~(peptide < MAX_PEPTIDE_BOND)
+
+
+def hydrogen_positions(backbone: Backbone) -> np.ndarray:
+    """
+    Amide hydrogens placed 1 Å from N, opposite to the carbonyl of the preceding residue.
+
+    The first residue of a chain keeps H on N, so it never donates an H-bond.
+    """
+    xyz = backbone.coordinates
+    hydrogens = xyz[:, N].copy()
+    carbonyl = xyz[:-1, C] - xyz[:-1, O]
+    has_prev = backbone.chain_code[1:] == backbone.chain_code[:-1]
+    hydrogens[1:][has_prev] += (carbonyl / np.linalg.norm(carbonyl, axis=1)[:, None])[has_prev]
+    return hydrogens
+
+
+def hbond_energy(donor_n: np.ndarray, donor_h: np.ndarray, acceptor_c: np.ndarray,
+                 acceptor_o: np.ndarray) -> np.ndarray:
+    """
+    Kabsch-Sander electrostatic energy (kcal/mol) of N-H...O=C pairs.
+
+    Args:
+        donor_n (np.ndarray): (pairs, 3) donor nitrogens.
+        donor_h (np.ndarray): (pairs, 3) donor hydrogens.
+        acceptor_c (np.ndarray): (pairs, 3) acceptor carbons.
+        acceptor_o (np.ndarray): (pairs, 3) acceptor oxygens.
+
+    Returns:
+        np.ndarray: Energies, clipped to MIN_HBOND_ENERGY.
+    """
+    d_ho = np.linalg.norm(donor_h - acceptor_o, axis=1)
+    d_hc = np.linalg.norm(donor_h - acceptor_c, axis=1)
+    d_nc = np.linalg.norm(donor_n - acceptor_c, axis=1)
+    d_no = np.linalg.norm(donor_n - acceptor_o, axis=1)
+    too_close = np.minimum.reduce([d_ho, d_hc, d_nc, d_no]) < MIN_ATOM_DISTANCE
+    with np.errstate(divide='ignore'):
+        energy = COUPLING_CONSTANT * (1 / d_ho - 1 / d_hc + 1 / d_nc - 1 / d_no)
+    energy[too_close] = MIN_HBOND_ENERGY
+    return np.maximum(energy, MIN_HBOND_ENERGY)
+
+
+def best_acceptors(backbone: Backbone) -> np.ndarray:
+    """
+    The (up to) two strongest H-bond acceptors of every residue's N-H.
+
+    Pairs are residues with CA atoms closer than MAX_CA_DISTANCE, found with a
+    cell list in time linear in the number of residues; O(i) to
+    N-H(i + 1) is not considered and prolines do not donate. Only bonds below
+    MAX_HBOND_ENERGY count.
+
+    Args:
+        backbone (Backbone): Residues in file order.
+
+    Returns:
+        np.ndarray: int (residues, HBONDS_PER_DONOR) acceptor indices, strongest first, -1 for none.
+    """
+    xyz = backbone.coordinates
+    first, second = CellList(xyz[:, CA], MAX_CA_DISTANCE).pairs(MAX_CA_DISTANCE)
+    donors = np.concatenate((first, second))
+    acceptors = np.concatenate((second, first))
+    keep = (donors != acceptors + 1) & (backbone.residue_name[donors] != b'PRO')
+    donors, acceptors = donors[keep], acceptors[keep]
+    energy = hbond_energy(xyz[donors, N], hydrogen_positions(backbone)[donors], xyz[acceptors, C], xyz[acceptors, O])
+    bonded = energy < MAX_HBOND_ENERGY
+    donors, acceptors, energy = donors[bonded], acceptors[bonded], energy[bonded]
+    order = np.lexsort((energy, donors))
+    donors, acceptors = donors[order], acceptors[order]
+    group_start = np.searchsorted(donors, donors)
+    rank = np.arange(len(donors)) - group_start
+    strongest = rank < HBONDS_PER_DONOR
+    result = np.full((len(backbone), HBONDS_PER_DONOR), -1, dtype=np.int64)
+    result[donors[strongest], rank[strongest]] = acceptors[strongest]
+    return result
+
+
+class _Geometry:
+    """
+    H-bond and chain-break lookups shared by the assignment steps.
+    """
+    def __init__(self, acceptors: np.ndarray, breaks: np.ndarray):
+        self.n = len(acceptors)
+        self.acceptors = acceptors
+        self.segment = np.concatenate(([0], np.cumsum(breaks)))
+
+    def linked(self, first: np.ndarray, last: np.ndarray) -> np.ndarray:
+        """
+        Whether residues first..last exist and form one unbroken stretch.
+        """
+        valid = (first >= 0) & (last < self.n) & (first <= last)
+        first, last = np.clip(first, 0, self.n - 1), np.clip(last, 0, self.n - 1)
+        return valid & (self.segment[first] == self.segment[last])
+
+    def bond(self, donor: np.ndarray, acceptor: np.ndarray) -> np.ndarray:
+        """
+        Whether N-H of `donor` bonds to O of `acceptor` (one of its two strongest bonds).
+        """
+        valid = (donor >= 0) & (donor < self.n) & (acceptor >= 0) & (acceptor < self.n)
+        partners = self.acceptors[np.clip(donor, 0, self.n - 1)]
+        return valid & np.any(partners == np.asarray(acceptor)[..., None], axis=-1)
+
+
+def _turns(geometry: _Geometry) -> Dict[int, np.ndarray]:
+    """
+    n-turns (n = 3, 4, 5) starting at every residue: O(i) bonded to N-H(i + n).
+    """
+    residues = np.arange(geometry.n)
+    return {n: geometry.linked(residues, residues + n) & geometry.bond(residues + n, residues)
+            for n in (3, 4, 5)}
+
+
+def _bridges(geometry: _Geometry) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Beta bridges (i, j), i + 3 <= j, with their type, sorted by i then j.
+    """
+    donors = np.repeat(np.arange(geometry.n), HBONDS_PER_DONOR)
+    acceptors = geometry.acceptors.ravel()
+    donors, acceptors = donors[acceptors >= 0], acceptors[acceptors >= 0]
+    # Every bridge contains a bond in one of these four positions
+    i = np.concatenate((acceptors + 1, donors, acceptors, donors - 1))
+    j = np.concatenate((donors, acceptors + 1, donors, acceptors + 1))
+    candidates = np.unique(np.stack((i, j), axis=1), axis=0)
+    i, j = candidates[:, 0], candidates[:, 1]
+    keep = (j - i >= 3) & geometry.linked(i - 1, i + 1) & geometry.linked(j - 1, j + 1)
+    i, j = i[keep], j[keep]
+    bond = geometry.bond
+    parallel = (bond(i + 1, j) & bond(j, i - 1)) | (bond(j + 1, i) & bond(i, j - 1))
+    antiparallel = (bond(i + 1, j - 1) & bond(j + 1, i - 1)) | (bond(j, i) & bond(i, j))
+    kind = np.where(parallel, PARALLEL, np.where(antiparallel, ANTIPARALLEL, 0))
+    found = kind > 0
+    return i[found], j[found], kind[found]
+
+
+def _ladders(geometry: _Geometry, i: np.ndarray, j: np.ndarray, kind: np.ndarray) -> List[list]:
+    """
+    Group bridges into ladders and join ladders separated by a bulge.
+
+    Returns:
+        List[list]: [kind, first i, last i, first j, last j, bridges] per ladder.
+    """
+    # Consecutive bridges of a ladder share j - i (parallel) or i + j (antiparallel)
+    diagonal = np.where(kind == PARALLEL, j - i, i + j)
+    order = np.lexsort((i, diagonal, kind))
+    i, j, kind, diagonal = i[order], j[order], kind[order], diagonal[order]
+    new = np.ones(len(i), dtype=bool)
+    new[1:] = (kind[1:] != kind[:-1]) | (diagonal[1:] != diagonal[:-1]) | (i[1:] != i[:-1] + 1)
+    starts = np.flatnonzero(new)
+    ends = np.append(starts[1:], len(i)) - 1
+    ladders = [[int(kind[s]), int(i[s]), int(i[e]), int(min(j[s], j[e])), int(max(j[s], j[e])), int(e - s + 1)]
+               for s, e in zip(starts, ends)]
+    ladders.sort(key=lambda ladder: ladder[1])
+
+    def gap(first: int, second: int) -> float:
+        # Residues from `first` to `second`; mkdssp compares unsigned differences
+        return second - first if second >= first else np.inf
+
+    merged, active = [], []
+    for ladder in ladders:
+        kind_b, ib_b, ie_b, jb_b, je_b, size_b = ladder
+        # Ladders ending more than MAX_BULGE_GAP residues before this one can no longer take any
+        active = [other for other in active if other[2] >= ib_b - MAX_BULGE_GAP]
+        for other in active:
+            kind_a, ib_a, ie_a, jb_a, je_a, size_a = other
+            if (kind_a != kind_b or gap(ie_a, ib_b) > MAX_BULGE_GAP or (ie_a >= ib_b and ib_a <= ie_b)
+                    or not geometry.linked(np.array(min(ib_a, ib_b)), np.array(max(ie_a, ie_b)))
+                    or not geometry.linked(np.array(min(jb_a, jb_b)), np.array(max(je_a, je_b)))):
+                continue
+            j_gap = gap(je_a, jb_b) if kind_a == PARALLEL else gap(je_b, jb_a)
+            if (j_gap <= MAX_BULGE_GAP and gap(ie_a, ib_b) < 3) or j_gap < 3:
+                other[1:] = [ib_a, ie_b, min(jb_a, jb_b), max(je_a, je_b), size_a + size_b]
+                break
+        else:
+            merged.append(list(ladder))
+            active.append(merged[-1])
+    return merged
+
+
+def _mark(codes: np.ndarray, starts: np.ndarray, length: int, code: int,
+          allowed: Optional[Sequence[int]] = None) -> None:
+    """
+    Set `code` on residues start..start + length - 1 for every start, optionally only
+    for stretches whose residues all hold one of the `allowed` codes.
+    """
+    stretch = starts[:, None] + np.arange(length)
+    if allowed is not None:
+        starts = starts[np.all(np.isin(codes[stretch], allowed), axis=1)]
+        stretch = starts[:, None] + np.arange(length)
+    codes[stretch.ravel()] = code
+
+
+def _bends(backbone: Backbone, geometry: _Geometry) -> np.ndarray:
+    """
+    Residues where the CA trace (i - 2, i, i + 2) turns by more than MIN_BEND_ANGLE.
+    """
+    residues = np.arange(geometry.n)
+    bend = geometry.linked(residues - 2, residues + 2)
+    inner = np.flatnonzero(bend)
+    ca = backbone.coordinates[:, CA]
+    incoming = ca[inner] - ca[inner - 2]
+    outgoing = ca[inner + 2] - ca[inner]
+    cosine = np.einsum('ij,ij->i', incoming, outgoing) / (
+        np.linalg.norm(incoming, axis=1) * np.linalg.norm(outgoing, axis=1))
+    bend[inner] = np.degrees(np.arccos(np.clip(cosine, -1, 1))) > MIN_BEND_ANGLE
+    return bend
+
+
+def assign_secondary_structure(backbone: Backbone, prefer_pi_helices: bool = True) -> np.ndarray:
+    """
+    DSSP secondary structure of every residue.
+
+    Follows Kabsch & Sander (1983) as implemented by mkdssp: H-bonds from the
+    electrostatic energy, n-turns, bridges, ladders with bulges, then helices
+    (H, G, I), turns (T) and bends (S) in mkdssp's order of priority.
+
+    Args:
+        backbone (Backbone): Residues in file order.
+        prefer_pi_helices (bool): Let pi-helices (I) override alpha-helices, as
+            mkdssp does since version 2.1.
+
+    Returns:
+        np.ndarray: uint8 SS code characters, ' ' for loops.
+    """
+    n = len(backbone)
+    codes = np.full(n, LOOP, dtype=np.uint8)
+    if n == 0:
+        return codes
+    geometry = _Geometry(best_acceptors(backbone), chain_breaks(backbone))
+    for kind, i_first, i_last, j_first, j_last, size in _ladders(geometry, *_bridges(geometry)):
+        code = ord('E') if size > 1 else ord('B')
+        for first, last in ((i_first, i_last), (j_first, j_last)):
+            stretch = codes[first:last + 1]
+            stretch[stretch != ord('E')] = code
+    turns = _turns(geometry)
+    helix_starts = {length: np.flatnonzero(turns[length][1:] & turns[length][:-1]) + 1 for length in turns}
+    for length, code, allowed in ((4, 'H', None), (3, 'G', ' G'), (5, 'I', ' IH' if prefer_pi_helices else ' I')):
+        starts = helix_starts[length]
+        starts = starts[starts + length <= n]
+        _mark(codes, starts, length, ord(code), None if allowed is None else [ord(c) for c in allowed])
+    in_turn = np.zeros(n, dtype=bool)
+    for length, starts in turns.items():
+        starts = np.flatnonzero(starts)
+        for offset in range(1, length):
+            in_turn[starts[starts + offset < n] + offset] = True
+    loop = codes == LOOP
+    codes[loop & in_turn] = ord('T')
+    codes[loop & ~in_turn & _bends(backbone, geometry)] = ord('S')
+    return codes
+
+
+def one_letter_codes(residue_names: np.ndarray) -> np.ndarray:
+    """
+    One-letter amino acid codes of residue names, 'X' for anything else.
+    """
+    names, inverse = np.unique(residue_names, return_inverse=True)
+    letters = np.array([AMINO_ACIDS.get(name.decode(errors='replace'), 'X') for name in names.tolist()], dtype='U1')
+    return letters[inverse.ravel()]
+
+
+# Columns of the classic DSSP format up to the SS code, and the CA/author chain columns after them
+DSSP_HEADER = "  #  RESIDUE AA STRUCTURE    X-CA   Y-CA   Z-CA AUTHCHAIN"
+
+
+def render_dssp(backbone: Backbone, codes: np.ndarray, breaks: np.ndarray) -> str:
+    """
+    Classic DSSP text of an assignment, readable by `DSSP.process_data`.
+
+    Chain breaks get a '!' line as in mkdssp output; the author chain ID
+    column keeps chain IDs longer than one character.
+    """
+    lines = ["==== Secondary Structure Definition by the program DSSP, NumPy implementation ====",
+             DSSP_HEADER]
+    ca = backbone.coordinates[:, CA]
+    chain_ids = backbone.chain_ids[backbone.chain_code]
+    letters = one_letter_codes(backbone.residue_name)
+    number = 0
+    for k in range(len(backbone)):
+        if k and breaks[k - 1]:
+            number += 1
+            lines.append(f"{number:5d}        !")
+        number += 1
+        chain_id = str(chain_ids[k])
+        lines.append(f"{number:5d}{int(backbone.residue_index[k]):5d}{chr(backbone.insertion_code[k])}"
+                     f"{chain_id[:1] or ' '} {letters[k]}  {chr(codes[k])}".ljust(25)
+                     + f"{ca[k, 0]:7.1f}{ca[k, 1]:7.1f}{ca[k, 2]:7.1f} {chain_id}")
+    return "\n".join(lines) + "\n"
+
+
+class NumpyDSSP(DSSP):
+    """
+    DSSP implemented with NumPy, without running an external program.
+
+    Backbone coordinates are read straight from the PDB or PDBx/mmCIF file
+    and the assignment runs in-process (see `assign_secondary_structure`),
+    so there is no process startup and no output text to parse: the models
+    take the residue rows from `run_streaming` directly. `run` still renders
+    the classic DSSP text, so cached and precomputed outputs go through the
+    regular DSSP parser. Models hand it the atom table they read the
+    B-factors from (`run_atoms`), so the file is read only once.
+    """
+    READS_ATOMS = True
+
+    def __init__(self, algorithm_sub_name: str = 'numpy-dssp', ss_translation: Optional[Dict[str, str]] = None,
+                 cache: Optional[AlgorithmCache] = None, timeout: Optional[float] = None,
+                 prefer_pi_helices: bool = True):
+        super().__init__(algorithm_sub_name, ss_translation, cache, timeout)
+        self.prefer_pi_helices = prefer_pi_helices
+
+    def command(self, pdb_file: str) -> List[str]:
+        # Identifies the settings in cache keys; nothing is executed
+        return [self._algorithm_sub_name, f"--prefer-pi-helices={self.prefer_pi_helices}", pdb_file]
+
+    def version(self) -> str:
+        return f"{self._algorithm_sub_name} {NUMPY_DSSP_VERSION}"
+
+    @staticmethod
+    def read_backbone(pdb_file: Union[str, InMemoryFile]) -> Backbone:
+        """
+        Backbone of a PDB or PDBx/mmCIF file, told apart by the file suffix or, for
+        other names, by a leading 'data_' block.
+        """
+        if isinstance(pdb_file, InMemoryFile):
+            suffix = pdb_file.suffix.lower()
+        else:
+            suffix = os.path.splitext(strip_compression_suffix(str(pdb_file)))[1].lower()
+        if suffix in CIF_SUFFIXES:
+            return read_cif_backbone(pdb_file)
+        if suffix != '.pdb' and read_buffer(pdb_file)[:4096].tobytes().lstrip().startswith(b'data_'):
+            return read_cif_backbone(pdb_file)
+        return read_pdb_backbone(pdb_file)
+
+    def assign(self, pdb_file: Union[str, InMemoryFile]) -> Tuple[Backbone, np.ndarray]:
+        """
+        Backbone of a structure file and the SS code of every residue.
+        """
+        backbone = self.read_backbone(pdb_file)
+        return backbone, assign_secondary_structure(backbone, self.prefer_pi_helices)
+
+    def run(self, pdb_file: Union[str, InMemoryFile]) -> str:
+        backbone, codes = self.assign(pdb_file)
+        return render_dssp(backbone, codes, chain_breaks(backbone))
+
+    def run_streaming(self, pdb_file: Union[str, InMemoryFile], chunk_size: int = 0,
+                      include_only: Optional[Sequence[str]] = None,
+                      residue_range: Optional[Tuple[int, int]] = None) -> ResidueRecords:
+        """
+        Residue rows of a structure file, computed in-process without any text.
+
+        Args:
+            pdb_file (Union[str, InMemoryFile]): Path to the structure file, optionally
+                compressed, or its content.
+            chunk_size (int): Unused; kept for the `BaseAlgorithm` signature.
+            include_only (Optional[Sequence[str]]): Chain IDs to keep; None keeps all.
+            residue_range (Optional[Tuple[int, int]]): First and last residue number
+                to keep; None keeps all. H-bonds to residues outside it still count.
+
+        Returns:
+            ResidueRecords: Residue rows with categorical chain IDs.
+        """
+        backbone, codes = self.assign(pdb_file)
+        return self._records(backbone, codes, include_only, residue_range)
+
+    def run_atoms(self, atoms: AtomTable, include_only: Optional[Sequence[str]] = None,
+                  residue_range: Optional[Tuple[int, int]] = None) -> ResidueRecords:
+        """
+        Residue rows of an already read atom table; see `run_streaming`.
+        """
+        backbone = atoms.backbone()
+        codes = assign_secondary_structure(backbone, self.prefer_pi_helices)
+        return self._records(backbone, codes, include_only, residue_range)
+
+    def _records(self, backbone: Backbone, codes: np.ndarray, include_only: Optional[Sequence[str]],
+                 residue_range: Optional[Tuple[int, int]]) -> ResidueRecords:
+        codes = np.where(codes == LOOP, ord('-'), codes).astype(np.uint8)
+        data = np.empty(len(backbone), dtype=RESIDUE_DTYPE)
+        data['residue_index'] = backbone.residue_index
+        data['insertion_code'] = chars_to_unicode(backbone.insertion_code)
+        data['chain_code'] = backbone.chain_code
+        data['AA'] = one_letter_codes(backbone.residue_name)
+        data['SS'] = build_ss_lookup(self.SS_TRANSLATION)[codes]
+        data['SS_code'] = chars_to_unicode(codes)
+        records = ResidueRecords(data, backbone.chain_ids)
+        if include_only is None and residue_range is None:
+            return records
+        return _select_rows(records, include_only, residue_range)
+
+    async def run_async(self, pdb_file: Union[str, InMemoryFile], timeout: Optional[float] = None) -> str:
+        """
+        `run` in a worker thread, at most `max_concurrent_runs` at once.
+
+        There is no process to kill, so `timeout` does not apply.
+        """
+        async with self._run_semaphore():
+            return await asyncio.to_thread(self.run, pdb_file)
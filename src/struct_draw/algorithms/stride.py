@@ -1,10 +1,12 @@
-import subprocess
-import re
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional, Sequence, Tuple
 
 import numpy as np
 
-from .base_algorithm import BaseAlgorithm
+from .cache import AlgorithmCache
+from .base_algorithm import BaseAlgorithm, ResidueRecords, RESIDUE_DTYPE, concatenate_residues, encode_chains
+from .columns import (SPACE, text_to_buffer, prefixed_block, pack_columns,
+                      parse_int_columns, chars_to_unicode, build_ss_lookup, residue_range_mask,
+                      byte_keys)
 
 
 DEFAULT_SS_TRANSLATION = {'H': 'Helix',
@@ -36,50 +38,73 @@ AMINO_ACIDS = { "ALA": "A",
                 "TYR": "Y",
                 "VAL": "V" }
 
+# Vectorized form of AMINO_ACIDS: sorted packed three-letter keys and one-letter codes
+AA_KEYS = pack_columns(np.array([list(name.encode()) for name in sorted(AMINO_ACIDS)], dtype=np.uint8))
+AA_CODES = np.array([ord(AMINO_ACIDS[name]) for name in sorted(AMINO_ACIDS)], dtype=np.uint8)
+
 
 class Stride(BaseAlgorithm):
-    def __init__(self, algorithm_sub_name: str, ss_translation: Optional[Dict[str,str]] = None):
-        super().__init__(algorithm_sub_name, ss_translation)
+    STREAMING = True
+    FILTERS_ROWS = True
+    # stride prints its usage for any unknown flag, so cache keys use the executable's fingerprint
+    VERSION_FLAG = None
+
+    def __init__(self, algorithm_sub_name: str, ss_translation: Optional[Dict[str,str]] = None,
+                 cache: Optional[AlgorithmCache] = None, timeout: Optional[float] = None):
+        super().__init__(algorithm_sub_name, ss_translation, cache, timeout)
         if self.SS_TRANSLATION is None:
             self.SS_TRANSLATION = DEFAULT_SS_TRANSLATION
         
     
     def run(self, pdb_file: str) -> str:
-        command = [self._algorithm_sub_name, pdb_file]
-        p = subprocess.Popen(command, universal_newlines=True,
-                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                         
-        out, err = p.communicate()
-        return out
+        return self._run_command(pdb_file)
+        
+    def process_data(self, algorithm_out: str, include_only: Optional[Sequence[str]] = None,
+                     residue_range: Optional[Tuple[int, int]] = None) -> ResidueRecords:
+        return self.parse_stream([text_to_buffer(algorithm_out)], include_only, residue_range)
+    
+    def parse_stream(self, chunks: Iterable[np.ndarray], include_only: Optional[Sequence[str]] = None,
+                     residue_range: Optional[Tuple[int, int]] = None) -> ResidueRecords:
+        # ASG records are independent lines, so every chunk is parsed on its own
+        return concatenate_residues([self._parse_asg(buf, include_only, residue_range) for buf in chunks])
+        
+    def _parse_asg(self, buf: np.ndarray, include_only: Optional[Sequence[str]] = None,
+                   residue_range: Optional[Tuple[int, int]] = None) -> ResidueRecords:
+        # Columns 5..24 of every ASG record
+        block = prefixed_block(buf, b"ASG", 5, 25)
+        if include_only is not None:
+            wanted = [chain_id.encode() for chain_id in include_only]
+            block = block[np.isin(byte_keys(block[:, 9 - 5:10 - 5]), wanted)]
+        
+        residue_field = block[:, 10 - 5:15 - 5].copy()
+        non_space = residue_field != SPACE
+        if not np.all(non_space.any(axis=1)):
+            raise ValueError("ASG record without residue number")
+        rows = np.arange(len(residue_field))
+        last_char_pos = residue_field.shape[1] - 1 - np.argmax(non_space[:, ::-1], axis=1)
+        last_char = residue_field[rows, last_char_pos]
+        has_insertion_code = (last_char < ord('0')) | (last_char > ord('9'))
+        residue_field[rows[has_insertion_code], last_char_pos[has_insertion_code]] = SPACE
+        residue_index = parse_int_columns(residue_field)
+        if residue_range is not None:
+            selected = residue_range_mask(residue_index, residue_range)
+            block, residue_index = block[selected], residue_index[selected]
+            last_char, has_insertion_code = last_char[selected], has_insertion_code[selected]
+        
+        aa_keys = pack_columns(block[:, 5 - 5:8 - 5])
+        aa_index = np.minimum(np.searchsorted(AA_KEYS, aa_keys), len(AA_KEYS) - 1)
+        aa_codes = np.where(AA_KEYS[aa_index] == aa_keys, AA_CODES[aa_index], ord('X'))
+        
+        ss_codes = block[:, 24 - 5]
+        ss_lookup = build_ss_lookup(self.SS_TRANSLATION)
+        
+        chain_ids, chain_code = encode_chains(byte_keys(block[:, 9 - 5:10 - 5]))
         
-    def process_data(self, algorithm_out: str) -> np.ndarray:
-        data = []
-        for line in algorithm_out.split('\n'):
-            if not re.search(r"^ASG", line):
-                continue
-			
-            residue_index_with_insertion_code = line[10:15]
-            residue_index_with_insertion_code = residue_index_with_insertion_code.replace(" ", "")
-            if not residue_index_with_insertion_code[-1].isdigit():
-                insertion_code = residue_index_with_insertion_code[-1]
-                residue_index = int(residue_index_with_insertion_code[:-1])
-            else:
-                insertion_code = ""
-                residue_index = int(residue_index_with_insertion_code)
-            chain_id = line[9]
-            AA = AMINO_ACIDS.get(line[5:8], 'X')
-            SS_code = line[24]
-            SS = self.SS_TRANSLATION.get(SS_code, 'Other')
-            
-            data.append((residue_index, insertion_code, chain_id, AA, SS, SS_code))
-            
-            
-        dtype = [('residue_index', 'i4'),
-                ('insertion_code', 'U1'),
-                ('chain_id', 'U1'),
-                ('AA', 'U1'),
-                ('SS', 'U6'),
-                ('SS_code', 'U1')]
-			    
-        np_data = np.array(data, dtype=dtype)
-        return np_data
+        np_data = np.empty(len(block), dtype=RESIDUE_DTYPE)
+        np_data['residue_index'] = residue_index
+        np_data['insertion_code'] = chars_to_unicode(np.where(has_insertion_code, last_char, 0))
+        np_data['chain_code'] = chain_code
+        np_data['AA'] = chars_to_unicode(aa_codes)
+        np_data['SS'] = ss_lookup[ss_codes]
+        np_data['SS_code'] = chars_to_unicode(ss_codes)
+        return ResidueRecords(np_data, chain_ids)
@@ -0,0 +1,224 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Optional, TextIO, Tuple, Union
+
+# Magic bytes of the supported compression formats
+COMPRESSION_MAGIC = {'gzip': b'\x1f\x8b',
+                     'bz2': b'BZh',
+                     'xz': b'\xfd7zXZ\x00'}
+COMPRESSION_OPENERS = {'gzip': gzip.open,
+                       'bz2': bz2.open,
+                       'xz': lzma.open}
+COMPRESSION_DECOMPRESSORS = {'gzip': gzip.decompress,
+                             'bz2': bz2.decompress,
+                             'xz': lzma.decompress}
+COMPRESSED_SUFFIXES = {'.gz': 'gzip',
+                       '.bz2': 'bz2',
+                       '.xz': 'xz'}
+COPY_CHUNK_SIZE = 1 << 20
+
+
+def detect_compression(path: Union[str, 'InMemoryFile']) -> Optional[str]:
+    """
+    Detect the compression format of a file from its magic bytes.
+
+    Args:
+        path (Union[str, InMemoryFile]): Path to the file; in-memory files are
+            never compressed (see `InMemoryFile.from_source`).
+
+    Returns:
+        Optional[str]: 'gzip', 'bz2' or 'xz', or None for an uncompressed file.
+    """
+    if isinstance(path, InMemoryFile):
+        return None
+    with open(path, 'rb') as fh:
+        return _detect_magic(fh.read(max(len(magic) for magic in COMPRESSION_MAGIC.values())))
+
+
+def _detect_magic(head: bytes) -> Optional[str]:
+    for name, magic in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+@dataclass
+class InMemoryFile:
+    """
+    Structure file content held in memory (e.g. an upload), used in place of a path.
+
+    Attributes:
+        data (Union[bytes, bytearray, memoryview]): Uncompressed file content.
+        suffix (str): File name suffix of the format (e.g. '.pdb'), for programs
+            that need a named file.
+    """
+    data: Union[bytes, bytearray, memoryview]
+    suffix: str = ''
+
+    @classmethod
+    def from_source(cls, source: Union[bytes, bytearray, memoryview, BinaryIO], suffix: str = '') -> 'InMemoryFile':
+        """
+        Wrap bytes, a memoryview or the rest of a binary file object.
+
+        Buffers are kept without a copy; gzip/bz2/xz content is decompressed in memory.
+
+        Args:
+            source (Union[bytes, bytearray, memoryview, BinaryIO]): File content or
+                an open binary file.
+            suffix (str): File name suffix of the format.
+
+        Returns:
+            InMemoryFile: The (decompressed) content.
+        """
+        data = source.read() if hasattr(source, 'read') else source
+        if isinstance(data, memoryview):
+            data = data.cast('B') if data.c_contiguous else data.tobytes()
+        compression = _detect_magic(bytes(data[:max(len(magic) for magic in COMPRESSION_MAGIC.values())]))
+        if compression is not None:
+            data = COMPRESSION_DECOMPRESSORS[compression](data)
+        return cls(data, suffix)
+
+
+def strip_compression_suffix(path: str) -> str:
+    """
+    Remove a trailing '.gz', '.bz2' or '.xz' from a file name.
+
+    Args:
+        path (str): File name or path.
+
+    Returns:
+        str: The name without the compression suffix, e.g. '1abc.cif' for '1abc.cif.gz'.
+    """
+    root, suffix = os.path.splitext(path)
+    return root if suffix.lower() in COMPRESSED_SUFFIXES else path
+
+
+def open_binary(path: str) -> BinaryIO:
+    """
+    Open a file for binary reading, decompressing gzip/bz2/xz content on the fly.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        BinaryIO: Stream of the (decompressed) file content.
+    """
+    compression = detect_compression(path)
+    if compression is None:
+        return open(path, 'rb')
+    return COMPRESSION_OPENERS[compression](path, 'rb')
+
+
+def open_text(path: str) -> TextIO:
+    """
+    Open a file for text reading, decompressing gzip/bz2/xz content on the fly.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        TextIO: Text stream of the (decompressed) file content.
+    """
+    return io.TextIOWrapper(open_binary(path))
+
+
+@dataclass
+class AlgorithmInput:
+    """
+    Path handed to an external program, with the file descriptors it must inherit.
+
+    Attributes:
+        path (str): Path the program should read.
+        pass_fds (Tuple[int, ...]): File descriptors to keep open in the child process.
+    """
+    path: str
+    pass_fds: Tuple[int, ...] = ()
+
+
+def _copy_content(source: Union[BinaryIO, bytes, bytearray, memoryview], sink: BinaryIO) -> None:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        sink.write(source)
+        return
+    with source:
+        shutil.copyfileobj(source, sink, COPY_CHUNK_SIZE)
+
+
+def _pump(source: Union[BinaryIO, bytes, bytearray, memoryview], write_fd: int, errors: list) -> None:
+    """
+    Copy a decompressing stream (or an in-memory buffer) into the write end of a pipe.
+
+    The reader leaving early (broken pipe) is not an error.
+    """
+    try:
+        with open(write_fd, 'wb') as sink:
+            _copy_content(source, sink)
+    except BrokenPipeError:
+        pass
+    except Exception as error:
+        errors.append(error)
+
+
+@contextmanager
+def algorithm_input(path: Union[str, InMemoryFile], use_pipe: bool = True,
+                    scratch_dir: Optional[str] = None) -> Iterator[AlgorithmInput]:
+    """
+    Provide a readable path to a structure file for an external program.
+
+    Uncompressed files are passed through unchanged. Compressed files and
+    in-memory content are streamed (through the decompressor) either into a
+    pipe exposed as /dev/fd/N (no data touches the disk) or, for programs
+    that need a seekable file, into a single scratch file that is removed on
+    exit. The scratch file keeps the inner suffix (e.g. '.cif') so programs
+    that pick the format from the extension still work.
+
+    Args:
+        path (Union[str, InMemoryFile]): Path to the (possibly compressed) structure
+            file, or its content.
+        use_pipe (bool): Stream through a pipe when the platform supports /dev/fd.
+        scratch_dir (Optional[str]): Directory for the scratch file; the system
+            temporary directory by default.
+
+    Yields:
+        AlgorithmInput: Path for the program and file descriptors it must inherit.
+
+    Raises:
+        OSError: If decompressing into the pipe failed.
+    """
+    if isinstance(path, InMemoryFile):
+        source, suffix = path.data, path.suffix
+    else:
+        compression = detect_compression(path)
+        if compression is None:
+            yield AlgorithmInput(path)
+            return
+        source = COMPRESSION_OPENERS[compression](path, 'rb')
+        suffix = os.path.splitext(strip_compression_suffix(path))[1]
+    if use_pipe and os.path.isdir('/dev/fd'):
+        read_fd, write_fd = os.pipe()
+        errors = []
+        pump = threading.Thread(target=_pump, args=(source, write_fd, errors), daemon=True)
+        pump.start()
+        try:
+            yield AlgorithmInput(f"/dev/fd/{read_fd}", (read_fd,))
+        finally:
+            # Closing the read end unblocks the pump if the program stopped reading early
+            os.close(read_fd)
+            pump.join()
+        if errors:
+            raise OSError(f"Failed to stream {path if isinstance(path, str) else 'in-memory input'}: "
+                          f"{errors[0]}") from errors[0]
+        return
+    with tempfile.NamedTemporaryFile(suffix=suffix, dir=scratch_dir, delete=False) as scratch:
+        _copy_content(source, scratch)
+    try:
+        yield AlgorithmInput(scratch.name)
+    finally:
+        os.remove(scratch.name)
@@ -1,5 +1,7 @@
 from typing import Dict, Optional
 
+import numpy as np
+
 from .base_mode import BaseMode
 
 DEFAULT_HYDROPHILICITY_COLORS = {'hydrophobic': 'red',
@@ -60,11 +62,20 @@ class AaMode(BaseMode):
         
         
     def get_color(self, residue: 'Residue') -> str:
+        return self._color_of_code(residue.amino_acid)
+        
+    def get_colors(self, table: 'ResidueTable') -> np.ndarray:
+        # One palette lookup per distinct amino acid code
+        codes, inverse = np.unique(table.amino_acid, return_inverse=True)
+        code_colors = np.array([self._color_of_code(chr(code).strip('\0')) for code in codes], dtype=object)
+        return code_colors[inverse.reshape(-1)]
+    
+    def _color_of_code(self, amino_acid: str) -> str:
         if self._sub_mode == 'hydrophilicity':
-            classification = AA_GROUPS.get(residue.amino_acid.upper())
+            classification = AA_GROUPS.get(amino_acid.upper())
             if classification is None:
                 return "#CCCCCC"
             return self.color_palette.get(classification, "#CCCCCC")
         elif self._sub_mode == 'single_aa':
-            return self.color_palette.get(residue.amino_acid.upper(), "#CCCCCC")
+            return self.color_palette.get(amino_acid.upper(), "#CCCCCC")
         return "#CCCCCC"
@@ -17,11 +17,12 @@ class bFactorMode(BaseMode):
                        (40,  60):  '#00FF00',  # green
                        (60,  80):  '#FFFF00',  # yellow
                        (80, 200):  '#FF0000'}  # red 
-    OPS = {'mean': np.mean,
-           'median': np.median,
-           'lowest': np.min,
-           'highest':np.max,
-           'a_fold': np.min} 
+    # Sub-mode to the B-factor aggregate precomputed for every residue
+    OPS = {'mean': 'mean',
+           'median': 'median',
+           'lowest': 'min',
+           'highest': 'max',
+           'a_fold': 'min'}
     def __init__(self, sub_mode: str, color_palette: Optional[Dict[str, str]] = None):
         super().__init__(sub_mode, self.AVAILABLE_SUB_MODS)
         if color_palette is None:
@@ -34,15 +35,17 @@ class bFactorMode(BaseMode):
         
         
     def get_color(self, residue: 'Residue') -> str:
-        b_value = self._get_num_from_vector(residue.b_factors)
+        b_value = residue.b_factor_stat(self.OPS[self._sub_mode])
         for (low, high), color in self.palette.items():
             if low <= b_value <= high:
                 return color
         return "#CCCCCC"
-        
-    
-    def _get_num_from_vector(self, b_vector: np.ndarray) -> float:
-        if b_vector.size == 0:
-            return 0.0
-        return float(self.OPS[self._sub_mode](b_vector))
             
+        
+    def get_colors(self, table: 'ResidueTable') -> np.ndarray:
+        b_values = table.b_factor_stat(self.OPS[self._sub_mode])
+        if not self.palette:
+            return np.full(len(table), "#CCCCCC", dtype=object)
+        # The first matching range wins, as in get_color
+        conditions = [(low <= b_values) & (b_values <= high) for low, high in self.palette]
+        return np.select(conditions, list(self.palette.values()), "#CCCCCC").astype(object)
@@ -1,6 +1,10 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Optional, List
 
+import numpy as np
+
+from ....structures.residue_table import ResidueView
+
 class BaseMode(ABC):
     """
     Abstract base class for defining coloring strategies for chain residues.
@@ -35,3 +39,21 @@ class BaseMode(ABC):
             str: Hex or named color string for rendering the residue.
         """
         pass
+
+    def get_colors(self, table: 'ResidueTable') -> np.ndarray:
+        """
+        Compute colors for every row of a residue table.
+
+        The default calls `get_color` on a proxy of every row; modes override it
+        to read the table columns directly.
+
+        Args:
+            table (ResidueTable): Residue columns of a chain (or a slice of it).
+
+        Returns:
+            np.ndarray: Object array of color strings, one per row.
+        """
+        colors = np.empty(len(table), dtype=object)
+        for i, residue in enumerate(ResidueView(table)):
+            colors[i] = self.get_color(residue)
+        return colors
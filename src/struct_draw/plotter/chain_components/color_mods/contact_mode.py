@@ -0,0 +1,48 @@
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .base_mode import BaseMode
+
+class ContactMode(BaseMode):
+    """
+    Colors residues by their number of contacts (see `BaseModel.compute_contacts`).
+
+    'burial' counts contacts with any residue, so buried residues stand out;
+    'interface' counts only contacts with residues of other chains. Residues
+    of models without computed contacts count 0.
+    """
+    AVAILABLE_SUB_MODS = ['burial', 'interface']
+    DEFAULT_BURIAL = {(0,   4):  '#FFFFCC',  # exposed
+                      (5,   8):  '#FED976',
+                      (9,  12):  '#FD8D3C',
+                      (13, 16):  '#E31A1C',
+                      (17, 1000): '#800026'}  # buried
+    DEFAULT_INTERFACE = {(0,   0):  '#D9D9D9',  # no contact with other chains
+                         (1,   2):  '#9ECAE1',
+                         (3,   5):  '#4292C6',
+                         (6, 1000): '#08306B'}
+    # Sub-mode to the contact count stored for every residue
+    KINDS = {'burial': 'total',
+             'interface': 'interface'}
+    def __init__(self, sub_mode: str, color_palette: Optional[Dict[Tuple[int, int], str]] = None):
+        super().__init__(sub_mode, self.AVAILABLE_SUB_MODS)
+        if color_palette is None:
+            self.palette = self.DEFAULT_BURIAL if self._sub_mode == 'burial' else self.DEFAULT_INTERFACE
+        else:
+            self.palette = color_palette
+
+    def get_color(self, residue: 'Residue') -> str:
+        count = residue.contact_count(self.KINDS[self._sub_mode])
+        for (low, high), color in self.palette.items():
+            if low <= count <= high:
+                return color
+        return "#CCCCCC"
+
+    def get_colors(self, table: 'ResidueTable') -> np.ndarray:
+        counts = table.contact_count(self.KINDS[self._sub_mode])
+        if not self.palette:
+            return np.full(len(table), "#CCCCCC", dtype=object)
+        # The first matching range wins, as in get_color
+        conditions = [(low <= counts) & (counts <= high) for low, high in self.palette]
+        return np.select(conditions, list(self.palette.values()), "#CCCCCC").astype(object)
@@ -3,8 +3,9 @@ from .structure_mode import StructureMode
 from .aa_mode import AaMode
 from .base_mode import BaseMode
 from .b_factor_mode import bFactorMode
+from .contact_mode import ContactMode
 
-AVAILABLE_MODS = ['structure', 'aa', 'b_factor']
+AVAILABLE_MODS = ['structure', 'aa', 'b_factor', 'contacts']
 def create_mode( mode_type: str, sub_mode: str, 
     color_palette: Optional[Dict[str, str]] = None) -> BaseMode:
     mode_type_lower = mode_type.lower()
@@ -14,6 +15,8 @@ def create_mode( mode_type: str, sub_mode: str,
         return AaMode(sub_mode, color_palette)
     elif mode_type_lower == "b_factor":
         return bFactorMode(sub_mode, color_palette)
+    elif mode_type_lower == "contacts":
+        return ContactMode(sub_mode, color_palette)
     else:
-        raise ValueError(f"Wrong coloring mode: {mode_type}. Available mods: {', '.join(available_sub_mods)}")
+        raise ValueError(f"Wrong coloring mode: {mode_type}. Available mods: {', '.join(AVAILABLE_MODS)}")
 
@@ -1,5 +1,7 @@
 from typing import Dict, Optional
 
+import numpy as np
+
 from .base_mode import BaseMode
                       
 DEFAULT_STRUCTURES_COLORS = {'helix': 'green',
@@ -20,3 +22,9 @@ class StructureMode(BaseMode):
     def get_color(self, residue: 'Residue') -> str:
         if self._sub_mode == 'secondary':
             return self.color_palette.get(residue.secondary_structure.lower(), "#CCCCCC")
+        
+    def get_colors(self, table: 'ResidueTable') -> np.ndarray:
+        # One palette lookup per distinct SS label
+        label_colors = np.array([self.color_palette.get(str(label).lower(), "#CCCCCC")
+                                 for label in table.ss_labels], dtype=object)
+        return label_colors[table.ss]
@@ -5,6 +5,7 @@ import numpy as np
 from .chain_base_area import BaseArea
 from struct_draw.plotter.small_units.shape import Other, Helix, Strand, Gap
 from .color_mods.mode_factory import create_mode
+from ...structures.residue_table import ResidueView
 
 class ShapesArea(BaseArea):
     """
@@ -31,7 +32,7 @@ class ShapesArea(BaseArea):
         self._start = start
         self._end = end if end is not None else len(chain.residues)
         self.__chain = chain
-        self.__residues_quantity = len(self.__chain.residues[self._start:self._end])
+        self.__residues_quantity = len(range(len(chain.residues))[self._start:self._end])
         self.__shape_size = shape_size
         self._split_info = self._compute_split_info(split)
         self._show_amino_code = show_amino_code
@@ -80,8 +81,8 @@ class ShapesArea(BaseArea):
         """
         Creates and configures shape instances for each residue.
 
-        Uses residue.secondary_structure to select shape class and tracks
-        sub-structure positions for rendering transitions.
+        Reads the SS and color columns of the chain's residue table to select
+        shape classes and sub-structure positions for rendering transitions.
 
         Returns:
             np.ndarray: Array of shape objects.
@@ -93,31 +94,23 @@ class ShapesArea(BaseArea):
                              'gap': Gap}
                       
         
-        sub_structure_shape_pos = 'first'
-        is_differen_sub_structure = False
-             
-        for i, global_index in enumerate(range(self._start, self._end)):
-            residue = self.__chain.residues[global_index]
-            ss = residue.secondary_structure
-            shape = structure_classes.get(ss, Other)
-            
-            if global_index != self._end - 1:
-                next_shape = structure_classes.get(self.__chain.residues[global_index + 1].secondary_structure, Other)
-                if shape != next_shape:
-                    is_differen_sub_structure = True
-                    sub_structure_shape_pos = 'last'
-            else:
-                sub_structure_shape_pos = 'last'
-
-            fillcolor = self._palette.get_color(residue)
-            shape_storage[i] = shape(residue, self.__shape_size,
-                                     fillcolor, self._show_amino_code, sub_structure_shape_pos)
-
-            if is_differen_sub_structure:
-                sub_structure_shape_pos = 'first'
-                is_differen_sub_structure = False
-            else:
-                sub_structure_shape_pos = 'inner'
+        table = self.__chain.table[self._start:self._end]
+        label_shapes = np.array([structure_classes.get(str(label), Other) for label in table.ss_labels],
+                                dtype=object)
+        shapes = label_shapes[table.ss]
+        
+        # A residue closes its sub-structure when the next shape differs, and opens one after a closing residue
+        is_last = np.ones(len(shapes), dtype=bool)
+        is_last[:-1] = shapes[1:] != shapes[:-1]
+        is_first = np.ones(len(shapes), dtype=bool)
+        is_first[1:] = is_last[:-1]
+        positions = np.where(is_last, 'last', np.where(is_first, 'first', 'inner'))
+        
+        fillcolors = self._palette.get_colors(table)
+        residues = ResidueView(table)
+        for i in range(len(shapes)):
+            shape_storage[i] = shapes[i](residues[i], self.__shape_size, fillcolors[i],
+                                         self._show_amino_code, str(positions[i]))
             
         return shape_storage
         
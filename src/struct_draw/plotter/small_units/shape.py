@@ -214,6 +214,7 @@ class Strand(BaseShape):
         
 @dataclass
 class Gap(BaseShape):
+    @staticmethod
     def _get_points_coficients(pos: str, size: int) -> np.ndarray:
         return  np.rint(np.array([
             (0.1, 0.5),
@@ -1,2 +1,5 @@
 from .pdb_model import *
 from .alignment import Alignment
+from .ensemble import Ensemble
+from .sequence_model import SequenceModel, SequenceRecords, iter_sequence_models, read_sequence_records
+from .spatial import CellList
@@ -1,10 +1,41 @@
+import multiprocessing
 import os
-from typing import List, Dict, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 
 import numpy as np
 
+from ..compression import COMPRESSED_SUFFIXES, open_text, strip_compression_suffix
 from .pdb_model import PDB, PDBx
 
+MODEL_CLASSES = {'pdb': PDB,
+                 'cif': PDBx}
+# Parser processes must not be forked while runner threads are alive
+PROCESS_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+class ModelBuildError(RuntimeError):
+    """
+    Raised when one model of an alignment cannot be built.
+
+    Attributes:
+        model_key (str): Model identifier from the alignment header.
+        pdb_file (str): Structure file of the model.
+    """
+    def __init__(self, model_key: str, pdb_file: str, error: Exception):
+        super().__init__(f"Failed to build model {model_key} from {pdb_file}: {error}")
+        self.model_key = model_key
+        self.pdb_file = pdb_file
+
+
+def _note_model(error: Exception, model_key: str, pdb_file: str) -> None:
+    """
+    Name the model an error was raised for, keeping the error's type (notes need Python 3.11).
+    """
+    if hasattr(error, 'add_note'):
+        error.add_note(f"while building model {model_key} from {pdb_file}")
+
+
 class Alignment:
     """
     Manages reading of a multi-FASTA alignment file and initialization of PDB models based on that alignment.
@@ -14,8 +45,10 @@ class Alignment:
         _data_dir (str): Directory containing PDB files referenced in the alignment headers.
         _alignment_data (List[Tuple[str, str]]): List of (header, sequence) pairs from the file.
         models (List[PDB]): Initialized PDB models with aligned sequences.
+        _max_workers (Optional[int]): Number of models built concurrently; None or 1 builds them one by one.
     """
-    def __init__(self, alignment_file: str, data_dir: str, algorithms: str):
+    def __init__(self, alignment_file: str, data_dir: str, algorithms: str,
+                 max_workers: Optional[int] = None):
         """
         Read the alignment file and create PDB models for each unique entry.
 
@@ -23,15 +56,18 @@ class Alignment:
             alignment_file (str): FASTA-format alignment file path.
             data_dir (str): Directory where PDB files are stored.
             algorithms (str): Algorithm key used for model initialization.
+            max_workers (Optional[int]): Build models concurrently: algorithm runs
+                in a thread pool, output and B-factor parsing in a process pool.
         """
         self._alignment_file = alignment_file
         self._data_dir = data_dir
+        self._max_workers = max_workers
         self._alignment_data = self._read_alignment()
         self.models = self._init_models(algorithms)
 
     def _read_alignment(self) -> List[Tuple[str, str]]:
         """
-        Parse the alignment file into header-sequence tuples.
+        Parse the alignment file (optionally gzip/bz2/xz compressed) into header-sequence tuples.
 
         Returns:
             List[Tuple[str, str]]: A list of (header, sequence) entries.
@@ -40,7 +76,7 @@ class Alignment:
         current_header = None
         current_seq = []
         filepath = self._alignment_file
-        with open(filepath, 'r') as f:
+        with open_text(filepath) as f:
             for line in f:
                 line = line.strip()
                 if not line:
@@ -62,30 +98,117 @@ class Alignment:
         Initialize PDB model instances and align sequences based on unique models.
 
         For each unique (model_id, algorithm) pair:
-            1. Construct PDB file path.
+            1. Construct PDB file path (see `_resolve_model_file`).
             2. Instantiate a PDB object with the algorithm key and chains list.
             3. Align each chain's sequence into the PDB model.
 
+        With `max_workers` > 1 the models are built concurrently (see
+        `_build_models_parallel`); the result keeps the alignment order.
+
         Returns:
             List[PDB]: List of initialized and sequence-aligned PDB objects.
+
+        Raises:
+            ModelBuildError: If a model built in the pools fails (see `_build_models_parallel`).
+            Exception: Errors of models built one by one, or of aligning a sequence (e.g. the
+                ValueError of a missing chain), are raised as they are, naming the model in a note.
         """
         
-        model_entries = self._get_unique_models()
+        jobs = []
+        for (model_key, file_type), chain_seqs in self._get_unique_models().items():
+            pdb_file, file_type = self._resolve_model_file(model_key, file_type)
+            if file_type in MODEL_CLASSES:
+                jobs.append((model_key, MODEL_CLASSES[file_type], pdb_file, chain_seqs))
+        if self._max_workers is not None and self._max_workers > 1:
+            built = self._build_models_parallel(algorithms, jobs)
+        else:
+            built = []
+            for model_key, model_cls, pdb_file, chain_seqs in jobs:
+                try:
+                    built.append(model_cls(algorithms, pdb_file, list(chain_seqs.keys())))
+                except Exception as error:
+                    _note_model(error, model_key, pdb_file)
+                    raise
         new_models: List['PDB'] = []
-        for (model_key, file_type), chain_seqs in model_entries.items():
-            pdb_file = f"{self._data_dir}/{model_key}.{file_type}"
-            chains_list = list(chain_seqs.keys())
-            if file_type == 'pdb':
-                new_model = PDB(algorithms, pdb_file, chains_list)
-            elif file_type == 'cif':
-                new_model = PDBx(algorithms, pdb_file, chains_list)
-            else:
-                continue
-            for chain_id, sequence in chain_seqs.items():
-                new_model.get_chain(chain_id).align_seq(sequence)
+        for (model_key, _, pdb_file, chain_seqs), new_model in zip(jobs, built):
+            try:
+                for chain_id, sequence in chain_seqs.items():
+                    new_model.get_chain(chain_id).align_seq(sequence)
+            except Exception as error:
+                _note_model(error, model_key, pdb_file)
+                raise
             new_models.append(new_model)
         return new_models
+
+    def _build_models_parallel(self, algorithms, jobs: list) -> List['PDB']:
+        """
+        Build models concurrently, keeping the order of `jobs`.
+
+        Algorithm runs only wait on subprocesses, so they go to a thread pool.
+        As soon as a run finishes, parsing its output and the B-factors of the
+        structure is handed to a process pool. The first failure cancels all
+        pending work and both pools are shut down before it is raised. Worker
+        processes are started by a fork server rather than forked from this
+        process, whose runner and input pump threads may hold locks.
+
+        Args:
+            algorithms: Algorithm object shared by all models.
+            jobs (list): (model_key, model class, structure file, chain sequences) tuples.
+
+        Returns:
+            List[PDB]: Models in the order of `jobs`, not yet sequence-aligned.
+
+        Raises:
+            ModelBuildError: For the first model (in alignment order) that fails.
+        """
+        context = multiprocessing.get_context(PROCESS_START_METHOD)
+        with ThreadPoolExecutor(self._max_workers) as runners, \
+                ProcessPoolExecutor(self._max_workers, mp_context=context) as parsers:
+            runs = [runners.submit(algorithms.run_cached, pdb_file) for _, _, pdb_file, _ in jobs]
+            parses = []
+            try:
+                for (model_key, model_cls, pdb_file, chain_seqs), run in zip(jobs, runs):
+                    try:
+                        algorithm_out = run.result()
+                    except Exception as error:
+                        raise ModelBuildError(model_key, pdb_file, error) from error
+                    parses.append(parsers.submit(model_cls, algorithms, pdb_file,
+                                                 list(chain_seqs.keys()), algorithm_out))
+                built = []
+                for (model_key, _, pdb_file, _), parse in zip(jobs, parses):
+                    try:
+                        built.append(parse.result())
+                    except Exception as error:
+                        raise ModelBuildError(model_key, pdb_file, error) from error
+            except BaseException:
+                for future in runs + parses:
+                    future.cancel()
+                raise
+        return built
     
+    def _resolve_model_file(self, model_key: str, file_type: str) -> Tuple[str, str]:
+        """
+        Locate the structure file of a model in the data directory.
+
+        The header file type may name a compressed file directly (e.g. 'cif.gz').
+        For a plain type whose file is missing, a compressed copy
+        ('<model>.<type>.gz', '.bz2' or '.xz') is used instead.
+
+        Args:
+            model_key (str): Model identifier from the header.
+            file_type (str): File type from the header.
+
+        Returns:
+            Tuple[str, str]: Path to the file and its structure type ('pdb' or 'cif').
+        """
+        pdb_file = f"{self._data_dir}/{model_key}.{file_type}"
+        structure_type = strip_compression_suffix(file_type)
+        if structure_type == file_type and not os.path.exists(pdb_file):
+            for suffix in COMPRESSED_SUFFIXES:
+                if os.path.exists(pdb_file + suffix):
+                    return pdb_file + suffix, structure_type
+        return pdb_file, structure_type
+
     def _get_unique_models(self) -> Dict[Tuple[str, str], Dict[str, str]]:
         """
         Extract unique models and associated chain sequences from alignment headers.
@@ -0,0 +1,623 @@
+import mmap
+import re
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..algorithms.columns import iter_line_chunks, residue_range_mask
+from ..compression import InMemoryFile, detect_compression, open_binary
+from .readers import (AtomTable, Backbone, ColumnDecoder, ResidueBFactors, ResidueCoordinates,
+                      first_per_residue, group_by_residue, map_file)
+
+ATOM_SITE_PREFIX = b'_atom_site.'
+# Lines that close a loop in PDBx/mmCIF files, or open a multi-line text field
+LOOP_BOUNDARY = re.compile(rb'\n(#|_|loop_|data_|;)')
+LOOP_TERMINATORS = (b'#', b'_', b'loop_', b'data_')
+# Byte classes: whitespace, and characters that need the full CIF tokenizer (quotes, comments)
+IS_WHITESPACE = np.zeros(256, dtype=bool)
+IS_WHITESPACE[list(b' \t\r\n')] = True
+IS_SPECIAL = np.zeros(256, dtype=bool)
+IS_SPECIAL[list(b'\'"#')] = True
+CIF_TOKEN = re.compile(rb"""'(.*?)'(?=[ \t\r]|$)|"(.*?)"(?=[ \t\r]|$)|(#.*)|([^ \t\r]+)""")
+CHUNK_SIZE = 1 << 24
+# Residue key items of `_atom_site`; author items are preferred when present
+ATOM_SITE_KEY_TAGS = ['auth_asym_id', 'label_asym_id', 'auth_seq_id', 'label_seq_id', 'pdbx_PDB_ins_code']
+QA_METRIC_LOCAL_TAGS = ['label_asym_id', 'label_seq_id', 'metric_id', 'metric_value']
+POLY_SEQ_SCHEME_TAGS = ['asym_id', 'seq_id', 'pdb_strand_id', 'pdb_seq_num', 'pdb_ins_code']
+COORDINATE_TAGS = ['Cartn_x', 'Cartn_y', 'Cartn_z']
+FIRST_MODEL_TAGS = ATOM_SITE_KEY_TAGS + ['pdbx_PDB_model_num']
+ATOM_TABLE_TAGS = (ATOM_SITE_KEY_TAGS + COORDINATE_TAGS
+                   + ['group_PDB', 'label_atom_id', 'auth_atom_id', 'auth_comp_id', 'label_comp_id', 'type_symbol',
+                      'B_iso_or_equiv', 'occupancy', 'pdbx_PDB_model_num'])
+
+
+def _line_tokens(line: bytes, offset: int) -> List[Tuple[int, int]]:
+    """
+    Tokenize one line with CIF quoting rules.
+
+    A quote opens a value only at the start of a token and closes it only when
+    followed by whitespace; '#' at the start of a token comments out the rest of the line.
+    """
+    spans = []
+    for match in CIF_TOKEN.finditer(line):
+        if match.lastindex == 3:
+            break
+        start, end = match.span(match.lastindex)
+        spans.append((offset + start, offset + end))
+    return spans
+
+
+def _python_tokens(buf: np.ndarray, start: int, end: int,
+                   stop_at_loop_end: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tokenize buf[start:end] line by line, including multi-line ';' text fields.
+
+    With `stop_at_loop_end` tokenizing stops at the first line (outside text
+    fields) that closes a loop.
+    """
+    text = buf[start:end].tobytes()
+    spans = []
+    pos = 0
+    while pos < len(text):
+        line_end = text.find(b'\n', pos)
+        line_end = len(text) if line_end == -1 else line_end
+        if stop_at_loop_end and text.startswith(LOOP_TERMINATORS, pos):
+            break
+        if text.startswith(b';', pos):
+            closing = text.find(b'\n;', line_end)
+            closing = len(text) if closing == -1 else closing
+            spans.append((start + pos + 1, start + closing))
+            line_end = text.find(b'\n', closing + 1)
+            line_end = len(text) if line_end == -1 else line_end
+            # Values may follow the closing ';' on the same line
+            spans.extend(_line_tokens(text[closing + 2:line_end], start + closing + 2))
+        else:
+            spans.extend(_line_tokens(text[pos:line_end], start + pos))
+        pos = line_end + 1
+    spans = np.array(spans, dtype=np.int64).reshape(-1, 2)
+    return spans[:, 0], spans[:, 1]
+
+
+def _chunk_tokens(buf: np.ndarray, offset: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tokenize a chunk of whole lines without ';' text fields.
+
+    Plain lines are split on whitespace with array operations; only lines with
+    quotes or comments go through the line tokenizer.
+    """
+    is_space = IS_WHITESPACE[buf]
+    text = buf.tobytes()
+    extra_starts, extra_ends = [], []
+    if b"'" in text or b'"' in text or b'#' in text:
+        special = np.flatnonzero(IS_SPECIAL[buf])
+        newlines = np.flatnonzero(buf == ord('\n'))
+        line_index = np.unique(np.searchsorted(newlines, special))
+        line_starts = np.concatenate(([0], newlines + 1))[line_index]
+        line_ends = np.append(newlines, buf.size)[line_index]
+        for line_start, line_end in zip(line_starts, line_ends):
+            is_space[line_start:line_end] = True
+            spans = _line_tokens(buf[line_start:line_end].tobytes(), offset + int(line_start))
+            extra_starts.extend(start for start, _ in spans)
+            extra_ends.extend(end for _, end in spans)
+    # Token boundaries alternate: space -> token is a start, token -> space an end
+    padded = np.concatenate(([True], is_space, [True]))
+    boundaries = np.flatnonzero(padded[1:] != padded[:-1]) + offset
+    starts, ends = boundaries[0::2], boundaries[1::2]
+    if extra_starts:
+        starts = np.concatenate((starts, extra_starts))
+        ends = np.concatenate((ends, extra_ends))
+        order = np.argsort(starts, kind='stable')
+        starts, ends = starts[order], ends[order]
+    return starts, ends
+
+
+def _gather_tokens(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Copy tokens into a fixed-width, zero-padded byte string array.
+    """
+    width = int(np.max(ends - starts, initial=1))
+    matrix = np.zeros((len(starts), width), dtype=np.uint8)
+    for j in range(width):
+        inside = starts + j < ends
+        matrix[inside, j] = buf[starts[inside] + j]
+    return matrix.view(f'S{width}').ravel()
+
+
+def _find_category(mm: Union[mmap.mmap, bytes], prefix: bytes = ATOM_SITE_PREFIX) -> Tuple[List[str], int, int, bool]:
+    """
+    Locate a category (`_atom_site` by default) given the prefix of its tags.
+
+    Returns:
+        Tuple[List[str], int, int, bool]: Tag names, start and end offsets of the
+        values, and whether the category is written as a loop. For a loop the
+        end offset is the end of the file; see `_loop_columns`.
+    """
+    pos = 0
+    while True:
+        pos = mm.find(prefix, pos)
+        if pos == -1:
+            return [], 0, 0, False
+        if pos == 0 or mm[pos - 1:pos] == b'\n':
+            break
+        pos += len(prefix)
+    prev_line_start = mm.rfind(b'\n', 0, max(pos - 1, 0)) + 1
+    is_loop = mm[prev_line_start:pos].strip() == b'loop_'
+    if not is_loop:
+        end = min([found for found in (mm.find(term, pos) for term in (b'\n#', b'\nloop_', b'\ndata_'))
+                   if found != -1] or [len(mm)])
+        return [], pos, end, False
+    tags = []
+    while mm[pos:pos + len(prefix)] == prefix:
+        line_end = mm.find(b'\n', pos)
+        line_end = len(mm) if line_end == -1 else line_end
+        tags.append(mm[pos + len(prefix):line_end].strip().decode())
+        pos = line_end + 1
+    data_start = min(pos, len(mm))
+    return tags, data_start, len(mm), True
+
+
+def _loop_columns(mm: Union[mmap.mmap, bytes], buf: np.ndarray, tags: List[str], start: int, end: int,
+                  wanted: Sequence[str]) -> Dict[str, np.ndarray]:
+    n_tags = len(tags)
+    indices = {tag: tags.index(tag) for tag in wanted if tag in tags}
+    pieces: Dict[str, List[np.ndarray]] = {tag: [] for tag in indices}
+    boundary = LOOP_BOUNDARY.search(mm, max(start - 1, 0), end)
+    if boundary is not None and boundary.group(1) == b';':
+        token_chunks = [_python_tokens(buf, start, end, stop_at_loop_end=True)]
+    else:
+        end = boundary.start() if boundary is not None else end
+        region = buf[start:end]
+        token_chunks = (_chunk_tokens(chunk, start + offset)
+                        for chunk, offset in _chunks_with_offsets(region))
+    carry_starts = np.array([], dtype=np.int64)
+    carry_ends = np.array([], dtype=np.int64)
+    for starts, ends in token_chunks:
+        starts = np.concatenate((carry_starts, starts))
+        ends = np.concatenate((carry_ends, ends))
+        n_full = len(starts) // n_tags * n_tags
+        carry_starts, carry_ends = starts[n_full:], ends[n_full:]
+        rows_starts = starts[:n_full].reshape(-1, n_tags)
+        rows_ends = ends[:n_full].reshape(-1, n_tags)
+        for tag, index in indices.items():
+            pieces[tag].append(_gather_tokens(buf, rows_starts[:, index], rows_ends[:, index]))
+    if len(carry_starts):
+        raise ValueError("Number of values in the loop is not a multiple of the number of tags")
+    return {tag: np.concatenate(parts) if parts else np.array([], dtype='S1')
+            for tag, parts in pieces.items()}
+
+
+def _chunks_with_offsets(region: np.ndarray):
+    offset = 0
+    for chunk in iter_line_chunks(region, CHUNK_SIZE):
+        yield chunk, offset
+        offset += chunk.size
+
+
+def _pair_columns(buf: np.ndarray, start: int, end: int, wanted: Sequence[str],
+                  prefix: bytes = ATOM_SITE_PREFIX) -> Dict[str, np.ndarray]:
+    """Values of a single-row category written as tag/value pairs."""
+    starts, ends = _python_tokens(buf, start, end)
+    result = {}
+    for key_start, key_end, value_start, value_end in zip(starts[::2], ends[::2], starts[1::2], ends[1::2]):
+        tag = buf[key_start:key_end].tobytes()
+        if tag.startswith(prefix) and tag[len(prefix):].decode() in wanted:
+            result[tag[len(prefix):].decode()] = _gather_tokens(
+                buf, np.array([value_start]), np.array([value_end]))
+    return result
+
+
+def load_cif(cif_file: Union[str, InMemoryFile]) -> Union[mmap.mmap, bytes, None]:
+    """
+    Content of a PDBx/mmCIF file for `read_cif_category`.
+
+    The file is memory-mapped; gzip/bz2/xz files are decompressed in memory
+    instead, without temporary files. In-memory content is used as is (a
+    memoryview is copied into bytes once).
+
+    Returns:
+        Union[mmap.mmap, bytes, None]: The content, None (or b'') for an empty file.
+    """
+    if isinstance(cif_file, InMemoryFile):
+        return cif_file.data if isinstance(cif_file.data, bytes) else bytes(cif_file.data)
+    if detect_compression(cif_file) is not None:
+        with open_binary(cif_file) as fh:
+            return fh.read()
+    return map_file(cif_file)
+
+
+def read_cif_category(cif: Union[str, InMemoryFile, mmap.mmap, bytes, None], category: str,
+                      tags: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Read selected columns of one category of a PDBx/mmCIF file.
+
+    Args:
+        cif (Union[str, InMemoryFile, mmap.mmap, bytes, None]): Path to the file, an
+            in-memory file, or content from `load_cif` when several categories are read.
+        category (str): Category name with the leading underscore (e.g. '_atom_site').
+        tags (Sequence[str]): Tag names without the category prefix.
+
+    Returns:
+        Dict[str, np.ndarray]: Fixed-width byte string array (dtype 'S<n>') for
+        every requested tag present in the file. Missing tags are left out.
+
+    Raises:
+        ValueError: If the loop values do not fill whole rows.
+    """
+    mm = cif if cif is None or isinstance(cif, (mmap.mmap, bytes)) else load_cif(cif)
+    if not mm:
+        return {}
+    prefix = category.encode() + b'.'
+    loop_tags, start, end, is_loop = _find_category(mm, prefix)
+    if not is_loop:
+        if end <= start:
+            return {}
+        return _pair_columns(np.frombuffer(mm, dtype=np.uint8), start, end, tags, prefix)
+    if not loop_tags:
+        return {}
+    return _loop_columns(mm, np.frombuffer(mm, dtype=np.uint8), loop_tags, start, end, tags)
+
+
+def read_cif_atom_site(cif_file: Union[str, InMemoryFile], tags: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Read selected columns of the `_atom_site` category of a PDBx/mmCIF file.
+
+    The file is memory-mapped (gzip/bz2/xz files are decompressed in memory
+    instead, without temporary files), the scan jumps straight to the `_atom_site` loop,
+    and only that loop is tokenized. Quoted values, comments and multi-line
+    ';' text fields follow the CIF rules. Besides B-factors this can pull
+    coordinates (`Cartn_x`, `Cartn_y`, `Cartn_z`) or any other column.
+
+    Args:
+        cif_file (Union[str, InMemoryFile]): Path to the mmCIF file, or its content.
+        tags (Sequence[str]): Tag names without the `_atom_site.` prefix.
+
+    Returns:
+        Dict[str, np.ndarray]: Fixed-width byte string array (dtype 'S<n>') for
+        every requested tag present in the file. Missing tags are left out.
+
+    Raises:
+        ValueError: If the loop values do not fill whole rows.
+    """
+    return read_cif_category(cif_file, '_atom_site', tags)
+
+
+def parse_cif_ints(column: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode a byte string column of integers.
+
+    Args:
+        column (np.ndarray): Array with dtype 'S<n>'.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: int64 values and a mask of entries that
+        are valid integers ('.' and '?' are not).
+    """
+    values, n_fraction, valid = _decode_decimal(column)
+    return values, valid & (n_fraction == -1)
+
+
+def parse_cif_floats(column: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode a byte string column of real numbers.
+
+    Plain decimal values are decoded with array operations and give exactly
+    the same result as float(); anything else (exponents, very long mantissas)
+    is passed to float() one by one.
+
+    Args:
+        column (np.ndarray): Array with dtype 'S<n>'.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: float64 values and a mask of entries that
+        are valid numbers ('.' and '?' are not).
+    """
+    mantissa, n_fraction, valid = _decode_decimal(column)
+    values = mantissa / 10.0 ** np.maximum(n_fraction, 0)
+    for i in np.flatnonzero(~valid):
+        try:
+            values[i] = float(column[i])
+            valid[i] = True
+        except ValueError:
+            pass
+    return values, valid
+
+
+def _decode_decimal(column: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decode `[+-]digits[.digits]` values.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Signed mantissa of all digits,
+        number of digits after the point (-1 without a point) and a validity mask.
+    """
+    n = len(column)
+    width = column.dtype.itemsize
+    matrix = np.ascontiguousarray(column).view(np.uint8).reshape(n, width)
+    mantissa = np.zeros(n, dtype=np.int64)
+    n_digits = np.zeros(n, dtype=np.int64)
+    n_fraction = np.full(n, -1, dtype=np.int64)
+    valid = np.ones(n, dtype=bool)
+    negative = matrix[:, 0] == ord('-') if width else np.zeros(n, dtype=bool)
+    signed = negative | (matrix[:, 0] == ord('+')) if width else negative
+    ended = np.zeros(n, dtype=bool)
+    for j in range(width):
+        byte = matrix[:, j]
+        digit = byte - np.uint8(ord('0'))
+        is_digit = digit < 10
+        is_point = byte == ord('.')
+        is_end = byte == 0
+        valid &= is_digit | is_end | (is_point & (n_fraction == -1)) | ((j == 0) & signed)
+        valid &= ~ended | is_end
+        ended |= is_end
+        mantissa = np.where(is_digit, mantissa * 10 + digit, mantissa)
+        n_digits += is_digit
+        n_fraction = np.where(is_point & ~ended, 0, n_fraction + (is_digit & (n_fraction >= 0)))
+    # Exact as long as the mantissa and the power of ten are exact doubles
+    valid &= (n_digits > 0) & (n_digits <= 15) & (n_fraction <= 22)
+    return np.where(negative, -mantissa, mantissa), n_fraction, valid
+
+
+def _first_bytes(column: np.ndarray) -> np.ndarray:
+    """First byte of every entry of a byte string column."""
+    return np.ascontiguousarray(column).view(np.uint8).reshape(len(column), column.dtype.itemsize)[:, 0]
+
+
+def read_cif_b_factors(cif_file: Union[str, InMemoryFile], include_only: Optional[Sequence[str]] = None,
+                       residue_range: Optional[Tuple[int, int]] = None) -> ResidueBFactors:
+    """
+    Read B-factors of all `_atom_site` records of a PDBx/mmCIF file, grouped by residue.
+
+    Residues are keyed like in `read_cif_atoms`, and only the key columns and
+    `B_iso_or_equiv` are read. Records without a numeric residue number or
+    `B_iso_or_equiv` are skipped. With `include_only`, records of other chains
+    are dropped before the numeric fields are parsed; with `residue_range`,
+    records outside it are dropped before `B_iso_or_equiv` is parsed. Only
+    the first model of a multi-model file is read.
+
+    Args:
+        cif_file (Union[str, InMemoryFile]): Path to the mmCIF file, or its content.
+        include_only (Optional[Sequence[str]]): Chain IDs to read; None reads all.
+        residue_range (Optional[Tuple[int, int]]): First and last residue number
+            to read (inclusive); None reads all.
+
+    Returns:
+        ResidueBFactors: B-factors grouped by residue.
+    """
+    columns = _first_model(read_cif_atom_site(cif_file, FIRST_MODEL_TAGS + ['B_iso_or_equiv']))
+    return _group_residue_values(*_atom_site_keys(columns), columns.get('B_iso_or_equiv'),
+                                 include_only, residue_range)
+
+
+def _atom_site_keys(columns: Dict[str, np.ndarray]) -> Tuple[Optional[np.ndarray], ...]:
+    """
+    Chain ID, residue number and insertion code columns of `_atom_site`,
+    author items preferred over label items.
+    """
+    chain_tag = 'auth_asym_id' if 'auth_asym_id' in columns else 'label_asym_id'
+    seq_tag = 'auth_seq_id' if 'auth_seq_id' in columns else 'label_seq_id'
+    return columns.get(chain_tag), columns.get(seq_tag), columns.get('pdbx_PDB_ins_code')
+
+
+def _group_residue_values(chains: Optional[np.ndarray], res_seqs: Optional[np.ndarray],
+                          ins_codes: Optional[np.ndarray], values: Optional[np.ndarray],
+                          include_only: Optional[Sequence[str]],
+                          residue_range: Optional[Tuple[int, int]]) -> ResidueBFactors:
+    """
+    Filter, decode and group byte string columns of per-atom (or per-residue) values.
+
+    A missing column gives an empty result.
+    """
+    columns = [chains, res_seqs, ins_codes, values]
+    if any(column is None for column in columns):
+        columns = [np.array([], dtype='S1')] * 4
+    if include_only is not None:
+        selected = np.isin(columns[0], [chain_id.encode() for chain_id in include_only])
+        columns = [column[selected] for column in columns]
+    res_seq, seq_ok = parse_cif_ints(columns[1])
+    if residue_range is not None:
+        selected = seq_ok & residue_range_mask(res_seq, residue_range)
+        columns = [column[selected] for column in columns]
+        res_seq, seq_ok = res_seq[selected], seq_ok[selected]
+    parsed, values_ok = parse_cif_floats(columns[3])
+    ok = seq_ok & values_ok
+    ins_codes = _first_bytes(columns[2][ok])
+    # '?' and '.' are the CIF null values
+    ins_codes = np.where((ins_codes == ord('?')) | (ins_codes == ord('.')), ord(' '), ins_codes)
+    chain_ids, chain_index = np.unique(columns[0][ok], return_inverse=True)
+    return group_by_residue(chain_ids.astype('U'), chain_index, res_seq[ok], ins_codes, parsed[ok])
+
+
+def _first_model(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Rows of `_atom_site` columns that belong to the first model.
+    """
+    if 'pdbx_PDB_model_num' not in columns or not len(columns['pdbx_PDB_model_num']):
+        return columns
+    models = columns['pdbx_PDB_model_num']
+    in_first = models == models[0]
+    return {tag: values[in_first] for tag, values in columns.items()}
+
+
+def _cif_decoders(columns: Dict[str, np.ndarray], n_atoms: int) -> Dict[str, ColumnDecoder]:
+    """
+    Decoders of the AtomTable feature columns from `_atom_site` byte string columns.
+    """
+    def text(tags: Sequence[str], default: bytes) -> ColumnDecoder:
+        present = [tag for tag in tags if tag in columns]
+        if present:
+            return lambda rows: columns[present[0]][rows]
+        return lambda rows: np.full(n_atoms, default)[rows]
+
+    def number(tag: str) -> ColumnDecoder:
+        # Missing or unreadable numbers are NaN
+        def decode(rows: Union[np.ndarray, slice]) -> np.ndarray:
+            if tag not in columns:
+                return np.full(n_atoms, np.nan)[rows]
+            values, valid = parse_cif_floats(columns[tag][rows])
+            return np.where(valid, values, np.nan)
+        return decode
+
+    def coordinates(rows: Union[np.ndarray, slice]) -> np.ndarray:
+        return np.stack([number(tag)(rows) for tag in COORDINATE_TAGS], axis=1).astype(np.float32)
+
+    occupancy = number('occupancy')
+    return {'atom_name': text(['label_atom_id', 'auth_atom_id'], b''),
+            'residue_name': text(['auth_comp_id', 'label_comp_id'], b'UNK'),
+            'element': text(['type_symbol'], b''), 'coordinates': coordinates,
+            'b_factor': number('B_iso_or_equiv'), 'occupancy': lambda rows: occupancy(rows).astype(np.float32)}
+
+
+def read_cif_atoms(cif_file: Union[str, InMemoryFile, mmap.mmap, bytes, None]) -> AtomTable:
+    """
+    Read the `_atom_site` records of a PDBx/mmCIF file into an AtomTable in one pass.
+
+    Residues are keyed by the author chain ID and residue number
+    (`auth_asym_id`, `auth_seq_id`; the `label_*` items when those are absent),
+    which is the numbering DSSP reports, and `pdbx_PDB_ins_code` ('?' and '.'
+    are read as ' '). Chain IDs may have any length. Atom names come from
+    `label_atom_id` (`auth_atom_id` when absent). Only the residue keys are
+    parsed up front; the other columns are parsed on demand (see `AtomTable`).
+    Records without a numeric residue number are skipped; missing or
+    unreadable numbers are NaN. Only the first model of a multi-model file is
+    read. The B-factors alone are read faster with `read_cif_b_factors`.
+
+    Args:
+        cif_file (Union[str, InMemoryFile, mmap.mmap, bytes, None]): Path to the mmCIF file,
+            its content, or a file opened with `load_cif`.
+
+    Returns:
+        AtomTable: Atom columns; HETATM records count for per-residue features.
+    """
+    columns = _first_model(read_cif_category(cif_file, '_atom_site', ATOM_TABLE_TAGS))
+    chains, res_seqs, ins_codes = _atom_site_keys(columns)
+    if chains is None or res_seqs is None:
+        chains = res_seqs = np.array([], dtype='S1')
+    res_seq, ok = parse_cif_ints(res_seqs)
+    columns = {tag: values[ok] for tag, values in columns.items()}
+    n_atoms = int(ok.sum())
+    ins_codes = _first_bytes(ins_codes[ok]) if ins_codes is not None else np.full(n_atoms, ord(' '))
+    # '?' and '.' are the CIF null values
+    ins_codes = np.where((ins_codes == ord('?')) | (ins_codes == ord('.')), ord(' '), ins_codes).astype(np.uint8)
+    is_hetatm = columns['group_PDB'] == b'HETATM' if 'group_PDB' in columns else np.zeros(n_atoms, dtype=bool)
+    chain_ids, chain_index = np.unique(chains[ok], return_inverse=True)
+    return AtomTable(chain_ids=chain_ids.astype('U'), chain_index=chain_index.ravel(), residue_index=res_seq[ok],
+                     insertion_code=ins_codes, is_hetatm=is_hetatm, decoders=_cif_decoders(columns, n_atoms))
+
+
+def read_cif_backbone(cif_file: Union[str, InMemoryFile]) -> Backbone:
+    """
+    Read the backbone coordinates of the `_atom_site` records of a PDBx/mmCIF file.
+
+    Residues are keyed like in `read_cif_atoms`. Only the first model of
+    a multi-model file is read.
+
+    Args:
+        cif_file (Union[str, InMemoryFile]): Path to the mmCIF file, or its content.
+
+    Returns:
+        Backbone: Residues with a complete backbone, in file order.
+    """
+    return read_cif_atoms(cif_file).backbone()
+
+
+def read_cif_coordinates(cif_file: Union[str, InMemoryFile]) -> ResidueCoordinates:
+    """
+    Read the atom coordinates of the `_atom_site` records of a PDBx/mmCIF file, grouped by residue.
+
+    Residues are keyed like in `read_cif_atoms`; records without a numeric
+    residue number or coordinate are skipped. Only the first model of a
+    multi-model file is read.
+
+    Args:
+        cif_file (Union[str, InMemoryFile]): Path to the mmCIF file, or its content.
+
+    Returns:
+        ResidueCoordinates: float32 positions grouped by residue.
+    """
+    return read_cif_atoms(cif_file).residue_coordinates()
+
+
+def read_cif_plddt(cif_file: Union[str, InMemoryFile], include_only: Optional[Sequence[str]] = None,
+                   residue_range: Optional[Tuple[int, int]] = None,
+                   atoms: Optional[AtomTable] = None) -> ResidueBFactors:
+    """
+    Read one confidence value (pLDDT) per residue of a predicted model.
+
+    ModelCIF files (AlphaFold DB and others) list per-residue scores in
+    `_ma_qa_metric_local`; then no atom record is decoded. Only pLDDT rows
+    are used when `_ma_qa_metric` declares the metric types. The scores are
+    keyed by label IDs, translated to author IDs through
+    `_pdbx_poly_seq_scheme` when present. Files without the category fall
+    back to the B-factors of CA atoms. Residues keep only their first value.
+
+    Args:
+        cif_file (Union[str, InMemoryFile]): Path to the mmCIF file, or its content.
+        include_only (Optional[Sequence[str]]): Chain IDs to read; None reads all.
+        residue_range (Optional[Tuple[int, int]]): First and last residue number
+            to read (inclusive); None reads all.
+        atoms (Optional[AtomTable]): Atom table of the file if already read; the
+            CA fallback then takes the B-factors from it.
+
+    Returns:
+        ResidueBFactors: One value per residue.
+    """
+    mm = load_cif(cif_file)
+    local = read_cif_category(mm, '_ma_qa_metric_local', QA_METRIC_LOCAL_TAGS)
+    if len(local) == len(QA_METRIC_LOCAL_TAGS) and len(local['metric_value']):
+        scores = _plddt_rows(mm, local)
+        keys = _label_to_auth(mm, scores['label_asym_id'], scores['label_seq_id'])
+        b_factors = _group_residue_values(*keys, scores['metric_value'], include_only, residue_range)
+    elif atoms is not None:
+        return atoms.plddt(include_only, residue_range)
+    else:
+        columns = _first_model(read_cif_category(mm, '_atom_site',
+                                                 FIRST_MODEL_TAGS + ['label_atom_id', 'B_iso_or_equiv']))
+        if 'label_atom_id' in columns:
+            is_ca = columns.pop('label_atom_id') == b'CA'
+            columns = {tag: values[is_ca] for tag, values in columns.items()}
+        b_factors = _group_residue_values(*_atom_site_keys(columns), columns.get('B_iso_or_equiv'),
+                                          include_only, residue_range)
+    return first_per_residue(b_factors)
+
+
+def _plddt_rows(mm: Union[mmap.mmap, bytes], local: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Rows of `_ma_qa_metric_local` holding pLDDT scores, all rows if metric types are not declared.
+    """
+    metrics = read_cif_category(mm, '_ma_qa_metric', ['id', 'type'])
+    if 'id' not in metrics or 'type' not in metrics:
+        return local
+    plddt_ids = metrics['id'][metrics['type'] == b'pLDDT']
+    if len(plddt_ids) == 0:
+        return local
+    selected = np.isin(local['metric_id'], plddt_ids)
+    return {tag: values[selected] for tag, values in local.items()}
+
+
+def _label_to_auth(mm: Union[mmap.mmap, bytes], asym_ids: np.ndarray,
+                   seq_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Author chain IDs, residue numbers and insertion codes of residues given by label IDs.
+
+    Residues missing from `_pdbx_poly_seq_scheme` (or files without it) keep their label IDs.
+    """
+    ins_codes = np.full(len(asym_ids), b'?', dtype='S1')
+    scheme = read_cif_category(mm, '_pdbx_poly_seq_scheme', POLY_SEQ_SCHEME_TAGS)
+    if len(scheme) < len(POLY_SEQ_SCHEME_TAGS) or len(scheme['asym_id']) == 0:
+        return asym_ids, seq_ids, ins_codes
+    scheme_keys = np.char.add(np.char.add(scheme['asym_id'], b' '), scheme['seq_id'])
+    order = np.argsort(scheme_keys, kind='stable')
+    sorted_keys = scheme_keys[order]
+    keys = np.char.add(np.char.add(asym_ids, b' '), seq_ids)
+    positions = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+    found = sorted_keys[positions] == keys
+    rows = order[positions[found]]
+
+    def translated(label: np.ndarray, auth: np.ndarray) -> np.ndarray:
+        width = max(label.dtype.itemsize, auth.dtype.itemsize)
+        result = label.astype(f'S{width}')
+        result[found] = auth[rows]
+        return result
+
+    return (translated(asym_ids, scheme['pdb_strand_id']), translated(seq_ids, scheme['pdb_seq_num']),
+            translated(ins_codes, scheme['pdb_ins_code']))
@@ -0,0 +1,82 @@
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .readers import ResidueCoordinates, lookup_residue_keys
+from .spatial import CellList
+
+# Heavy-atom distance (Å) under which two residues are in contact
+CONTACT_RADIUS = 4.5
+
+
+@dataclass
+class ResidueContacts:
+    """
+    Residue contact map of a model in sparse form.
+
+    Attributes:
+        chain_ids (np.ndarray): Sorted unique chain IDs; residue keys store an index into it.
+        keys (np.ndarray): Sorted unique residue keys (see `pack_residue_keys`).
+        pairs (np.ndarray): (contacts, 2) positions into `keys` of residues in
+            contact, first < second, sorted.
+        counts (Dict[str, np.ndarray]): Per-residue number of contacts: 'total'
+            and 'interface' (with residues of other chains).
+        radius (float): Distance cutoff the map was computed with.
+    """
+    chain_ids: np.ndarray
+    keys: np.ndarray
+    pairs: np.ndarray
+    counts: Dict[str, np.ndarray]
+    radius: float
+
+    def lookup(self, chain_id: str, residue_index: np.ndarray,
+               insertion_codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find residues of one chain in the key table (see `ResidueBFactors.lookup`).
+        """
+        return lookup_residue_keys(self.chain_ids, self.keys, chain_id, residue_index, insertion_codes)
+
+    def chain_counts(self, positions: np.ndarray, found: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Contact counts of one chain's residues, 0 for residues without atoms.
+
+        Args:
+            positions (np.ndarray): Position of every residue of the chain in `keys`.
+            found (np.ndarray): Mask of residues present in `keys`.
+
+        Returns:
+            Dict[str, np.ndarray]: int32 counts per kind, one per residue.
+        """
+        return {kind: np.where(found, counts[positions], 0).astype(np.int32) if len(counts)
+                else np.zeros(len(positions), dtype=np.int32)
+                for kind, counts in self.counts.items()}
+
+
+def residue_contacts(coordinates: ResidueCoordinates, radius: float = CONTACT_RADIUS) -> ResidueContacts:
+    """
+    Residues with any pair of atoms closer than `radius`.
+
+    Atom pairs are found with a cell list, so the cost grows with the number
+    of atoms and close pairs rather than with the square of the atom count.
+
+    Args:
+        coordinates (ResidueCoordinates): Atom positions grouped by residue.
+        radius (float): Distance cutoff in Å.
+
+    Returns:
+        ResidueContacts: Contact pairs and per-residue counts.
+    """
+    n_residues = len(coordinates.keys)
+    first, second = CellList(coordinates.values, radius).pairs(radius)
+    residue = coordinates.atom_residue
+    first, second = residue[first], residue[second]
+    other = first != second
+    low, high = np.minimum(first[other], second[other]), np.maximum(first[other], second[other])
+    packed = np.unique(low.astype(np.int64) * n_residues + high)
+    pairs = np.stack((packed // max(n_residues, 1), packed % max(n_residues, 1)), axis=1)
+    chain = coordinates.keys >> 40
+    across = chain[pairs[:, 0]] != chain[pairs[:, 1]]
+    counts = {'total': np.bincount(pairs.ravel(), minlength=n_residues),
+              'interface': np.bincount(pairs[across].ravel(), minlength=n_residues)}
+    return ResidueContacts(coordinates.chain_ids, coordinates.keys, pairs, counts, float(radius))
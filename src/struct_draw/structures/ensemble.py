@@ -0,0 +1,229 @@
+import os
+import tempfile
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from ..algorithms.base_algorithm import ResidueRecords
+from ..algorithms.columns import build_ss_lookup, chars_to_unicode
+from .pdb_model import Chain
+from .readers import B_FACTOR_STATS, ChainBFactors, iter_pdb_models, pack_residue_keys, unicode_codes
+from .residue_table import GAP_LABEL
+
+# SS code of a residue missing from a model
+MISSING_SS_CODE = 0
+
+
+class Ensemble:
+    """
+    Per-model secondary structure of a multi-model PDB file (NMR ensemble, MD trajectory).
+
+    Models are processed one at a time: every model is written to a scratch
+    file and run through the algorithm (or taken from precomputed per-model
+    outputs), and only its SS codes are kept, as one row of a
+    (models x residues) uint8 matrix. Memory is bounded by one model plus the
+    matrix. Matrix columns are the residues of the first model, sorted by
+    chain; residues missing from a later model get MISSING_SS_CODE, residues
+    absent from the first model are ignored.
+
+    Attributes:
+        reference (np.ndarray): Algorithm records of the first model sorted by chain,
+            one per matrix column.
+        chain_ids (np.ndarray): Chain dictionary of `reference`.
+        chain_bounds (Dict[str, Tuple[int, int]]): Matrix columns of every chain.
+        ss_codes (np.ndarray): uint8 SS code characters, one row per model.
+        model_id (Optional[str]): File name without extension.
+    """
+    def __init__(
+        self, algorithm, pdb_file: Optional[str] = None,
+        include_only: Optional[list] = None, algorithm_outs: Optional[Iterable[str]] = None,
+        residue_range: Optional[Tuple[int, int]] = None, chunk_size: int = 1 << 26,
+        scratch_dir: Optional[str] = None
+        ):
+        """
+        Args:
+            algorithm (object): Algorithm object.
+            pdb_file (Optional[str]): Path to the multi-model PDB file, optionally compressed.
+            include_only (Optional[list]): Chain IDs to keep; None keeps all.
+            algorithm_outs (Optional[Iterable[str]]): Precomputed algorithm outputs,
+                one per model in model order; consumed lazily instead of running
+                the algorithm.
+            residue_range (Optional[Tuple[int, int]]): First and last residue number
+                (inclusive) to keep.
+            chunk_size (int): Bytes of the PDB file read at a time.
+            scratch_dir (Optional[str]): Directory of the per-model scratch files; the
+                system temporary directory by default.
+
+        Raises:
+            ValueError: If neither `pdb_file` nor `algorithm_outs` is given.
+        """
+        if pdb_file is None and algorithm_outs is None:
+            raise ValueError("Ensemble needs a PDB file or precomputed algorithm outputs")
+        self._algorithm = algorithm
+        self._pdb_file = pdb_file
+        self._include_only = include_only
+        self._residue_range = residue_range
+        self._chunk_size = chunk_size
+        self._scratch_dir = scratch_dir
+        self.model_id = None
+        if pdb_file is not None:
+            self.model_id = os.path.splitext(os.path.basename(pdb_file))[0]
+        self._ss_lookup = build_ss_lookup(algorithm.SS_TRANSLATION)
+        self._ss_lookup[MISSING_SS_CODE] = GAP_LABEL
+        self._set_reference(ResidueRecords.empty())
+        rows = []
+        for model, records in enumerate(self._iter_model_records(algorithm_outs)):
+            if model == 0:
+                self._set_reference(records)
+            rows.append(self._ss_row(records))
+        self.ss_codes = np.stack(rows) if rows else np.zeros((0, len(self.reference)), dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.ss_codes)
+
+    def get_chain_ids(self) -> list:
+        return list(self.chain_bounds)
+
+    def _iter_model_records(self, algorithm_outs: Optional[Iterable[str]]) -> Iterator[ResidueRecords]:
+        if algorithm_outs is not None:
+            for algorithm_out in algorithm_outs:
+                yield self._algorithm.parse_output(algorithm_out, self._include_only, self._residue_range)
+            return
+        for model in iter_pdb_models(self._pdb_file, self._chunk_size):
+            fd, path = tempfile.mkstemp(suffix='.pdb', dir=self._scratch_dir)
+            try:
+                with os.fdopen(fd, 'wb') as fh:
+                    model.tofile(fh)
+                del model
+                records = self._run_model(path)
+            finally:
+                os.remove(path)
+            yield records
+
+    def _run_model(self, path: str) -> ResidueRecords:
+        """
+        Residue rows of one model file, as in `BaseModel.load_algorithm_data`.
+        """
+        if self._algorithm.cache is None:
+            return self._algorithm.run_streaming(path, include_only=self._include_only,
+                                                 residue_range=self._residue_range)
+        return self._algorithm.parse_output(self._algorithm.run_cached(path), self._include_only,
+                                            self._residue_range)
+
+    def _set_reference(self, records: ResidueRecords) -> None:
+        """
+        Take the residues of the first model as the matrix columns.
+        """
+        order = np.argsort(records.data['chain_code'], kind='stable')
+        self.reference = records.data[order]
+        self.chain_ids = records.chain_ids
+        bounds = np.searchsorted(self.reference['chain_code'], np.arange(len(self.chain_ids) + 1))
+        self.chain_bounds = {}
+        for code, chain_id in enumerate(self.chain_ids.tolist()):
+            if bounds[code] < bounds[code + 1]:
+                self.chain_bounds[chain_id] = (int(bounds[code]), int(bounds[code + 1]))
+        keys = pack_residue_keys(self.reference['chain_code'], self.reference['residue_index'],
+                                 unicode_codes(self.reference['insertion_code']))
+        self._key_order = np.argsort(keys, kind='stable')
+        self._sorted_keys = keys[self._key_order]
+
+    def _ss_row(self, records: ResidueRecords) -> np.ndarray:
+        """
+        SS codes of one model in the column order of the reference.
+        """
+        row = np.full(len(self.reference), MISSING_SS_CODE, dtype=np.uint8)
+        if len(self._sorted_keys) == 0 or len(records) == 0:
+            return row
+        # Translate the model's chain codes into the reference dictionary
+        chain_pos = np.minimum(np.searchsorted(self.chain_ids, records.chain_ids), len(self.chain_ids) - 1)
+        known_chain = self.chain_ids[chain_pos] == records.chain_ids
+        chain_code = records.data['chain_code']
+        keys = pack_residue_keys(chain_pos[chain_code], records.data['residue_index'],
+                                 unicode_codes(records.data['insertion_code']))
+        positions = np.minimum(np.searchsorted(self._sorted_keys, keys), len(self._sorted_keys) - 1)
+        found = known_chain[chain_code] & (self._sorted_keys[positions] == keys)
+        row[self._key_order[positions[found]]] = unicode_codes(records.data['SS_code'][found])
+        return row
+
+    def _columns(self, chain_id: str) -> Tuple[int, int]:
+        if chain_id not in self.chain_bounds:
+            raise ValueError(f"Ensemble does not contain chain: {chain_id}")
+        return self.chain_bounds[chain_id]
+
+    def _chain(self, chain_id: str, codes: np.ndarray, model_id: str) -> Chain:
+        start, end = self._columns(chain_id)
+        data = self.reference[start:end].copy()
+        data['SS_code'] = chars_to_unicode(codes)
+        data['SS'] = self._ss_lookup[codes]
+        return Chain(chain_id, str(self._algorithm), model_id, data)
+
+    def model_chain(self, model: int, chain_id: str) -> Chain:
+        """
+        One chain of one model, for rendering the models as separate rows.
+
+        Residues missing from the model are drawn as gaps.
+
+        Args:
+            model (int): Model position (0-based) in the file.
+            chain_id (str): Chain identifier.
+
+        Returns:
+            Chain: The chain, its `model_id` suffixed with the 1-based model number.
+        """
+        start, end = self._columns(chain_id)
+        return self._chain(chain_id, self.ss_codes[model, start:end], f"{self.model_id}/{model + 1}")
+
+    def model_chains(self, chain_id: str) -> Iterator[Chain]:
+        """
+        `model_chain` of every model in turn.
+        """
+        return (self.model_chain(model, chain_id) for model in range(len(self)))
+
+    def ss_frequency(self, chain_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fraction of models assigning every SS label to every residue of a chain.
+
+        Args:
+            chain_id (str): Chain identifier.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Sorted SS labels ('gap' counts missing
+            residues) and a float (labels x residues) matrix of fractions.
+        """
+        start, end = self._columns(chain_id)
+        labels, label_of_code = np.unique(self._ss_lookup, return_inverse=True)
+        model_labels = label_of_code.ravel()[self.ss_codes[:, start:end]]
+        counts = np.stack([np.count_nonzero(model_labels == label, axis=0) for label in range(len(labels))])
+        return labels, counts / max(len(self), 1)
+
+    def consensus_chain(self, chain_id: str) -> Chain:
+        """
+        Summary of a chain over all models: the most frequent SS label of every residue.
+
+        The SS code is the most frequent code among those translating to that
+        label. The chain's B-factors hold the percentage of models agreeing
+        with the consensus label, so the 'b_factor' color mode shows how
+        stable the assignment is.
+
+        Args:
+            chain_id (str): Chain identifier.
+
+        Returns:
+            Chain: The consensus chain, its `model_id` suffixed with 'consensus'.
+        """
+        start, end = self._columns(chain_id)
+        labels, frequency = self.ss_frequency(chain_id)
+        consensus = np.argmax(frequency, axis=0)
+        n_residues = end - start
+        agreement = frequency[consensus, np.arange(n_residues)]
+        # Count every code per residue, keeping only codes of the consensus label
+        flat = self.ss_codes[:, start:end].astype(np.int64) * n_residues + np.arange(n_residues)
+        code_counts = np.bincount(flat.ravel(), minlength=256 * n_residues).reshape(256, n_residues)
+        label_of_code = np.searchsorted(labels, self._ss_lookup)
+        code_counts = np.where(label_of_code[:, None] == consensus, code_counts, -1)
+        codes = np.argmax(code_counts, axis=0).astype(np.uint8)
+        chain = self._chain(chain_id, codes, f"{self.model_id}/consensus")
+        values = (agreement * 100).astype(np.float32)
+        chain.b_factors = ChainBFactors(values, np.arange(n_residues + 1, dtype=np.int64),
+                                        {name: values.astype(float) for name in B_FACTOR_STATS})
+        return chain
@@ -1,44 +1,176 @@
+import asyncio
 import os
-from typing import Optional, Dict, Tuple, List
+from collections.abc import Mapping
+from typing import BinaryIO, Callable, Iterator, Optional, Dict, Tuple, List, Union
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
-from collections import defaultdict
-import re
 
 import numpy as np
 
+from .readers import (AtomTable, ChainBFactors, ResidueBFactors, ResidueCoordinates, chain_b_factors,
+                      read_pdb_atoms, read_pdb_b_factors, read_pdb_plddt, unicode_codes)
+from .cif_reader import read_cif_atoms, read_cif_b_factors, read_cif_plddt
+from .contacts import CONTACT_RADIUS, ResidueContacts, residue_contacts
+from .residue_table import Residue, ResidueTable, ResidueView
+from .snapshot import read_snapshot, write_snapshot
+from .spatial import CellList
+from ..algorithms.base_algorithm import ResidueRecords
+from ..compression import InMemoryFile
+
+# Structure file content accepted in place of a path
+StructureSource = Union[str, InMemoryFile, bytes, bytearray, memoryview, BinaryIO]
+
+SNAPSHOT_VERSION = 1
+# ResidueTable columns stored in a snapshot, besides the B-factors
+TABLE_COLUMNS = ('residue_index', 'insertion_code', 'amino_acid', 'ss', 'ss_code', 'data_row', 'ss_labels')
+
+class LazyChains(Mapping):
+    """
+    Read-only mapping of chain IDs to Chain objects that builds every Chain on first access.
+
+    All chains share one array of algorithm records sorted by chain ID; a chain
+    is just a (start, end) slice of it until it is requested.
+
+    Attributes:
+        data (np.ndarray): Algorithm records sorted by chain ID.
+        bounds (Dict[str, Tuple[int, int]]): Slice of `data` of every chain.
+    """
+    def __init__(self, data: np.ndarray, bounds: Dict[str, Tuple[int, int]],
+                 make_chain: Callable[[str, np.ndarray], 'Chain']):
+        """
+        Args:
+            data (np.ndarray): Algorithm records sorted by chain ID.
+            bounds (Dict[str, Tuple[int, int]]): Slice of `data` of every chain, in chain order.
+            make_chain (Callable[[str, np.ndarray], Chain]): Builds a Chain from its ID and records.
+        """
+        self.data = data
+        self.bounds = bounds
+        self._make_chain = make_chain
+        self._chains: Dict[str, 'Chain'] = {}
+
+    def __getitem__(self, chain_id: str) -> 'Chain':
+        chain = self._chains.get(chain_id)
+        if chain is None:
+            start, end = self.bounds[chain_id]
+            chain = self._chains[chain_id] = self._make_chain(chain_id, self.data[start:end])
+        return chain
+
+    def __contains__(self, chain_id: object) -> bool:
+        return chain_id in self.bounds
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.bounds)
+
+    def __len__(self) -> int:
+        return len(self.bounds)
+
+    def materialized(self) -> Iterator['Chain']:
+        """
+        Chains that have been built so far.
+        """
+        return iter(list(self._chains.values()))
+
+
 class BaseModel(ABC):
     """
     Abstract base class for running structural analysis algorithms (e.g., DSSP) on PDB files
     and converting the output into Chain objects.
 
     Attributes:
-        _pdb_file (Optional[str]): Path to the PDB file to analyze.
+        _pdb_file (Optional[Union[str, InMemoryFile]]): Path to the PDB file to analyze, or its content.
         _include_only (Optional[list]): List of chain IDs to include in the output; None means all.
         _algorithm (Object): Instance of the algorithm handler obtained via get_algorithm.
-        _algorithm_out (str): Raw output from the algorithm run or provided path to processed data.
-        _chains (dict): Mapping of chain IDs to Chain instances created from algorithm data.
+        _algorithm_out (Optional[str]): Raw output from the algorithm run or provided path to processed data;
+            None when the output was parsed straight from the algorithm's pipe.
+        _chains (LazyChains): Mapping of chain IDs to Chain instances created from algorithm data.
+        _b_factor_dtype (str): Storage type of per-chain B-factors ('float32', 'float16' or 'uint8').
+        _lazy (bool): Build chains and attach their B-factors only when they are accessed.
+        _b_factors (Optional[ResidueBFactors]): B-factors of the whole model, once parsed.
+        _residue_range (Optional[Tuple[int, int]]): First and last residue number kept; None keeps all.
+        _plddt (bool): Read one confidence value per residue instead of per-atom B-factors.
+        _atoms (Optional[AtomTable]): Atom records of the structure file, read once on first use.
+        _coordinates (Optional[ResidueCoordinates]): Atom coordinates of the model grouped by residue.
+        _contacts (Optional[ResidueContacts]): Residue contacts, once computed.
+        FILE_SUFFIX (str): File name suffix of the model's format, for in-memory
+            content handed to programs that need a named file.
     """
+    FILE_SUFFIX = ''
+
     def __init__(
-        self, algorithm, pdb_file: Optional[str] = None,
-        include_only: Optional[list] = None, algorithm_out: Optional[str] = None
+        self, algorithm, pdb_file: Optional[StructureSource] = None,
+        include_only: Optional[list] = None, algorithm_out: Optional[str] = None,
+        b_factor_dtype: str = 'float32', lazy: bool = False,
+        residue_range: Optional[Tuple[int, int]] = None, plddt: bool = False
         ):
         """
         Initialize the BaseModel with algorithm settings and process the structural data.
 
         Args:
             algorithm (object): Algorithm object.
-            pdb_file (Optional[str]): Path to the input PDB file.
+            pdb_file (Optional[StructureSource]): Path to the input PDB file, or its
+                content as bytes, a memoryview or a binary file object (read once,
+                decompressed in memory if needed). Content is parsed in place and
+                piped to the algorithm without a temporary file when it supports that.
             include_only (Optional[list]): Chain IDs to include in final output.
             algorithm_out (Optional[str]): Precomputed algorithm output path or data.
+            b_factor_dtype (str): Storage type of B-factors; 'float16' and 'uint8'
+                trade precision of the raw values for memory.
+            lazy (bool): Build a Chain (and attach its B-factors) on its first
+                access instead of building all chains up front.
+            residue_range (Optional[Tuple[int, int]]): First and last residue number
+                (inclusive) to keep in every chain. Residues outside it are skipped
+                while parsing the algorithm output and the B-factors.
+            plddt (bool): Store one confidence value (pLDDT) per residue instead of
+                the B-factors of every atom; for predicted models colored with 'a_fold'.
         """
-        self._pdb_file = pdb_file
+        self._pdb_file = self._as_input(pdb_file)
+        self._b_factor_dtype = b_factor_dtype
+        self._lazy = lazy
+        self._residue_range = residue_range
+        self._plddt = plddt
+        self._b_factors: Optional[ResidueBFactors] = None
+        self._atoms: Optional[AtomTable] = None
+        self._coordinates: Optional[ResidueCoordinates] = None
+        self._contacts: Optional[ResidueContacts] = None
         self._include_only = include_only
         self._algorithm = algorithm
-        self._algorithm_out = algorithm_out if algorithm_out is not None else self.run_algorithm()
+        self._algorithm_out = algorithm_out
         self._chains = self.process_algorithm_data()
         
         
+    @classmethod
+    def _as_input(cls, pdb_file: Optional[StructureSource]) -> Optional[Union[str, InMemoryFile]]:
+        """
+        Paths pass through; in-memory content is wrapped once in an InMemoryFile.
+        """
+        if pdb_file is None or isinstance(pdb_file, (str, os.PathLike, InMemoryFile)):
+            return pdb_file
+        return InMemoryFile.from_source(pdb_file, cls.FILE_SUFFIX)
+
+    @classmethod
+    async def create_async(cls, algorithm, pdb_file: StructureSource, include_only: Optional[list] = None,
+                           timeout: Optional[float] = None, **kwargs) -> 'BaseModel':
+        """
+        Build a model without blocking the event loop.
+
+        The algorithm is awaited through `run_cached_async`; reading in-memory
+        input, parsing the algorithm output and the B-factors run in worker
+        threads, so the event loop is never blocked.
+
+        Args:
+            algorithm (object): Algorithm object.
+            pdb_file (StructureSource): Path to the input PDB file, or its content.
+            include_only (Optional[list]): Chain IDs to include in final output.
+            timeout (Optional[float]): Seconds to wait for the algorithm.
+            **kwargs: Further constructor arguments (e.g. b_factor_dtype).
+
+        Returns:
+            BaseModel: The constructed model.
+        """
+        pdb_file = await asyncio.to_thread(cls._as_input, pdb_file)
+        algorithm_out = await algorithm.run_cached_async(pdb_file, timeout)
+        return await asyncio.to_thread(cls, algorithm, pdb_file, include_only, algorithm_out, **kwargs)
+        
     def get_chain(self, chain_id: str):
         """
         Retrieve a specific Chain instance by its ID.
@@ -56,38 +188,306 @@ class BaseModel(ABC):
             raise ValueError(f"File does not contain chain: {chain_id}")
         return self._chains[chain_id]
     
-    def get_chain_list(self) -> dict:
+    def get_chain_list(self) -> LazyChains:
+        """
+        All chains of the model.
+
+        Returns:
+            LazyChains: Read-only mapping of chain IDs to Chain objects; in lazy
+                mode a Chain is built when its entry is first accessed.
+        """
         return self._chains
         
     def run_algorithm(self) -> str:
-        return self._algorithm.run(self._pdb_file)
+        return self._algorithm.run_cached(self._pdb_file)
+
+    def load_algorithm_data(self) -> ResidueRecords:
+        """
+        Residue table of the model, from `algorithm_out` or from running the algorithm.
+
+        Without a cache the algorithm output is parsed chunk by chunk straight
+        from its stdout pipe (see `BaseAlgorithm.run_streaming`), so the raw
+        output is never held in memory as a whole. Rows of chains outside
+        `include_only` or residues outside `residue_range` are skipped while
+        parsing (see `BaseAlgorithm.parse_output`). Algorithms that read atom
+        records themselves (`READS_ATOMS`) get the model's atom table, so the
+        file is read only once.
+
+        Returns:
+            ResidueRecords: Residue rows with categorical chain IDs.
+        """
+        if self._algorithm_out is None:
+            if self._algorithm.READS_ATOMS and self._algorithm.cache is None and self._pdb_file is not None:
+                # In-process algorithms share the atom table the B-factors are taken from
+                return self._algorithm.run_atoms(self.atoms, include_only=self._include_only,
+                                                 residue_range=self._residue_range)
+            if self._algorithm.cache is None:
+                return self._algorithm.run_streaming(self._pdb_file, include_only=self._include_only,
+                                                     residue_range=self._residue_range)
+            self._algorithm_out = self.run_algorithm()
+        return self._algorithm.parse_output(self._algorithm_out, self._include_only, self._residue_range)
                                             
     def process_algorithm_data(self) -> dict:
         """
         Parse the algorithm output and construct Chain objects for each chain.
 
         Process:
-            1. Load algorithm data into a DataFrame (expects 'chain_id' column).
-            2. Identify unique chain IDs.
-            3. Filter by include_only if set.
-            4. Create a Chain object for each chain present.
+            1. Load algorithm data with categorical chain IDs.
+            2. Sort it by chain code once, keeping the residue order inside every chain;
+               codes follow the sorted chain dictionary, so chains come out in ID order.
+            3. Find the chain boundaries in the sorted array.
+            4. Register every chain present (filtered by include_only) as a view of
+               its slice of the sorted array; unless the model is lazy, build them all.
 
         Returns:
-            dict: Mapping from chain IDs to Chain instances.
-        """
-        dssp_data = self._algorithm.process_data(self._algorithm_out)
-        unique_chains = np.unique(dssp_data['chain_id'])
-        chains = {}
-        for chain_id in unique_chains:
-            if self._include_only is not None and chain_id not in self._include_only:
-                continue
-            chain_data = dssp_data[dssp_data['chain_id'] == chain_id]
-            pdb_id = None
-            if self._pdb_file is not None:
-                pdb_id = os.path.splitext(os.path.basename(self._pdb_file))[0]
-            chains[chain_id] = Chain(chain_id, str(self._algorithm), pdb_id, chain_data)
+            LazyChains: Mapping from chain IDs to Chain instances, in sorted chain ID order.
+        """
+        records = self.load_algorithm_data()
+        order = np.argsort(records.data['chain_code'], kind='stable')
+        sorted_data = records.data[order]
+        bounds = np.searchsorted(sorted_data['chain_code'], np.arange(len(records.chain_ids) + 1))
+        wanted = np.ones(len(records.chain_ids), dtype=bool)
+        if self._include_only is not None:
+            wanted = np.isin(records.chain_ids, list(self._include_only))
+        chain_bounds = {}
+        for code, chain_id in enumerate(records.chain_ids.tolist()):
+            start, end = int(bounds[code]), int(bounds[code + 1])
+            if start < end and wanted[code]:
+                chain_bounds[chain_id] = (start, end)
+        chains = LazyChains(sorted_data, chain_bounds, self._make_chain)
+        if not self._lazy:
+            for chain_id in chains:
+                chains[chain_id]  # builds and caches the Chain
         return chains
+
+    def _model_id(self) -> Optional[str]:
+        """
+        Identifier of the model stored in its chains: the structure file name without extension.
+        """
+        if self._pdb_file is None or isinstance(self._pdb_file, InMemoryFile):
+            return None
+        return os.path.splitext(os.path.basename(self._pdb_file))[0]
+
+    def _make_chain(self, chain_id: str, chain_data: np.ndarray) -> 'Chain':
+        chain = Chain(chain_id, str(self._algorithm), self._model_id(), chain_data)
+        if self._b_factors is not None:
+            self._attach_chain_b_factors(chain)
+        if self._contacts is not None:
+            self._attach_chain_contacts(chain)
+        return chain
     
+    def _attach_b_factors(self, b_factors: ResidueBFactors) -> None:
+        """
+        Keep the model's B-factors and attach them to every chain built so far.
+
+        Chains built later (lazy mode) get theirs when they are created.
+
+        Args:
+            b_factors (ResidueBFactors): B-factors grouped by residue.
+        """
+        self._b_factors = b_factors
+        for chain in self._chains.materialized():
+            self._attach_chain_b_factors(chain)
+
+    def _attach_chain_b_factors(self, chain: 'Chain') -> None:
+        """
+        Store the B-factors of a chain as one CSR block, one row per algorithm record.
+        """
+        positions, found = self._b_factors.lookup(chain.chain_id, chain.dssp_data['residue_index'],
+                                                  unicode_codes(chain.dssp_data['insertion_code']))
+        chain.b_factors = chain_b_factors(self._b_factors, positions, found, self._b_factor_dtype)
+
+    @property
+    def atoms(self) -> AtomTable:
+        """
+        Atom records of the structure file (first model), read in one pass on
+        first access and shared by the coordinates, in-process algorithms and,
+        once read, the B-factors. All chains are read, whatever `include_only`
+        is. Models that only color by B-factor never read it: their B-factors
+        come from the filtered readers (`read_pdb_b_factors`, `read_cif_b_factors`).
+
+        Raises:
+            ValueError: If the model has no structure file to read them from.
+            TypeError: If the model class does not read atom records (see `read_atoms`).
+        """
+        if self._atoms is None:
+            if self._pdb_file is None:
+                raise ValueError("Model has no structure file to read atoms from")
+            self._atoms = self.read_atoms()
+        return self._atoms
+
+    @property
+    def coordinates(self) -> ResidueCoordinates:
+        """
+        Atom coordinates of the whole model grouped by residue, derived from `atoms`.
+        Chains outside `include_only` are kept, so that contacts with chains that are
+        not drawn are counted too.
+
+        Raises:
+            ValueError: If the model has no structure file to read them from.
+        """
+        if self._coordinates is None:
+            self._coordinates = self.atoms.residue_coordinates()
+        return self._coordinates
+
+    def neighbor_index(self, cell_size: float = CONTACT_RADIUS) -> CellList:
+        """
+        Cell list over all atoms of the model for radius queries up to `cell_size`.
+
+        Points are indexed in the order of `coordinates.values`; the residue of
+        every atom is given by `coordinates.atom_residue`.
+
+        Args:
+            cell_size (float): Largest query radius, in Å.
+
+        Returns:
+            CellList: Neighbor index of the atoms.
+        """
+        return CellList(self.coordinates.values, cell_size)
+
+    def compute_contacts(self, radius: float = CONTACT_RADIUS) -> ResidueContacts:
+        """
+        Find residues in contact (any two atoms within `radius`) and attach the
+        per-residue counts to every chain, for the 'contacts' color mode.
+
+        Chains built later (lazy mode) get theirs when they are created.
+
+        Args:
+            radius (float): Distance cutoff in Å.
+
+        Returns:
+            ResidueContacts: Contact map of the model.
+        """
+        self._contacts = residue_contacts(self.coordinates, radius)
+        for chain in self._chains.materialized():
+            self._attach_chain_contacts(chain)
+        return self._contacts
+
+    def _attach_chain_contacts(self, chain: 'Chain') -> None:
+        positions, found = self._contacts.lookup(chain.chain_id, chain.dssp_data['residue_index'],
+                                                 unicode_codes(chain.dssp_data['insertion_code']))
+        chain.table.contacts = self._contacts.chain_counts(positions, found)
+
+    def read_atoms(self) -> AtomTable:
+        """
+        Read the atom records of the structure file; the structure formats
+        (`PDB`, `PDBx`) override it.
+
+        Raises:
+            TypeError: If the model class does not read atom records.
+        """
+        raise TypeError(f"{type(self).__name__} models do not read atom records")
+
+    def save(self, path: str) -> None:
+        """
+        Write the parsed model to a snapshot file that `load` maps back without
+        running the algorithm or reading the structure file again.
+
+        The snapshot is an uncompressed `.npz` archive holding the algorithm
+        records, the residue table, alignment maps, B-factors and contact
+        counts of every chain (lazy chains are built first), plus the model settings as JSON.
+
+        Args:
+            path (str): Destination file.
+        """
+        arrays = {'records': self._chains.data}
+        chains = []
+        for i, (chain_id, chain) in enumerate(self._chains.items()):
+            prefix = f'chain_{i}.'
+            for name in TABLE_COLUMNS:
+                arrays[prefix + name] = getattr(chain.table, name)
+            arrays[prefix + 'column_to_residue'] = chain.column_to_residue
+            arrays[prefix + 'residue_to_column'] = chain.residue_to_column
+            b_factors = None
+            if chain.b_factors is not None:
+                arrays[prefix + 'b_values'] = chain.b_factors.values
+                arrays[prefix + 'b_offsets'] = chain.b_factors.offsets
+                for name, stat in chain.b_factors.stats.items():
+                    arrays[f'{prefix}b_{name}'] = stat
+                b_factors = {'scale': chain.b_factors.scale, 'shift': chain.b_factors.shift,
+                             'stats': list(chain.b_factors.stats)}
+            contacts = None
+            if chain.table.contacts is not None:
+                contacts = list(chain.table.contacts)
+                for kind, counts in chain.table.contacts.items():
+                    arrays[f'{prefix}contacts_{kind}'] = counts
+            chains.append({'chain_id': chain_id, 'algorithm': chain.algorithm, 'model_id': chain.model_id,
+                           'bounds': list(self._chains.bounds[chain_id]), 'b_factors': b_factors,
+                           'contacts': contacts})
+        meta = {'version': SNAPSHOT_VERSION,
+                'model_class': type(self).__name__,
+                'algorithm': str(self._algorithm),
+                'pdb_file': (None if self._pdb_file is None or isinstance(self._pdb_file, InMemoryFile)
+                             else os.fspath(self._pdb_file)),
+                'include_only': self._include_only,
+                'residue_range': self._residue_range,
+                'b_factor_dtype': self._b_factor_dtype,
+                'lazy': self._lazy,
+                'plddt': self._plddt,
+                'chains': chains}
+        write_snapshot(path, meta, arrays)
+
+    @classmethod
+    def load(cls, path: str, algorithm=None) -> 'BaseModel':
+        """
+        Open a snapshot written by `save`.
+
+        Arrays are read-only views of the memory-mapped file, so loading is
+        near-instant and pages are only read when a chain is drawn. Chains are
+        rebuilt from the stored tables; in lazy mode on first access.
+
+        Args:
+            path (str): Snapshot file.
+            algorithm (object): Algorithm object for the model; the stored algorithm
+                name is used when omitted.
+
+        Returns:
+            BaseModel: The model, of the class it was saved from when called on BaseModel.
+
+        Raises:
+            ValueError: If the file is not a snapshot of a supported version.
+        """
+        meta, arrays = read_snapshot(path)
+        if meta.get('version') != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {meta.get('version')}")
+        model_cls = cls if cls is not BaseModel else _model_class(meta['model_class'])
+        model = model_cls.__new__(model_cls)
+        model._pdb_file = meta['pdb_file']
+        model._b_factor_dtype = meta['b_factor_dtype']
+        model._lazy = meta['lazy']
+        model._residue_range = tuple(meta['residue_range']) if meta['residue_range'] is not None else None
+        model._plddt = meta['plddt']
+        model._include_only = meta['include_only']
+        model._algorithm = algorithm if algorithm is not None else meta['algorithm']
+        model._algorithm_out = None
+        model._b_factors = None
+        model._atoms = None
+        model._coordinates = None
+        model._contacts = None
+        entries = {entry['chain_id']: (i, entry) for i, entry in enumerate(meta['chains'])}
+
+        def make_chain(chain_id: str, chain_data: np.ndarray) -> 'Chain':
+            i, entry = entries[chain_id]
+            prefix = f'chain_{i}.'
+            table = ResidueTable(**{name: arrays[prefix + name] for name in TABLE_COLUMNS})
+            if entry['b_factors'] is not None:
+                table.b_factors = ChainBFactors(arrays[prefix + 'b_values'], arrays[prefix + 'b_offsets'],
+                                                {name: arrays[f'{prefix}b_{name}']
+                                                 for name in entry['b_factors']['stats']},
+                                                entry['b_factors']['scale'], entry['b_factors']['shift'])
+            if entry.get('contacts') is not None:
+                table.contacts = {kind: arrays[f'{prefix}contacts_{kind}'] for kind in entry['contacts']}
+            return Chain.from_table(chain_id, entry['algorithm'], entry['model_id'], chain_data, table,
+                                    arrays[prefix + 'column_to_residue'], arrays[prefix + 'residue_to_column'])
+
+        model._chains = LazyChains(arrays['records'],
+                                   {chain_id: tuple(entry['bounds']) for chain_id, (_, entry) in entries.items()},
+                                   make_chain)
+        if not model._lazy:
+            for chain_id in model._chains:
+                model._chains[chain_id]
+        return model
+
     @abstractmethod   
     def parse_b_factor(self) -> None:
         """
@@ -97,127 +497,160 @@ class BaseModel(ABC):
         """
         pass
 
+def _model_class(name: str) -> type:
+    """
+    BaseModel subclass with the given class name.
+    """
+    pending = list(BaseModel.__subclasses__())
+    while pending:
+        model_cls = pending.pop()
+        if model_cls.__name__ == name:
+            return model_cls
+        pending.extend(model_cls.__subclasses__())
+    raise ValueError(f"Unknown model class in snapshot: {name}")
+
+
 class PDBx(BaseModel):
-    def __init__(self, algorithm: str, pdb_file: Optional[str] = None, include_only: Optional[list] = None, algorithm_out: Optional[str] = None):
-        super().__init__(algorithm, pdb_file, include_only, algorithm_out)
+    FILE_SUFFIX = '.cif'
+
+    def __init__(self, algorithm: str, pdb_file: Optional[StructureSource] = None, include_only: Optional[list] = None, algorithm_out: Optional[str] = None,
+                 b_factor_dtype: str = 'float32', lazy: bool = False,
+                 residue_range: Optional[Tuple[int, int]] = None, plddt: bool = False):
+        super().__init__(algorithm, pdb_file, include_only, algorithm_out, b_factor_dtype, lazy, residue_range,
+                         plddt)
         if self._pdb_file is not None:
             self.parse_b_factor()
             
     def parse_b_factor(self) -> None:
-        bf_raw: Dict[Tuple[str, int, str], List[float]] = defaultdict(list)
-        in_loop = False
-        headers: List[str] = []
-        idx_map: Dict[str, int] = {}
-        wanted = {'label_asym_id',
-                  'label_seq_id',
-                  'pdbx_PDB_ins_code',
-                  'B_iso_or_equiv'}
-        with open(self._pdb_file, 'r') as fh:
-            for line in fh:
-                line = line.strip()
-                if line.startswith('loop_'):
-                    in_loop = True
-                    headers.clear()
-                    idx_map.clear()
-                    continue
-                if in_loop and line.startswith('_atom_site.'):
-                    tag = line.split('.', 1)[1]
-                    headers.append(tag)
-                    continue
-                if in_loop and headers and not line.startswith('_atom_site.') and line:
-                    if not idx_map:
-                        for i, tag in enumerate(headers):
-                            if tag in wanted:
-                                idx_map[tag] = i
-                    parts = re.split(r"\s+", line)
-                    try:
-                        chain = parts[idx_map['label_asym_id']]
-                        res_seq = int(parts[idx_map['label_seq_id']])
-                        ins_code = parts[idx_map['pdbx_PDB_ins_code']]
-                        if ins_code == '?':
-                            ins_code = ' '
-                        b_val = float(parts[idx_map['B_iso_or_equiv']])
-                    except (KeyError, ValueError, IndexError):
-                        continue
-                    bf_raw[(chain, res_seq, ins_code)].append(b_val)
-                if in_loop and headers and not line:
-                    in_loop = False
-        bf_vec = {k: np.array(v, dtype=float) for k, v in bf_raw.items()}
-        for chain in self._chains.values():
-            for res in chain.residues:
-                key = (chain.chain_id, res.index, res.insertion_code)
-                res.b_factors = bf_vec.get(key, np.array([], dtype=float))
+        if self._atoms is not None:
+            if self._plddt:
+                # The ModelCIF score table is the published pLDDT and may differ from the
+                # CA B-factors, so it wins; the atom table only serves the CA fallback
+                b_factors = read_cif_plddt(self._pdb_file, self._include_only, self._residue_range, self._atoms)
+            else:
+                b_factors = self._atoms.b_factors(self._include_only, self._residue_range)
+        else:
+            # ModelCIF scores are read without decoding any atom record
+            read = read_cif_plddt if self._plddt else read_cif_b_factors
+            b_factors = read(self._pdb_file, self._include_only, self._residue_range)
+        self._attach_b_factors(b_factors)
+
+    def read_atoms(self) -> AtomTable:
+        return read_cif_atoms(self._pdb_file)
         
         
 class PDB(BaseModel):   
-    def __init__(self, algorithm: str, pdb_file: Optional[str] = None, include_only: Optional[list] = None, algorithm_out: Optional[str] = None):
-        super().__init__(algorithm, pdb_file, include_only, algorithm_out)
+    FILE_SUFFIX = '.pdb'
+
+    def __init__(self, algorithm: str, pdb_file: Optional[StructureSource] = None, include_only: Optional[list] = None, algorithm_out: Optional[str] = None,
+                 b_factor_dtype: str = 'float32', lazy: bool = False,
+                 residue_range: Optional[Tuple[int, int]] = None, plddt: bool = False):
+        super().__init__(algorithm, pdb_file, include_only, algorithm_out, b_factor_dtype, lazy, residue_range,
+                         plddt)
         if self._pdb_file is not None:
             self.parse_b_factor()
     
     
     def parse_b_factor(self) -> None:
-        bf_raw = defaultdict(list)
-        b_pattern = re.compile(r'^\d+\.\d{2}$')
-        with open(self._pdb_file, 'r') as fh:
-            for line in fh:
-                if not line.startswith('ATOM'):
-                    continue
-                chain_id = line[21].strip()
-                seq_str = line[22:26].strip()
-                if not seq_str.isdigit():
-                    continue
-                res_seq = int(seq_str)
-                ins_code = line[26].strip() or ' '
-                b_str = line[60:66].strip()
-                if not b_pattern.match(b_str):
-                    continue
-                b_val = float(b_str)
-                bf_raw[(chain_id, res_seq, ins_code)].append(b_val)
-        bf_vec = {k: np.array(v, dtype=float) for k, v in bf_raw.items()}
-        for chain in self._chains.values():
-            for res in chain.residues:
-                key = (chain.chain_id, res.index, res.insertion_code)
-                res.b_factors = bf_vec.get(key, np.array([], dtype=float))
+        if self._atoms is not None:
+            read = self._atoms.plddt if self._plddt else self._atoms.b_factors
+            self._attach_b_factors(read(self._include_only, self._residue_range))
+        else:
+            read = read_pdb_plddt if self._plddt else read_pdb_b_factors
+            self._attach_b_factors(read(self._pdb_file, self._include_only, self._residue_range))
+
+    def read_atoms(self) -> AtomTable:
+        return read_pdb_atoms(self._pdb_file)
                 
         
 @dataclass     
 class Chain:
+    """
+    One chain of a model; residues are kept column-wise in a ResidueTable.
+
+    Attributes:
+        chain_id (str): Chain identifier.
+        algorithm (str): Name of the algorithm that assigned the secondary structure.
+        model_id (str): Identifier of the model (file name without extension).
+        dssp_data (np.ndarray): Structured array of the chain's algorithm records.
+        table (ResidueTable): Residue columns, including alignment gaps.
+        column_to_residue (np.ndarray): int32 residue (row of `dssp_data`) shown in
+            every table column, -1 for gaps.
+        residue_to_column (np.ndarray): int32 table column of every residue of
+            `dssp_data`, -1 if it is not shown.
+    """
     chain_id: str
     algorithm: str
     model_id: str
     dssp_data: np.ndarray = field(repr=False)
-    residues: np.ndarray = field(init=False)
+    table: ResidueTable = field(init=False, repr=False)
+    column_to_residue: np.ndarray = field(init=False, repr=False)
+    residue_to_column: np.ndarray = field(init=False, repr=False)
     
     def __post_init__(self):
-        self.residues = np.array([
-        Residue(index=row['residue_index'],
-                insertion_code=row['insertion_code'],
-                amino_acid=row['AA'],
-                secondary_structure=row['SS'],
-                ss_code=row['SS_code'])
-        for row in self.dssp_data], dtype=object)
+        self.table = ResidueTable.from_records(self.dssp_data)
+        self.column_to_residue = np.arange(len(self.dssp_data), dtype=np.int32)
+        self.residue_to_column = self.column_to_residue.copy()
+    
+    @classmethod
+    def from_table(cls, chain_id: str, algorithm: str, model_id: str, dssp_data: np.ndarray,
+                   table: ResidueTable, column_to_residue: np.ndarray, residue_to_column: np.ndarray) -> 'Chain':
+        """
+        Rebuild a chain from stored columns (see `BaseModel.load`) without recomputing its table.
+        """
+        chain = cls.__new__(cls)
+        chain.chain_id = chain_id
+        chain.algorithm = algorithm
+        chain.model_id = model_id
+        chain.dssp_data = dssp_data
+        chain.table = table
+        chain.column_to_residue = column_to_residue
+        chain.residue_to_column = residue_to_column
+        return chain
+
+    @property
+    def residues(self) -> ResidueView:
+        """
+        Residue proxies, created only for the rows that are accessed.
+        """
+        return ResidueView(self.table)
+    
+    @property
+    def b_factors(self) -> Optional[ChainBFactors]:
+        return self.table.b_factors
+    
+    @b_factors.setter
+    def b_factors(self, b_factors: Optional[ChainBFactors]) -> None:
+        self.table.b_factors = b_factors
                                            
     def align_seq(self, aligned_seq: str) -> None:
-        new_residues = []
-        residues_index = 0
-        for char in aligned_seq:
-            if char != '-':
-                new_residues.append(self.residues[residues_index])
-                residues_index += 1
-            else:
-                new_residues.append(Residue(index='-',
-                                            insertion_code=' ',
-                                            amino_acid='',
-                                            secondary_structure='gap',
-                                            ss_code='-'))
-        self.residues = np.array(new_residues, dtype=object)
-            
-@dataclass
-class Residue:
-	index: int
-	insertion_code: str
-	amino_acid: str
-	secondary_structure: str
-	ss_code: str
-	b_factors: np.ndarray = field(default_factory=lambda: np.array([], dtype=float))
+        """
+        Project the chain onto the columns of an aligned sequence.
+
+        Every non-gap character consumes the next residue of the chain; '-'
+        columns become gap rows of the table. The mapping between alignment
+        columns and residues is kept in `column_to_residue` and
+        `residue_to_column`.
+
+        Args:
+            aligned_seq (str): Aligned sequence of the chain, '-' for gaps.
+
+        Raises:
+            ValueError: If the number of non-gap characters differs from the
+                number of residues in the chain.
+        """
+        seq = np.frombuffer(aligned_seq.encode('ascii', 'replace'), dtype=np.uint8)
+        is_residue = seq != ord('-')
+        n_residues = np.count_nonzero(is_residue)
+        if n_residues != len(self.table):
+            raise ValueError(f"Aligned sequence of chain {self.chain_id} has {n_residues} residues, "
+                             f"but the chain has {len(self.table)}")
+        rows = np.full(len(seq), -1, dtype=np.int32)
+        rows[is_residue] = np.arange(n_residues, dtype=np.int32)
+        self.table = self.table.take(rows)
+        # Compose with a previous alignment so the maps always refer to the original
+        # residues; the appended -1 is what gap rows (-1) pick up
+        self.column_to_residue = np.append(self.column_to_residue, np.int32(-1))[rows]
+        self.residue_to_column = np.full(len(self.dssp_data), -1, dtype=np.int32)
+        is_mapped = self.column_to_residue >= 0
+        self.residue_to_column[self.column_to_residue[is_mapped]] = np.flatnonzero(is_mapped)
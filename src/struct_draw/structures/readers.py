@@ -0,0 +1,993 @@
+import mmap
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..algorithms.columns import (SPACE, iter_line_chunks, prefixed_columns, prefixed_line_bounds,
+                                           chars_to_unicode, chain_code_mask, residue_range_mask,
+                                           line_bounds, column_matrix)
+from ..compression import InMemoryFile, detect_compression, open_binary
+
+# Layout of a PDB ATOM record (0-based, end exclusive)
+PDB_ATOM_NAME_COLS = (12, 16)
+PDB_CHAIN_COL = 21
+PDB_RES_SEQ_COLS = (22, 26)
+PDB_INS_CODE_COL = 26
+PDB_B_FACTOR_COLS = (60, 66)
+PDB_CA_NAME = b' CA '
+PDB_RES_NAME_COLS = (17, 20)
+PDB_COORD_COLS = ((30, 38), (38, 46), (46, 54))
+PDB_OCCUPANCY_COLS = (54, 60)
+PDB_ELEMENT_COLS = (76, 78)
+PDB_RECORD_WIDTH = 80
+# Bytes that may appear in a fixed-width real number field
+NUMBER_BYTES = np.zeros(256, dtype=bool)
+NUMBER_BYTES[np.frombuffer(b'0123456789.+-eE ', dtype=np.uint8)] = True
+# Backbone atoms in the order of `Backbone.coordinates`
+BACKBONE_ATOMS = ('N', 'CA', 'C', 'O')
+PDB_BACKBONE_NAMES = tuple(b' ' + name.encode().ljust(3) for name in BACKBONE_ATOMS)
+
+# Per-residue aggregates precomputed for every chain
+B_FACTOR_STATS = ('mean', 'median', 'min', 'max')
+B_FACTOR_DTYPES = ('float32', 'float16', 'uint8')
+
+
+def map_file(path: str) -> Optional[mmap.mmap]:
+    """
+    Memory-map a file read-only.
+
+    The mapping is not closed explicitly: it is released once the last array
+    viewing it is garbage collected, so errors raised while parsing never
+    leave a mapping with live views behind.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        Optional[mmap.mmap]: The mapping, or None for an empty file.
+    """
+    with open(path, 'rb') as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def read_buffer(path: Union[str, InMemoryFile]) -> np.ndarray:
+    """
+    Whole (decompressed) content of a file as a flat uint8 buffer.
+
+    Uncompressed files are memory-mapped; gzip/bz2/xz files are decompressed
+    in memory without temporary files. In-memory content is viewed without a copy.
+
+    Args:
+        path (Union[str, InMemoryFile]): Path to the file, or its content.
+
+    Returns:
+        np.ndarray: 1-D uint8 buffer.
+    """
+    if isinstance(path, InMemoryFile):
+        return np.frombuffer(path.data, dtype=np.uint8)
+    if detect_compression(path) is not None:
+        with open_binary(path) as fh:
+            return np.frombuffer(fh.read(), dtype=np.uint8)
+    mm = map_file(path)
+    return np.frombuffer(mm, dtype=np.uint8) if mm is not None else np.array([], dtype=np.uint8)
+
+
+def iter_file_chunks(path: Union[str, InMemoryFile], chunk_size: int = 1 << 26) -> Iterator[np.ndarray]:
+    """
+    Stream a file as consecutive uint8 buffers made of whole lines.
+
+    Uncompressed files (and in-memory content) are memory-mapped and split
+    with `iter_line_chunks`. gzip/bz2/xz files are streamed through the
+    decompressor, so at most about two chunks of decompressed data are held
+    at a time.
+
+    Args:
+        path (Union[str, InMemoryFile]): Path to the file, or its content.
+        chunk_size (int): Approximate chunk size in bytes.
+
+    Yields:
+        np.ndarray: Buffers ending on a line break (except possibly the last one).
+    """
+    if detect_compression(path) is None:
+        yield from iter_line_chunks(read_buffer(path), chunk_size)
+        return
+    tail = b''
+    with open_binary(path) as fh:
+        while True:
+            block = fh.read(chunk_size)
+            if not block:
+                break
+            cut = block.rfind(b'\n') + 1
+            if cut == 0:
+                tail += block
+                continue
+            yield np.frombuffer(tail + block[:cut], dtype=np.uint8)
+            tail = block[cut:]
+    if tail:
+        yield np.frombuffer(tail, dtype=np.uint8)
+
+
+def iter_pdb_models(pdb_file: str, chunk_size: int = 1 << 26) -> Iterator[np.ndarray]:
+    """
+    Stream the models of a multi-model PDB file (NMR ensemble, MD trajectory) one at a time.
+
+    Every buffer holds the records preceding the first MODEL record (header,
+    CRYST1, ...) followed by one MODEL ... ENDMDL block, so it reads as a
+    single-model PDB file. Only the model being assembled is held in memory.
+    A file without MODEL records is yielded whole as a single model.
+
+    Args:
+        pdb_file (str): Path to the PDB file, optionally gzip/bz2/xz compressed.
+        chunk_size (int): Approximate size in bytes of the chunks the file is read in.
+
+    Yields:
+        np.ndarray: uint8 buffer of one model.
+    """
+    header, model = [], []
+    state = 'header'  # before the first MODEL, inside a model or between models
+    for chunk in iter_file_chunks(pdb_file, chunk_size):
+        opens, _ = prefixed_line_bounds(chunk, b'MODEL')
+        _, closes = prefixed_line_bounds(chunk, b'ENDMDL')
+        offsets = np.concatenate((opens, closes))
+        is_open = np.concatenate((np.ones(len(opens), dtype=bool), np.zeros(len(closes), dtype=bool)))
+        # An ENDMDL closes its model before a MODEL starting at the same offset opens the next one
+        order = np.lexsort((is_open, offsets))
+        position = 0
+        for offset, opens_model in zip(offsets[order].tolist(), is_open[order].tolist()):
+            if state == 'header':
+                header.append(chunk[position:offset].copy())
+            elif state == 'model':
+                model.append(chunk[position:offset])
+            position = offset
+            if opens_model:
+                if state == 'model' and model:
+                    # MODEL without a closing ENDMDL
+                    yield np.concatenate(header + model)
+                model, state = [], 'model'
+            elif state == 'model':
+                yield np.concatenate(header + model)
+                model, state = [], 'between'
+        if state == 'header':
+            header.append(chunk[position:].copy())
+        elif state == 'model':
+            model.append(chunk[position:])
+    if state == 'model':
+        yield np.concatenate(header + model)
+    elif state == 'header' and header:
+        yield np.concatenate(header)
+
+
+def _first_model_chunks(chunks: Iterator[np.ndarray]) -> Iterator[np.ndarray]:
+    """
+    Chunks of a PDB file up to the first ENDMDL record.
+    """
+    for chunk in chunks:
+        model_ends, _ = prefixed_line_bounds(chunk, b'ENDMDL')
+        if model_ends.size:
+            yield chunk[:model_ends[0]]
+            return
+        yield chunk
+
+
+def pack_residue_keys(chain_codes: np.ndarray, res_seq: np.ndarray, ins_codes: np.ndarray) -> np.ndarray:
+    """
+    Pack (chain, residue number, insertion code) triples into sortable int64 keys.
+
+    The insertion code takes the lowest 8 bits, the residue number the next 32
+    and the chain index the rest.
+
+    Args:
+        chain_codes (np.ndarray): Index of the chain ID in a chain dictionary.
+        res_seq (np.ndarray): Residue numbers.
+        ins_codes (np.ndarray): Character code of the insertion code, 0 for an empty code.
+
+    Returns:
+        np.ndarray: int64 keys, one per residue.
+    """
+    return ((chain_codes.astype(np.int64) << 40)
+            | ((res_seq.astype(np.int64) + 2**31) << 8)
+            | ins_codes.astype(np.int64))
+
+
+def unicode_codes(values: np.ndarray) -> np.ndarray:
+    """
+    Character code of the first character of every string, 0 for empty strings.
+
+    Args:
+        values (np.ndarray): Array of strings.
+
+    Returns:
+        np.ndarray: uint32 codes.
+    """
+    return np.ascontiguousarray(values, dtype='U1').view(np.uint32)
+
+
+def _stripped_bounds(field: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Positions of the first and last non-space character of every field.
+
+    Args:
+        field (np.ndarray): uint8 matrix, one field per row.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: First position, last position and a
+        mask of fields whose non-space characters form one contiguous run.
+    """
+    non_space = field != SPACE
+    width = field.shape[1]
+    first = np.argmax(non_space, axis=1)
+    last = width - 1 - np.argmax(non_space[:, ::-1], axis=1)
+    contiguous = non_space.any(axis=1) & (non_space.sum(axis=1) == last - first + 1)
+    return first, last, contiguous
+
+
+def _right_justified_digits(columns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode right-justified unsigned integer fields stored column-major.
+
+    Args:
+        columns (np.ndarray): uint8 matrix of shape (field width, number of fields).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Values, and a mask of fields made of leading
+        spaces followed by digits only. Values outside the mask are meaningless.
+    """
+    values = np.zeros(columns.shape[1], dtype=np.int64)
+    justified = np.ones(columns.shape[1], dtype=bool)
+    seen_digit = np.zeros(columns.shape[1], dtype=bool)
+    is_digit = seen_digit
+    for column in columns:
+        digits = column - np.uint8(ord('0'))
+        is_digit = digits < 10
+        justified &= is_digit | ((column == SPACE) & ~seen_digit)
+        seen_digit |= is_digit
+        values *= 10
+        values += np.where(is_digit, digits, 0)
+    return values, justified & is_digit
+
+
+def _decode_res_seq(columns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode column-major resSeq fields, accepting only fields that are digits after stripping.
+    """
+    values, valid = _right_justified_digits(columns)
+    irregular = np.flatnonzero(~valid)
+    if irregular.size:
+        values[irregular], valid[irregular] = _decode_res_seq_general(columns[:, irregular].T)
+    return values, valid
+
+
+def _decode_res_seq_general(field: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    _, _, valid = _stripped_bounds(field)
+    digits = field.astype(np.int64) - ord('0')
+    is_digit = (digits >= 0) & (digits <= 9)
+    valid &= np.all(is_digit | (field == SPACE), axis=1)
+    values = np.zeros(len(field), dtype=np.int64)
+    for j in range(field.shape[1]):
+        values = np.where(is_digit[:, j], values * 10 + digits[:, j], values)
+    return values, valid
+
+
+def _decode_b_factor(columns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode column-major tempFactor fields, accepting only the `\\d+\\.\\d{2}` form after stripping.
+
+    The usual right-justified `%6.2f` layout is decoded directly; any other
+    layout goes through the general path.
+    """
+    # Exact value in hundredths; the division is correctly rounded like float()
+    whole, whole_ok = _right_justified_digits(columns[:-3])
+    fraction, fraction_ok = _right_justified_digits(columns[-2:])
+    valid = whole_ok & fraction_ok & (columns[-3] == ord('.')) & (columns[-2] != SPACE)
+    hundredths = whole * 100 + fraction
+    irregular = np.flatnonzero(~valid)
+    if irregular.size:
+        hundredths[irregular], valid[irregular] = _decode_b_factor_general(columns[:, irregular].T)
+    return hundredths / 100, valid
+
+
+def _decode_b_factor_general(field: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    first, last, valid = _stripped_bounds(field)
+    rows = np.arange(len(field))
+    digits = field.astype(np.int64) - ord('0')
+    is_digit = (digits >= 0) & (digits <= 9)
+    point = np.maximum(last - 2, 0)
+    valid &= (last - first >= 3) & (field[rows, point] == ord('.'))
+    positions = np.arange(field.shape[1])
+    in_field = (positions >= first[:, None]) & (positions <= last[:, None])
+    valid &= np.all(is_digit | ~in_field | (positions == point[:, None]), axis=1)
+    hundredths = np.zeros(len(field), dtype=np.int64)
+    for j in range(field.shape[1]):
+        hundredths = np.where(is_digit[:, j] & in_field[:, j], hundredths * 10 + digits[:, j], hundredths)
+    return hundredths, valid
+
+
+def lookup_residue_keys(chain_ids: np.ndarray, keys: np.ndarray, chain_id: str, residue_index: np.ndarray,
+                        insertion_codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find residues of one chain in a sorted residue key table.
+
+    Args:
+        chain_ids (np.ndarray): Sorted unique chain IDs the keys refer to.
+        keys (np.ndarray): Sorted unique residue keys (see `pack_residue_keys`).
+        chain_id (str): Chain ID of the residues.
+        residue_index (np.ndarray): Residue numbers.
+        insertion_codes (np.ndarray): Character codes of the insertion codes.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Position of every residue in `keys` and
+        a mask of residues that were actually found.
+    """
+    chain_pos = np.searchsorted(chain_ids, chain_id)
+    if (len(keys) == 0 or chain_pos == len(chain_ids)
+            or chain_ids[chain_pos] != chain_id):
+        return np.zeros(len(residue_index), dtype=np.int64), np.zeros(len(residue_index), dtype=bool)
+    residue_keys = pack_residue_keys(np.full(len(residue_index), chain_pos), residue_index, insertion_codes)
+    positions = np.minimum(np.searchsorted(keys, residue_keys), len(keys) - 1)
+    return positions, keys[positions] == residue_keys
+
+
+@dataclass
+class ResidueBFactors:
+    """
+    B-factors grouped by residue in a CSR layout.
+
+    Attributes:
+        chain_ids (np.ndarray): Sorted unique chain IDs; residue keys store an index into it.
+        keys (np.ndarray): Sorted unique residue keys (see `pack_residue_keys`).
+        offsets (np.ndarray): len(keys) + 1 offsets into `values`.
+        values (np.ndarray): B-factors of all atoms, grouped by residue in file order.
+    """
+    chain_ids: np.ndarray
+    keys: np.ndarray
+    offsets: np.ndarray
+    values: np.ndarray
+
+    def lookup(self, chain_id: str, residue_index: np.ndarray,
+               insertion_codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find residues of one chain in the key table.
+
+        Args:
+            chain_id (str): Chain ID of the residues.
+            residue_index (np.ndarray): Residue numbers.
+            insertion_codes (np.ndarray): Character codes of the insertion codes.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Position of every residue in `keys` and
+            a mask of residues that were actually found.
+        """
+        return lookup_residue_keys(self.chain_ids, self.keys, chain_id, residue_index, insertion_codes)
+
+    def get(self, position: int) -> np.ndarray:
+        return self.values[self.offsets[position]:self.offsets[position + 1]]
+
+
+@dataclass
+class ResidueCoordinates(ResidueBFactors):
+    """
+    Atom coordinates grouped by residue, in the CSR layout of ResidueBFactors.
+
+    Attributes:
+        values (np.ndarray): float32 (atoms, 3) positions, grouped by residue in file order.
+    """
+
+    @property
+    def atom_residue(self) -> np.ndarray:
+        """
+        Position in `keys` of the residue of every atom.
+        """
+        return np.repeat(np.arange(len(self.keys)), np.diff(self.offsets))
+
+
+@dataclass
+class ChainBFactors:
+    """
+    B-factors of one chain in a CSR layout, with per-residue aggregates.
+
+    Row `i` holds the atoms of the i-th residue of the chain. Values may be
+    quantized; `get` always returns them decoded as `values * scale + shift`.
+
+    Attributes:
+        values (np.ndarray): B-factors of all atoms of the chain (float32, float16 or uint8).
+        offsets (np.ndarray): Number of residues + 1 offsets into `values`.
+        stats (Dict[str, np.ndarray]): Mean, median, min and max of every residue,
+            computed from the unquantized values; 0.0 for residues without atoms.
+        scale (float): Quantization step of `values`.
+        shift (float): Value encoded by 0.
+    """
+    values: np.ndarray
+    offsets: np.ndarray
+    stats: Dict[str, np.ndarray]
+    scale: float = 1.0
+    shift: float = 0.0
+
+    def get(self, row: int) -> np.ndarray:
+        values = self.values[self.offsets[row]:self.offsets[row + 1]]
+        if self.values.dtype == np.uint8:
+            return values * np.float32(self.scale) + np.float32(self.shift)
+        return values
+
+    def stat(self, name: str, row: int) -> float:
+        return float(self.stats[name][row])
+
+
+def _segment_stats(values: np.ndarray, offsets: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Mean, median, min and max of every CSR row with reduceat, 0.0 for empty rows.
+    """
+    counts = np.diff(offsets)
+    filled = np.flatnonzero(counts)
+    stats = {name: np.zeros(len(counts), dtype=float) for name in B_FACTOR_STATS}
+    if filled.size == 0:
+        return stats
+    starts, sizes = offsets[filled], counts[filled]
+    stats['mean'][filled] = np.add.reduceat(values, starts) / sizes
+    stats['min'][filled] = np.minimum.reduceat(values, starts)
+    stats['max'][filled] = np.maximum.reduceat(values, starts)
+    # Sort inside every row at once: the row number is the primary key
+    row_of_value = np.repeat(np.arange(len(counts)), counts)
+    in_order = values[np.lexsort((values, row_of_value))]
+    stats['median'][filled] = (in_order[starts + (sizes - 1) // 2] + in_order[starts + sizes // 2]) / 2
+    return stats
+
+
+def chain_b_factors(b_factors: 'ResidueBFactors', positions: np.ndarray, found: np.ndarray,
+                    dtype: str = 'float32') -> ChainBFactors:
+    """
+    Gather the B-factors of one chain's residues into a compact CSR block.
+
+    Args:
+        b_factors (ResidueBFactors): B-factors of the whole structure.
+        positions (np.ndarray): Position of every residue of the chain in `b_factors.keys`.
+        found (np.ndarray): Mask of residues present in `b_factors`.
+        dtype (str): Storage type of the values: 'float32', 'float16' or 'uint8'.
+            'uint8' quantizes linearly over the chain's value range, which suits
+            pLDDT-scale data.
+
+    Returns:
+        ChainBFactors: B-factors and aggregates of the chain, one row per residue.
+
+    Raises:
+        ValueError: If dtype is not supported.
+    """
+    if dtype not in B_FACTOR_DTYPES:
+        raise ValueError(f"Unsupported B-factor dtype: {dtype}. Supported: {', '.join(B_FACTOR_DTYPES)}")
+    # Positions of residues that were not found may point past the last residue
+    ends = b_factors.offsets[np.minimum(positions + 1, len(b_factors.offsets) - 1)]
+    starts = np.where(found, b_factors.offsets[np.minimum(positions, len(b_factors.offsets) - 1)], 0)
+    counts = np.where(found, ends - starts, 0)
+    offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    source = np.repeat(starts - offsets[:-1], counts) + np.arange(offsets[-1])
+    values = b_factors.values[source]
+    stats = _segment_stats(values, offsets)
+    if dtype != 'uint8':
+        return ChainBFactors(values.astype(dtype), offsets, stats)
+    shift = float(values.min()) if values.size else 0.0
+    scale = (float(values.max()) - shift) / 255 if values.size else 0.0
+    scale = scale or 1.0
+    codes = np.rint((values - shift) / scale).astype(np.uint8)
+    return ChainBFactors(codes, offsets, stats, scale, shift)
+
+
+def group_by_residue(chain_ids: np.ndarray, chain_index: np.ndarray, res_seq: np.ndarray,
+                     ins_codes: np.ndarray, values: np.ndarray) -> ResidueBFactors:
+    """
+    Group per-atom values by residue with one stable sort.
+
+    Args:
+        chain_ids (np.ndarray): Sorted unique chain IDs.
+        chain_index (np.ndarray): Index into `chain_ids` of every atom.
+        res_seq (np.ndarray): Residue number of every atom.
+        ins_codes (np.ndarray): Insertion code character of every atom.
+        values (np.ndarray): Per-atom values.
+
+    Returns:
+        ResidueBFactors: Values grouped by residue, file order kept inside every residue.
+    """
+    keys = pack_residue_keys(chain_index, res_seq, ins_codes)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    unique_keys, first_index = np.unique(sorted_keys, return_index=True)
+    offsets = np.append(first_index, len(sorted_keys)).astype(np.int64)
+    return ResidueBFactors(chain_ids, unique_keys, offsets, values[order])
+
+
+def first_per_residue(b_factors: ResidueBFactors) -> ResidueBFactors:
+    """
+    Keep only the first value of every residue (e.g. of alternate CA locations).
+    """
+    offsets = np.arange(len(b_factors.keys) + 1, dtype=np.int64)
+    return ResidueBFactors(b_factors.chain_ids, b_factors.keys, offsets, b_factors.values[b_factors.offsets[:-1]])
+
+
+def _pdb_atom_columns(chunks: Iterator[np.ndarray], include_only: Optional[Sequence[str]] = None,
+                      residue_range: Optional[Tuple[int, int]] = None,
+                      atom_name: Optional[bytes] = None) -> Tuple[np.ndarray, ...]:
+    chains, res_seqs, ins_codes, b_factors = [], [], [], []
+    res_seq_cols = list(range(*PDB_RES_SEQ_COLS))
+    b_factor_cols = list(range(*PDB_B_FACTOR_COLS))
+    name_cols = list(range(*PDB_ATOM_NAME_COLS)) if atom_name is not None else []
+    wanted = [PDB_CHAIN_COL, PDB_INS_CODE_COL] + res_seq_cols + b_factor_cols + name_cols
+    for chunk in chunks:
+        columns = prefixed_columns(chunk, b'ATOM', wanted)
+        if name_cols:
+            is_named = np.all(columns[-len(name_cols):].T == np.frombuffer(atom_name, dtype=np.uint8), axis=1)
+            columns = columns[:-len(name_cols), is_named]
+        if include_only is not None:
+            columns = columns[:, chain_code_mask(columns[0], include_only)]
+        res_seq, seq_ok = _decode_res_seq(columns[2:2 + len(res_seq_cols)])
+        if residue_range is not None:
+            # Drop records outside the range before decoding their B-factors
+            seq_ok &= residue_range_mask(res_seq, residue_range)
+            columns, res_seq, seq_ok = columns[:, seq_ok], res_seq[seq_ok], seq_ok[seq_ok]
+        b_values, b_ok = _decode_b_factor(columns[2 + len(res_seq_cols):])
+        ok = seq_ok & b_ok
+        chains.append(columns[0, ok])
+        ins_codes.append(columns[1, ok])
+        res_seqs.append(res_seq[ok])
+        b_factors.append(b_values[ok])
+    if not chains:
+        return (np.array([], dtype=np.uint8), np.array([], dtype=np.int64),
+                np.array([], dtype=np.uint8), np.array([], dtype=float))
+    return (np.concatenate(chains), np.concatenate(res_seqs),
+            np.concatenate(ins_codes), np.concatenate(b_factors))
+
+
+def read_pdb_b_factors(pdb_file: Union[str, InMemoryFile], include_only: Optional[Sequence[str]] = None,
+                       residue_range: Optional[Tuple[int, int]] = None) -> ResidueBFactors:
+    """
+    Read B-factors of the ATOM records of a PDB file, grouped by residue.
+
+    The file is memory-mapped (or streamed through the decompressor for
+    gzip/bz2/xz files) and only the chain, resSeq, iCode and tempFactor
+    columns of ATOM records are decoded. Records with a non-numeric resSeq or a
+    tempFactor not in the `\\d+\\.\\d{2}` form are skipped. A blank chain
+    column gives the chain ID ''. With `include_only`, records of other chains
+    are dropped before any field is decoded; with `residue_range`, records
+    outside it are dropped before their tempFactor is decoded. Only the first
+    model of a multi-model file is read (see `iter_pdb_models` for the others).
+
+    Args:
+        pdb_file (Union[str, InMemoryFile]): Path to the PDB file, or its content.
+        include_only (Optional[Sequence[str]]): Chain IDs to read; None reads all.
+        residue_range (Optional[Tuple[int, int]]): First and last resSeq to read
+            (inclusive); None reads all.
+
+    Returns:
+        ResidueBFactors: B-factors grouped by residue.
+    """
+    return _read_pdb_residue_b_factors(pdb_file, include_only, residue_range)
+
+
+def read_pdb_plddt(pdb_file: Union[str, InMemoryFile], include_only: Optional[Sequence[str]] = None,
+                   residue_range: Optional[Tuple[int, int]] = None) -> ResidueBFactors:
+    """
+    Read one confidence value (pLDDT) per residue of a predicted model: the
+    tempFactor of its first CA atom. Other atoms are dropped before any
+    field is decoded.
+
+    Args:
+        pdb_file (Union[str, InMemoryFile]): Path to the PDB file, or its content.
+        include_only (Optional[Sequence[str]]): Chain IDs to read; None reads all.
+        residue_range (Optional[Tuple[int, int]]): First and last resSeq to read
+            (inclusive); None reads all.
+
+    Returns:
+        ResidueBFactors: One value per residue.
+    """
+    return first_per_residue(_read_pdb_residue_b_factors(pdb_file, include_only, residue_range, PDB_CA_NAME))
+
+
+def _read_pdb_residue_b_factors(pdb_file: Union[str, InMemoryFile], include_only: Optional[Sequence[str]],
+                                residue_range: Optional[Tuple[int, int]],
+                                atom_name: Optional[bytes] = None) -> ResidueBFactors:
+    chunks = _first_model_chunks(iter_file_chunks(pdb_file))
+    chain_codes, res_seq, ins_codes, b_factors = _pdb_atom_columns(chunks, include_only, residue_range, atom_name)
+    chain_codes, chain_index = np.unique(chain_codes, return_inverse=True)
+    chain_ids = chars_to_unicode(np.where(chain_codes == SPACE, 0, chain_codes))
+    return group_by_residue(chain_ids, chain_index, res_seq, ins_codes, b_factors)
+
+
+@dataclass
+class Backbone:
+    """
+    Backbone atoms of the residues of a structure, in file order.
+
+    Only residues with all of N, CA, C and O are kept; of alternate
+    locations the first one is used.
+
+    Attributes:
+        chain_ids (np.ndarray): Sorted unique chain IDs ('U' array).
+        chain_code (np.ndarray): Index into `chain_ids` of every residue.
+        residue_index (np.ndarray): Residue numbers.
+        insertion_code (np.ndarray): uint8 insertion code characters (' ' when blank).
+        residue_name (np.ndarray): Residue names ('S' array, e.g. b'ALA').
+        coordinates (np.ndarray): float (residues, 4, 3) positions of BACKBONE_ATOMS.
+    """
+    chain_ids: np.ndarray
+    chain_code: np.ndarray
+    residue_index: np.ndarray
+    insertion_code: np.ndarray
+    residue_name: np.ndarray
+    coordinates: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.residue_index)
+
+
+def group_backbone(chains: np.ndarray, res_seq: np.ndarray, ins_codes: np.ndarray, res_names: np.ndarray,
+                   atom_slot: np.ndarray, coordinates: np.ndarray) -> Backbone:
+    """
+    Collect per-atom records into residues with their backbone coordinates.
+
+    A residue is a run of consecutive records sharing chain, residue number
+    and insertion code.
+
+    Args:
+        chains (np.ndarray): Chain ID of every atom ('S' array).
+        res_seq (np.ndarray): Residue number of every atom.
+        ins_codes (np.ndarray): uint8 insertion code of every atom.
+        res_names (np.ndarray): Residue name of every atom ('S' array).
+        atom_slot (np.ndarray): Position of the atom in BACKBONE_ATOMS, -1 for other atoms.
+        coordinates (np.ndarray): float (atoms, 3) positions.
+
+    Returns:
+        Backbone: Residues with a complete backbone.
+    """
+    keep = atom_slot >= 0
+    chains, res_seq, ins_codes = chains[keep], res_seq[keep], ins_codes[keep]
+    res_names, atom_slot, coordinates = res_names[keep], atom_slot[keep], coordinates[keep]
+    starts = np.ones(len(res_seq), dtype=bool)
+    starts[1:] = (chains[1:] != chains[:-1]) | (res_seq[1:] != res_seq[:-1]) | (ins_codes[1:] != ins_codes[:-1])
+    residue = np.cumsum(starts) - 1
+    n_residues = int(starts.sum())
+    # First record of every (residue, atom) pair wins over alternate locations
+    slots, first = np.unique(residue * len(BACKBONE_ATOMS) + atom_slot, return_index=True)
+    positions = np.full((n_residues * len(BACKBONE_ATOMS), 3), np.nan)
+    positions[slots] = coordinates[first]
+    positions = positions.reshape(n_residues, len(BACKBONE_ATOMS), 3)
+    complete = ~np.isnan(positions).any(axis=(1, 2))
+    heads = np.flatnonzero(starts)[complete]
+    chain_ids, chain_code = np.unique(chains[heads], return_inverse=True)
+    return Backbone(chain_ids.astype('U'), chain_code.ravel().astype(np.uint16), res_seq[heads],
+                    ins_codes[heads], res_names[heads], positions[complete])
+
+
+def _decode_coordinates(field: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode fixed-width real number fields given as a uint8 matrix, NaN where invalid.
+
+    Blank fields (e.g. a missing occupancy on a short line) are invalid
+    without falling back to the per-field path.
+    """
+    strings = np.ascontiguousarray(field).view(f'S{field.shape[1]}').ravel()
+    # Fields with characters no number has are invalid without a try
+    numeric = NUMBER_BYTES[field].all(axis=1)
+    filled = np.any(field != SPACE, axis=1) & numeric
+    values = np.full(len(strings), np.nan)
+    try:
+        values[filled] = strings[filled].astype(float)
+    except ValueError:
+        for i in np.flatnonzero(filled).tolist():
+            try:
+                values[i] = float(strings[i])
+            except ValueError:
+                pass
+    return values, ~np.isnan(values)
+
+
+def _strip_fields(field: np.ndarray) -> np.ndarray:
+    """
+    Fixed-width fields given as a uint8 matrix as a byte string array, without
+    surrounding spaces (e.g. b' CA ' -> b'CA').
+    """
+    width = field.shape[1]
+    first, last, _ = _stripped_bounds(field)
+    length = np.where(np.any(field != SPACE, axis=1), last - first + 1, 0)
+    positions = np.minimum(first[:, None] + np.arange(width), width - 1)
+    stripped = np.where(np.arange(width) < length[:, None],
+                        field[np.arange(len(field))[:, None], positions], 0).astype(np.uint8)
+    return np.ascontiguousarray(stripped).view(f'S{width}').ravel()
+
+
+# Per-atom columns an AtomTable decodes on demand; see `AtomTable.values`
+ATOM_FEATURE_COLUMNS = ('atom_name', 'residue_name', 'element', 'coordinates', 'b_factor', 'occupancy')
+# Decodes one feature column for the given rows (an index array, a mask or a slice)
+ColumnDecoder = Callable[[Union[np.ndarray, slice]], np.ndarray]
+
+
+class _FeatureColumn:
+    """
+    Read-only AtomTable attribute for a feature column, decoded in full on first access.
+    """
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, table: Optional['AtomTable'], owner: type = None) -> np.ndarray:
+        if table is None:
+            return self
+        return table.column(self.name)
+
+
+@dataclass
+class AtomTable:
+    """
+    Atom records of a structure (first model only) stored column-wise.
+
+    Read once per file; B-factors, pLDDT, coordinates, the backbone and any
+    other per-residue feature are derived from these columns without going
+    back to the file. Records with a non-numeric residue number are left
+    out; unreadable numbers are NaN.
+
+    Only the residue keys are decoded when the table is read. The feature
+    columns (`ATOM_FEATURE_COLUMNS`) are decoded from the kept record bytes on
+    demand: per-residue features decode just the rows that pass the chain and
+    residue filters, and attribute access decodes (and keeps) a whole column.
+
+    Attributes:
+        chain_ids (np.ndarray): Sorted unique chain IDs ('U' array).
+        chain_index (np.ndarray): Index into `chain_ids` of every atom.
+        residue_index (np.ndarray): int64 residue numbers.
+        insertion_code (np.ndarray): uint8 insertion code characters (' ' when blank).
+        is_hetatm (np.ndarray): Mask of HETATM records.
+        decoders (Dict[str, ColumnDecoder]): Decoder of every feature column.
+        hetatm_features (bool): Whether HETATM records count for per-residue features
+            (B-factors, pLDDT, coordinates); the PDB readers have always used ATOM
+            records only. The backbone always includes them, for modified residues.
+        atom_name (np.ndarray): Atom names without padding ('S' array, e.g. b'CA').
+        residue_name (np.ndarray): Residue names ('S' array, e.g. b'ALA').
+        element (np.ndarray): Element symbols ('S' array, b'' when absent).
+        coordinates (np.ndarray): float32 (atoms, 3) positions.
+        b_factor (np.ndarray): float B-factors.
+        occupancy (np.ndarray): float32 occupancies.
+    """
+    chain_ids: np.ndarray
+    chain_index: np.ndarray
+    residue_index: np.ndarray
+    insertion_code: np.ndarray
+    is_hetatm: np.ndarray
+    decoders: Dict[str, ColumnDecoder]
+    hetatm_features: bool = True
+
+    atom_name = _FeatureColumn()
+    residue_name = _FeatureColumn()
+    element = _FeatureColumn()
+    coordinates = _FeatureColumn()
+    b_factor = _FeatureColumn()
+    occupancy = _FeatureColumn()
+
+    def __post_init__(self):
+        self._decoded: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.residue_index)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Feature column of all atoms, decoded on first access and kept.
+
+        Args:
+            name (str): One of `ATOM_FEATURE_COLUMNS`.
+
+        Returns:
+            np.ndarray: One value (or row) per atom.
+        """
+        if name not in self._decoded:
+            self._decoded[name] = self.decoders[name](slice(None))
+        return self._decoded[name]
+
+    def values(self, name: str, rows: np.ndarray) -> np.ndarray:
+        """
+        Feature column of some atoms; only those rows are decoded unless the
+        whole column already is.
+
+        Args:
+            name (str): One of `ATOM_FEATURE_COLUMNS`.
+            rows (np.ndarray): Indices of the atoms.
+
+        Returns:
+            np.ndarray: One value (or row) per index.
+        """
+        if name in self._decoded:
+            return self._decoded[name][rows]
+        return self.decoders[name](rows)
+
+    def select(self, include_only: Optional[Sequence[str]] = None,
+               residue_range: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """
+        Mask of the atoms that count for per-residue features.
+
+        Args:
+            include_only (Optional[Sequence[str]]): Chain IDs to keep; None keeps all.
+            residue_range (Optional[Tuple[int, int]]): First and last residue number
+                to keep (inclusive); None keeps all.
+
+        Returns:
+            np.ndarray: bool mask, one entry per atom.
+        """
+        mask = np.ones(len(self), dtype=bool) if self.hetatm_features else ~self.is_hetatm
+        if include_only is not None:
+            mask &= np.isin(self.chain_ids, list(include_only))[self.chain_index]
+        if residue_range is not None:
+            mask &= residue_range_mask(self.residue_index, residue_range)
+        return mask
+
+    def group(self, values: np.ndarray, mask: np.ndarray) -> ResidueBFactors:
+        """
+        Group per-atom values of the atoms in `mask` by residue.
+
+        Args:
+            values (np.ndarray): One value (or row) per atom.
+            mask (np.ndarray): Atoms to keep.
+
+        Returns:
+            ResidueBFactors: Values grouped by residue; only chains with kept atoms are listed.
+        """
+        return self._group_rows(np.flatnonzero(mask), values[mask])
+
+    def _group_rows(self, rows: np.ndarray, values: np.ndarray) -> ResidueBFactors:
+        chains, chain_index = np.unique(self.chain_index[rows], return_inverse=True)
+        return group_by_residue(self.chain_ids[chains], chain_index.ravel(), self.residue_index[rows],
+                                self.insertion_code[rows], values)
+
+    def _group_feature(self, name: str, rows: np.ndarray) -> ResidueBFactors:
+        """
+        Feature column of the given atoms grouped by residue; unreadable values are skipped.
+        """
+        values = self.values(name, rows)
+        ok = ~np.isnan(values) if values.ndim == 1 else ~np.isnan(values).any(axis=1)
+        return self._group_rows(rows[ok], values[ok])
+
+    def b_factors(self, include_only: Optional[Sequence[str]] = None,
+                  residue_range: Optional[Tuple[int, int]] = None) -> ResidueBFactors:
+        """
+        B-factors grouped by residue; atoms without a readable B-factor are skipped.
+        """
+        return self._group_feature('b_factor', np.flatnonzero(self.select(include_only, residue_range)))
+
+    def plddt(self, include_only: Optional[Sequence[str]] = None,
+              residue_range: Optional[Tuple[int, int]] = None) -> ResidueBFactors:
+        """
+        One confidence value (pLDDT) per residue of a predicted model: the B-factor of its first CA atom.
+        """
+        rows = np.flatnonzero(self.select(include_only, residue_range))
+        rows = rows[self.values('atom_name', rows) == b'CA']
+        return first_per_residue(self._group_feature('b_factor', rows))
+
+    def occupancies(self, include_only: Optional[Sequence[str]] = None,
+                    residue_range: Optional[Tuple[int, int]] = None) -> ResidueBFactors:
+        """
+        Occupancies grouped by residue; atoms without a readable occupancy are skipped.
+        """
+        return self._group_feature('occupancy', np.flatnonzero(self.select(include_only, residue_range)))
+
+    def residue_coordinates(self) -> ResidueCoordinates:
+        """
+        Positions grouped by residue; atoms with an unreadable coordinate are skipped.
+        """
+        grouped = self._group_feature('coordinates', np.flatnonzero(self.select()))
+        return ResidueCoordinates(grouped.chain_ids, grouped.keys, grouped.offsets, grouped.values)
+
+    def backbone(self) -> Backbone:
+        """
+        Residues with a complete N, CA, C and O backbone, in file order; HETATM records included.
+        """
+        names = self.column('atom_name')
+        atom_slot = np.full(len(self), -1)
+        for slot, name in enumerate(BACKBONE_ATOMS):
+            atom_slot[names == name.encode()] = slot
+        # Only backbone atoms have their coordinates and residue names decoded
+        rows = np.flatnonzero(atom_slot >= 0)
+        coordinates = self.values('coordinates', rows)
+        ok = ~np.isnan(coordinates).any(axis=1)
+        rows = rows[ok]
+        return group_backbone(self.chain_ids[self.chain_index[rows]], self.residue_index[rows],
+                              self.insertion_code[rows], self.values('residue_name', rows), atom_slot[rows],
+                              coordinates[ok].astype(float))
+
+
+def _pdb_decoders(records: np.ndarray) -> Dict[str, ColumnDecoder]:
+    """
+    Decoders of the AtomTable feature columns from the fixed-width bytes of PDB records.
+    """
+    def text(columns: Tuple[int, int]) -> ColumnDecoder:
+        return lambda rows: _strip_fields(records[rows, slice(*columns)])
+
+    def coordinates(rows: Union[np.ndarray, slice]) -> np.ndarray:
+        selected = records[rows]
+        values = np.empty((len(selected), 3), dtype=np.float32)
+        for axis, columns in enumerate(PDB_COORD_COLS):
+            values[:, axis], _ = _decode_coordinates(selected[:, slice(*columns)])
+        return values
+
+    def b_factor(rows: Union[np.ndarray, slice]) -> np.ndarray:
+        values, ok = _decode_b_factor(np.ascontiguousarray(records[rows, slice(*PDB_B_FACTOR_COLS)].T))
+        return np.where(ok, values, np.nan)
+
+    def occupancy(rows: Union[np.ndarray, slice]) -> np.ndarray:
+        return _decode_coordinates(records[rows, slice(*PDB_OCCUPANCY_COLS)])[0].astype(np.float32)
+
+    return {'atom_name': text(PDB_ATOM_NAME_COLS), 'residue_name': text(PDB_RES_NAME_COLS),
+            'element': text(PDB_ELEMENT_COLS), 'coordinates': coordinates, 'b_factor': b_factor,
+            'occupancy': occupancy}
+
+
+def read_pdb_atoms(pdb_file: Union[str, InMemoryFile]) -> AtomTable:
+    """
+    Read the ATOM and HETATM records of a PDB file into an AtomTable in one pass.
+
+    The file is memory-mapped (or streamed through the decompressor for
+    gzip/bz2/xz files) and scanned chunk by chunk; only the residue keys are
+    decoded, the bytes of the kept records are decoded on demand (see
+    `AtomTable`). Records with a non-numeric resSeq are skipped; a
+    tempFactor not in the `\\d+\\.\\d{2}` form reads as NaN. A blank chain
+    column gives the chain ID ''. Only the first model of a multi-model file
+    is read (see `iter_pdb_models` for the others). The B-factors alone are
+    read faster with `read_pdb_b_factors`.
+
+    Args:
+        pdb_file (Union[str, InMemoryFile]): Path to the PDB file, or its content.
+
+    Returns:
+        AtomTable: Atom columns; HETATM records do not count for per-residue features.
+    """
+    records, chains, res_seqs, is_hetatms = [], [], [], []
+    for chunk in _first_model_chunks(iter_file_chunks(pdb_file)):
+        starts, ends = line_bounds(chunk)
+        heads = column_matrix(chunk, starts, ends, 0, 6)
+        is_atom = np.all(heads[:, :4] == np.frombuffer(b'ATOM', dtype=np.uint8), axis=1)
+        is_hetatm = np.all(heads == np.frombuffer(b'HETATM', dtype=np.uint8), axis=1)
+        selected = is_atom | is_hetatm
+        chunk_records = column_matrix(chunk, starts[selected], ends[selected], 0, PDB_RECORD_WIDTH)
+        res_seq, ok = _decode_res_seq(np.ascontiguousarray(chunk_records[:, slice(*PDB_RES_SEQ_COLS)].T))
+        records.append(chunk_records[ok])
+        res_seqs.append(res_seq[ok])
+        is_hetatms.append(is_hetatm[selected][ok])
+    if records:
+        records = np.concatenate(records)
+        res_seq, is_hetatm = np.concatenate(res_seqs), np.concatenate(is_hetatms)
+    else:
+        records = np.zeros((0, PDB_RECORD_WIDTH), dtype=np.uint8)
+        res_seq, is_hetatm = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+    chain_codes, chain_index = np.unique(records[:, PDB_CHAIN_COL], return_inverse=True)
+    chain_ids = chars_to_unicode(np.where(chain_codes == SPACE, 0, chain_codes))
+    return AtomTable(chain_ids, chain_index.ravel(), res_seq, records[:, PDB_INS_CODE_COL].copy(), is_hetatm,
+                     _pdb_decoders(records), hetatm_features=False)
+
+
+def read_pdb_backbone(pdb_file: Union[str, InMemoryFile]) -> Backbone:
+    """
+    Read the backbone coordinates of the ATOM and HETATM records of a PDB file.
+
+    HETATM records count so that modified residues (e.g. MSE) keep their
+    place in the chain. Only the first model of a multi-model file is read.
+
+    Args:
+        pdb_file (Union[str, InMemoryFile]): Path to the PDB file, or its content.
+
+    Returns:
+        Backbone: Residues with a complete backbone, in file order.
+    """
+    return read_pdb_atoms(pdb_file).backbone()
+
+
+def read_pdb_coordinates(pdb_file: Union[str, InMemoryFile]) -> ResidueCoordinates:
+    """
+    Read the atom coordinates of the ATOM records of a PDB file, grouped by residue.
+
+    Residues are keyed like in `read_pdb_b_factors`; records with a
+    non-numeric resSeq or coordinate are skipped. Only the first model of a
+    multi-model file is read.
+
+    Args:
+        pdb_file (Union[str, InMemoryFile]): Path to the PDB file, or its content.
+
+    Returns:
+        ResidueCoordinates: float32 positions grouped by residue.
+    """
+    return read_pdb_atoms(pdb_file).residue_coordinates()
@@ -0,0 +1,237 @@
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterator, Optional, Union
+
+import numpy as np
+
+from ..algorithms.columns import chars_to_unicode
+from .readers import ChainBFactors, unicode_codes
+
+GAP_LABEL = 'gap'
+GAP_SS_CODE = ord('-')
+
+EMPTY_B_FACTORS = np.array([], dtype=np.float32)
+EMPTY_B_FACTORS.flags.writeable = False
+
+
+@dataclass
+class ResidueTable:
+    """
+    Residues of a chain stored column-wise.
+
+    Gap rows (inserted by sequence alignment) have `data_row` -1, AA code 0
+    and the 'gap' SS label.
+
+    Attributes:
+        residue_index (np.ndarray): int32 residue numbers.
+        insertion_code (np.ndarray): uint8 insertion code characters (0 for none).
+        amino_acid (np.ndarray): uint8 one-letter amino acid codes (0 for gaps).
+        ss (np.ndarray): uint8 index of the SS label in `ss_labels`.
+        ss_code (np.ndarray): uint8 algorithm SS code characters.
+        data_row (np.ndarray): int32 row of the residue in the chain's algorithm data
+            and B-factor block, -1 for gaps.
+        ss_labels (np.ndarray): SS label dictionary; always contains 'gap'.
+        b_factors (Optional[ChainBFactors]): B-factors of the chain, rows matching `data_row`.
+        contacts (Optional[Dict[str, np.ndarray]]): Per-residue contact counts of the
+            chain ('total', 'interface'), rows matching `data_row`; see `BaseModel.compute_contacts`.
+    """
+    residue_index: np.ndarray
+    insertion_code: np.ndarray
+    amino_acid: np.ndarray
+    ss: np.ndarray
+    ss_code: np.ndarray
+    data_row: np.ndarray
+    ss_labels: np.ndarray
+    b_factors: Optional[ChainBFactors] = field(default=None, repr=False)
+    contacts: Optional[Dict[str, np.ndarray]] = field(default=None, repr=False)
+
+    @classmethod
+    def from_records(cls, dssp_data: np.ndarray) -> 'ResidueTable':
+        """
+        Build a table from the structured array returned by `process_data`.
+
+        Args:
+            dssp_data (np.ndarray): Structured array with residue_index, insertion_code,
+                AA, SS and SS_code fields.
+
+        Returns:
+            ResidueTable: One row per record, in the same order.
+        """
+        ss_labels, ss = np.unique(np.append(dssp_data['SS'], GAP_LABEL), return_inverse=True)
+        return cls(residue_index=dssp_data['residue_index'].astype(np.int32),
+                   insertion_code=unicode_codes(dssp_data['insertion_code']).astype(np.uint8),
+                   amino_acid=unicode_codes(dssp_data['AA']).astype(np.uint8),
+                   ss=ss[:-1].astype(np.uint8),
+                   ss_code=unicode_codes(dssp_data['SS_code']).astype(np.uint8),
+                   data_row=np.arange(len(dssp_data), dtype=np.int32),
+                   ss_labels=ss_labels)
+
+    def __len__(self) -> int:
+        return len(self.residue_index)
+
+    @property
+    def is_gap(self) -> np.ndarray:
+        return self.data_row < 0
+
+    @property
+    def secondary_structure(self) -> np.ndarray:
+        """
+        SS label of every row.
+        """
+        return self.ss_labels[self.ss]
+
+    @property
+    def amino_acids(self) -> np.ndarray:
+        """
+        One-letter amino acid code of every row as a 'U1' array ('' for gaps).
+        """
+        return chars_to_unicode(self.amino_acid)
+
+    def b_factor_stat(self, name: str) -> np.ndarray:
+        """
+        Precomputed B-factor aggregate of every row, 0.0 for gaps or without B-factors.
+
+        Args:
+            name (str): 'mean', 'median', 'min' or 'max'.
+
+        Returns:
+            np.ndarray: float array, one value per row.
+        """
+        if self.b_factors is None:
+            return np.zeros(len(self), dtype=float)
+        stats = self.b_factors.stats[name]
+        return np.where(self.is_gap, 0.0, stats[np.maximum(self.data_row, 0)])
+
+    def contact_count(self, kind: str) -> np.ndarray:
+        """
+        Contact count of every row, 0 for gaps or without computed contacts.
+
+        Args:
+            kind (str): 'total' or 'interface'.
+
+        Returns:
+            np.ndarray: int array, one value per row.
+        """
+        if self.contacts is None:
+            return np.zeros(len(self), dtype=np.int32)
+        counts = self.contacts[kind]
+        return np.where(self.is_gap, 0, counts[np.maximum(self.data_row, 0)])
+
+    def take(self, rows: np.ndarray) -> 'ResidueTable':
+        """
+        Select rows; -1 inserts a gap row.
+
+        Args:
+            rows (np.ndarray): Row positions, -1 for gaps.
+
+        Returns:
+            ResidueTable: New table sharing the SS labels, B-factors and contact counts.
+        """
+        gap = rows < 0
+        safe = np.maximum(rows, 0)
+        gap_ss = np.searchsorted(self.ss_labels, GAP_LABEL)
+
+        def column(values: np.ndarray, fill: int) -> np.ndarray:
+            if len(values) == 0:
+                return np.full(len(rows), fill, dtype=values.dtype)
+            return np.where(gap, fill, values[safe]).astype(values.dtype)
+
+        return replace(self,
+                       residue_index=column(self.residue_index, 0),
+                       insertion_code=column(self.insertion_code, ord(' ')),
+                       amino_acid=column(self.amino_acid, 0),
+                       ss=column(self.ss, gap_ss),
+                       ss_code=column(self.ss_code, GAP_SS_CODE),
+                       data_row=column(self.data_row, -1))
+
+    def __getitem__(self, key: slice) -> 'ResidueTable':
+        return replace(self, **{name: getattr(self, name)[key] for name in
+                                ('residue_index', 'insertion_code', 'amino_acid', 'ss', 'ss_code', 'data_row')})
+
+
+class Residue:
+    """
+    Lightweight read-only view of one row of a ResidueTable.
+
+    Created on demand; holds no data besides the table and the row position.
+    """
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table: ResidueTable, row: int):
+        self._table = table
+        self._row = row
+
+    @property
+    def is_gap(self) -> bool:
+        return bool(self._table.data_row[self._row] < 0)
+
+    @property
+    def index(self) -> Union[int, str]:
+        return '-' if self.is_gap else int(self._table.residue_index[self._row])
+
+    @property
+    def insertion_code(self) -> str:
+        return chr(self._table.insertion_code[self._row]).strip('\0')
+
+    @property
+    def amino_acid(self) -> str:
+        return chr(self._table.amino_acid[self._row]).strip('\0')
+
+    @property
+    def secondary_structure(self) -> str:
+        return str(self._table.ss_labels[self._table.ss[self._row]])
+
+    @property
+    def ss_code(self) -> str:
+        return chr(self._table.ss_code[self._row]).strip('\0')
+
+    @property
+    def b_factors(self) -> np.ndarray:
+        if self._table.b_factors is None or self.is_gap:
+            return EMPTY_B_FACTORS
+        return self._table.b_factors.get(self._table.data_row[self._row])
+
+    def b_factor_stat(self, name: str) -> float:
+        """
+        Precomputed B-factor aggregate ('mean', 'median', 'min' or 'max'), 0.0 without B-factors.
+        """
+        if self._table.b_factors is None or self.is_gap:
+            return 0.0
+        return self._table.b_factors.stat(name, self._table.data_row[self._row])
+
+    def contact_count(self, kind: str) -> int:
+        """
+        Number of residues in contact ('total' or 'interface'), 0 without computed contacts.
+        """
+        if self._table.contacts is None or self.is_gap:
+            return 0
+        return int(self._table.contacts[kind][self._table.data_row[self._row]])
+
+    def __repr__(self) -> str:
+        return (f"Residue(index={self.index!r}, insertion_code={self.insertion_code!r}, "
+                f"amino_acid={self.amino_acid!r}, secondary_structure={self.secondary_structure!r}, "
+                f"ss_code={self.ss_code!r})")
+
+
+class ResidueView:
+    """
+    Sequence of Residue proxies over a ResidueTable, created only when accessed.
+    """
+    __slots__ = ('_table',)
+
+    def __init__(self, table: ResidueTable):
+        self._table = table
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Residue, 'ResidueView']:
+        if isinstance(key, slice):
+            return ResidueView(self._table[key])
+        if key < 0:
+            key += len(self._table)
+        if not 0 <= key < len(self._table):
+            raise IndexError("residue index out of range")
+        return Residue(self._table, key)
+
+    def __iter__(self) -> Iterator[Residue]:
+        return (Residue(self._table, row) for row in range(len(self._table)))
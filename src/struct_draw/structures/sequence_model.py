@@ -0,0 +1,337 @@
+from dataclasses import dataclass
+from typing import Dict, Iterator, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..algorithms.base_algorithm import RESIDUE_DTYPE, ResidueRecords
+from ..algorithms.columns import build_ss_lookup, chars_to_unicode, line_bounds, residue_range_mask
+from ..algorithms.dssp import DEFAULT_SS_TRANSLATION
+from ..compression import InMemoryFile
+from .pdb_model import BaseModel
+from .readers import ResidueBFactors, pack_residue_keys, read_buffer
+
+# Kind of a record, the last ':' field of its header (as in the PDB's ss.txt)
+SEQUENCE_KIND = b'sequence'
+SECSTR_KIND = b'secstr'
+# Chain ID of records whose header has no 'ENTRY:CHAIN' form
+DEFAULT_CHAIN_ID = 'A'
+HEADER_MARK = ord('>')
+COLON = ord(':')
+
+
+@dataclass
+class SequenceRecords:
+    """
+    Amino-acid and secondary-structure strings of many chains, concatenated
+    into one byte buffer each.
+
+    Record `i` covers `offsets[i]:offsets[i + 1]` of `aa`, `ss` and
+    `confidence`; records of the same entry (model) are consecutive.
+
+    Attributes:
+        entry_ids (np.ndarray): Entry ID of every record ('U' array).
+        chain_ids (np.ndarray): Chain ID of every record ('U' array).
+        offsets (np.ndarray): len(records) + 1 offsets into the residue buffers.
+        aa (np.ndarray): uint8 one-letter amino-acid codes.
+        ss (np.ndarray): uint8 secondary-structure codes, one per amino acid.
+        confidence (Optional[np.ndarray]): float per-residue confidence (e.g.
+            predictor probabilities scaled like pLDDT), NaN where unknown.
+    """
+    entry_ids: np.ndarray
+    chain_ids: np.ndarray
+    offsets: np.ndarray
+    aa: np.ndarray
+    ss: np.ndarray
+    confidence: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.chain_ids)
+
+    @classmethod
+    def from_strings(cls, chains: Mapping[str, Tuple[str, str]],
+                     confidence: Optional[Mapping[str, Sequence[float]]] = None,
+                     entry_id: str = '') -> 'SequenceRecords':
+        """
+        Records of one entry from its strings.
+
+        Args:
+            chains (Mapping[str, Tuple[str, str]]): Amino-acid and SS string of every chain.
+            confidence (Optional[Mapping[str, Sequence[float]]]): Per-residue
+                confidence of some or all chains.
+            entry_id (str): Entry ID of all records.
+
+        Returns:
+            SequenceRecords: One record per chain, in the given order.
+
+        Raises:
+            ValueError: If an SS string or a confidence list does not match the length of its sequence.
+        """
+        aa, ss, values = [], [], []
+        for chain_id, (sequence, ss_string) in chains.items():
+            if len(ss_string) != len(sequence):
+                raise ValueError(f"Chain {chain_id} has {len(sequence)} residues but {len(ss_string)} SS codes")
+            aa.append(sequence.encode('ascii', 'replace'))
+            ss.append(ss_string.encode('ascii', 'replace'))
+            chain_values = np.full(len(sequence), np.nan)
+            if confidence is not None and chain_id in confidence:
+                chain_values = np.asarray(confidence[chain_id], dtype=float)
+                if len(chain_values) != len(sequence):
+                    raise ValueError(f"Chain {chain_id} has {len(sequence)} residues "
+                                     f"but {len(chain_values)} confidence values")
+            values.append(chain_values)
+        lengths = [len(sequence) for sequence in aa]
+        return cls(entry_ids=np.full(len(aa), entry_id, dtype=f'U{max(len(entry_id), 1)}'),
+                   chain_ids=np.array(list(chains), dtype='U') if chains else np.array([], dtype='U1'),
+                   offsets=np.concatenate(([0], np.cumsum(lengths))).astype(np.int64),
+                   aa=np.frombuffer(b''.join(aa), dtype=np.uint8),
+                   ss=np.frombuffer(b''.join(ss), dtype=np.uint8),
+                   confidence=np.concatenate(values) if confidence is not None and values else None)
+
+    def entry_bounds(self) -> np.ndarray:
+        """
+        Record offsets of the entries: entry `k` is records `bounds[k]:bounds[k + 1]`.
+        """
+        changes = np.flatnonzero(self.entry_ids[1:] != self.entry_ids[:-1]) + 1
+        return np.concatenate(([0], changes, [len(self)])).astype(np.int64) if len(self) else np.zeros(1, np.int64)
+
+    def select(self, first: int, last: int) -> 'SequenceRecords':
+        """
+        Records `first:last`, sharing the residue buffers.
+        """
+        start, end = self.offsets[first], self.offsets[last]
+        return SequenceRecords(self.entry_ids[first:last], self.chain_ids[first:last],
+                               self.offsets[first:last + 1] - start, self.aa[start:end], self.ss[start:end],
+                               self.confidence[start:end] if self.confidence is not None else None)
+
+
+def _header_ids(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Entry and chain ID of 'ENTRY:CHAIN' headers given without the '>' and the kind field.
+    """
+    lengths = ends - starts
+    width = max(int(lengths.max()) if len(lengths) else 0, 1)
+    columns = np.arange(width)
+    matrix = np.zeros((len(starts), width), dtype=np.uint8)
+    inside = columns < lengths[:, None]
+    matrix[inside] = buf[(starts[:, None] + columns)[inside]]
+    is_colon = matrix == COLON
+    colon = np.where(is_colon.any(axis=1), np.argmax(is_colon, axis=1), lengths)
+    entry = np.where(columns < colon[:, None], matrix, 0)
+    shifted = np.minimum(colon[:, None] + 1 + columns, width - 1)
+    chain = np.where(colon[:, None] + 1 + columns < lengths[:, None], np.take_along_axis(matrix, shifted, 1), 0)
+    chain_ids = chain.view(f'S{width}').ravel().astype('U')
+    return entry.view(f'S{width}').ravel().astype('U'), np.where(colon < lengths, chain_ids, DEFAULT_CHAIN_ID)
+
+
+def _record_kinds(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray, kind: bytes) -> np.ndarray:
+    """
+    Mask of headers whose last field is `:kind`.
+    """
+    suffix = np.frombuffer(b':' + kind, dtype=np.uint8)
+    long_enough = ends - starts >= len(suffix)
+    positions = np.maximum(ends[:, None] - len(suffix), 0) + np.arange(len(suffix))
+    return long_enough & np.all(buf[np.minimum(positions, len(buf) - 1)] == suffix, axis=1)
+
+
+def read_sequence_records(path: Union[str, InMemoryFile]) -> SequenceRecords:
+    """
+    Read a FASTA-like file of amino-acid and secondary-structure records in one pass.
+
+    Records come in pairs: a sequence record followed by the SS record of
+    the same chain, e.g. the PDB's ss.txt::
+
+        >101M:A:sequence
+        MVLSEGEWQLVLHVWAKVEAD...
+        >101M:A:secstr
+            HHHHHHHHHHHHHHGGGHHH...
+
+    Both may be wrapped over several lines. Headers are 'ENTRY:CHAIN' with an
+    optional ':sequence' / ':secstr' kind; a header without a ':' is an entry
+    with the single chain 'A'. A space in an SS string is a coil (stored as
+    '-', like in DSSP output) and SS strings shorter than their sequence
+    (trailing spaces stripped) are padded with coils. All lines are located
+    and gathered with array operations, so millions of records cost a few
+    passes over the buffer.
+
+    Args:
+        path (Union[str, InMemoryFile]): Path to the file (optionally compressed), or its content.
+
+    Returns:
+        SequenceRecords: One record per chain, in file order.
+
+    Raises:
+        ValueError: If records are not in sequence/SS pairs of the same chain, or
+            an SS string is longer than its sequence.
+    """
+    buf = read_buffer(path)
+    starts, ends = line_bounds(buf)
+    non_empty = ends > starts
+    is_header = np.zeros(len(starts), dtype=bool)
+    is_header[non_empty] = buf[starts[non_empty]] == HEADER_MARK
+    record = np.cumsum(is_header) - 1
+    body = ~is_header & (record >= 0)
+    header_starts, header_ends = starts[is_header] + 1, ends[is_header]
+    if len(header_starts) % 2:
+        raise ValueError("Records must come in sequence/SS pairs")
+    is_secstr = _record_kinds(buf, header_starts, header_ends, SECSTR_KIND)
+    is_sequence = _record_kinds(buf, header_starts, header_ends, SEQUENCE_KIND)
+    if is_secstr[0::2].any() or is_sequence[1::2].any():
+        raise ValueError("Every sequence record must be followed by its SS record")
+    # Strip the kind field before splitting the IDs
+    header_ends = header_ends - np.where(is_sequence, len(SEQUENCE_KIND) + 1, 0) \
+        - np.where(is_secstr, len(SECSTR_KIND) + 1, 0)
+    entry_ids, chain_ids = _header_ids(buf, header_starts, header_ends)
+    if (entry_ids[0::2] != entry_ids[1::2]).any() or (chain_ids[0::2] != chain_ids[1::2]).any():
+        raise ValueError("Sequence and SS records of a pair belong to different chains")
+
+    # Concatenate the body lines of every record
+    lengths = (ends - starts)[body]
+    record_lengths = np.bincount(record[body], weights=lengths, minlength=len(header_starts)).astype(np.int64)
+    gathered = np.arange(int(lengths.sum())) + np.repeat(starts[body] - (np.cumsum(lengths) - lengths), lengths)
+    content = buf[gathered]
+    record_offsets = np.concatenate(([0], np.cumsum(record_lengths)))
+    aa_lengths, ss_lengths = record_lengths[0::2], record_lengths[1::2]
+    if (ss_lengths > aa_lengths).any():
+        raise ValueError("SS string longer than its sequence")
+    offsets = np.concatenate(([0], np.cumsum(aa_lengths))).astype(np.int64)
+    aa_local = np.arange(int(aa_lengths.sum())) - np.repeat(offsets[:-1], aa_lengths)
+    aa = content[np.repeat(record_offsets[0:-1:2], aa_lengths) + aa_local]
+    ss = np.full(len(aa), ord('-'), dtype=np.uint8)
+    ss_local = np.arange(int(ss_lengths.sum())) - np.repeat(np.cumsum(ss_lengths) - ss_lengths, ss_lengths)
+    ss[np.repeat(offsets[:-1], ss_lengths) + ss_local] = content[np.repeat(record_offsets[1::2], ss_lengths)
+                                                                 + ss_local]
+    ss[ss == ord(' ')] = ord('-')
+    return SequenceRecords(entry_ids[0::2], chain_ids[0::2], offsets, aa, ss)
+
+
+class SequenceModel(BaseModel):
+    """
+    Model built from amino-acid and secondary-structure strings, without a
+    structure file or an algorithm run.
+
+    The strings become the same residue records an algorithm run gives
+    (residues numbered from `first_residue`), so chains have the regular
+    `Chain` interface. SS codes are translated to labels with one table
+    lookup. Per-residue confidence values are kept as one B-factor per
+    residue, for the 'b_factor' color modes ('a_fold' for pLDDT-like scores).
+
+    Attributes:
+        model_id (Optional[str]): Identifier shown with the chains (e.g. the entry ID).
+        records (SequenceRecords): Strings of the model's chains.
+    """
+    def __init__(
+        self, records: SequenceRecords, model_id: Optional[str] = None,
+        ss_translation: Optional[Dict[str, str]] = None, algorithm: str = 'predicted',
+        include_only: Optional[list] = None, b_factor_dtype: str = 'float32', lazy: bool = False,
+        residue_range: Optional[Tuple[int, int]] = None, first_residue: int = 1
+        ):
+        """
+        Args:
+            records (SequenceRecords): Strings of the chains (see `SequenceRecords.from_strings`).
+            model_id (Optional[str]): Identifier of the model; the entry ID of the
+                first record by default.
+            ss_translation (Optional[Dict[str, str]]): SS code to label mapping; the
+                DSSP one by default.
+            algorithm (str): Name of the predictor, stored as the chains' algorithm.
+            include_only (Optional[list]): Chain IDs to include in final output.
+            b_factor_dtype (str): Storage type of the confidence values.
+            lazy (bool): Build a Chain on its first access.
+            residue_range (Optional[Tuple[int, int]]): First and last residue number
+                (inclusive) to keep in every chain.
+            first_residue (int): Number of the first residue of every chain.
+        """
+        self.records = records
+        if model_id is None and len(records):
+            model_id = str(records.entry_ids[0]) or None
+        self.model_id = model_id
+        self._ss_translation = ss_translation if ss_translation is not None else DEFAULT_SS_TRANSLATION
+        self._first_residue = first_residue
+        super().__init__(algorithm, None, include_only, None, b_factor_dtype, lazy, residue_range)
+        if records.confidence is not None:
+            self.parse_b_factor()
+
+    @classmethod
+    def from_strings(cls, sequence: str, ss: str, confidence: Optional[Sequence[float]] = None,
+                     chain_id: str = DEFAULT_CHAIN_ID, **kwargs) -> 'SequenceModel':
+        """
+        Single-chain model from an amino-acid and an SS string.
+
+        Args:
+            sequence (str): One-letter amino-acid codes.
+            ss (str): One SS code per residue (e.g. DSSP 8-state or 'H'/'E'/'C').
+            confidence (Optional[Sequence[float]]): Per-residue confidence values.
+            chain_id (str): ID of the chain.
+            **kwargs: Further constructor arguments (e.g. model_id, algorithm).
+
+        Returns:
+            SequenceModel: The model.
+        """
+        records = SequenceRecords.from_strings({chain_id: (sequence, ss)},
+                                               {chain_id: confidence} if confidence is not None else None)
+        return cls(records, **kwargs)
+
+    def _residue_numbers(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Sorted chain dictionary, chain code and residue number of every residue of `records`.
+        """
+        lengths = np.diff(self.records.offsets)
+        record = np.repeat(np.arange(len(self.records)), lengths)
+        residue_index = np.arange(len(record)) - self.records.offsets[record] + self._first_residue
+        if len(self.records) == 1:
+            # Most entries are single chains; no dictionary to sort
+            return self.records.chain_ids.astype(str), np.zeros(len(record), dtype=np.int64), residue_index
+        chain_ids, record_chain = np.unique(self.records.chain_ids, return_inverse=True)
+        return chain_ids.astype(str), record_chain.ravel()[record], residue_index
+
+    def load_algorithm_data(self) -> ResidueRecords:
+        """
+        Residue records of the strings; rows outside `include_only` or `residue_range` are left out.
+        """
+        chain_ids, chain_code, residue_index = self._residue_numbers()
+        selected = residue_range_mask(residue_index, self._residue_range)
+        if self._include_only is not None:
+            selected &= np.isin(chain_ids, list(self._include_only))[chain_code]
+        rows = np.flatnonzero(selected)
+        ss_codes = self.records.ss[rows]
+        data = np.empty(len(rows), dtype=RESIDUE_DTYPE)
+        data['residue_index'] = residue_index[rows]
+        data['insertion_code'] = ' '
+        data['chain_code'] = chain_code[rows]
+        data['AA'] = chars_to_unicode(self.records.aa[rows])
+        data['SS'] = build_ss_lookup(self._ss_translation)[ss_codes]
+        data['SS_code'] = chars_to_unicode(ss_codes)
+        return ResidueRecords(data, chain_ids)
+
+    def parse_b_factor(self) -> None:
+        """
+        Attach the confidence values as one B-factor per residue.
+        """
+        chain_ids, chain_code, residue_index = self._residue_numbers()
+        keys = pack_residue_keys(chain_code, residue_index, np.full(len(chain_code), ord(' ')))
+        known = ~np.isnan(self.records.confidence)
+        order = np.argsort(keys[known], kind='stable')
+        self._attach_b_factors(ResidueBFactors(chain_ids, keys[known][order],
+                                               np.arange(int(known.sum()) + 1, dtype=np.int64),
+                                               self.records.confidence[known][order]))
+
+    def _model_id(self) -> Optional[str]:
+        return self.model_id
+
+
+def iter_sequence_models(path: Union[str, InMemoryFile], **kwargs) -> Iterator[SequenceModel]:
+    """
+    One SequenceModel per entry of a sequence/SS file (see `read_sequence_records`).
+
+    The file is parsed once; every model shares slices of the same buffers.
+
+    Args:
+        path (Union[str, InMemoryFile]): Path to the file, or its content.
+        **kwargs: Further SequenceModel arguments (e.g. algorithm, lazy).
+
+    Returns:
+        Iterator[SequenceModel]: Models in file order, consecutive records of an entry forming one model.
+    """
+    records = read_sequence_records(path)
+    bounds = records.entry_bounds()
+    for first, last in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        yield SequenceModel(records.select(first, last), **kwargs)
@@ -0,0 +1,93 @@
+import json
+import os
+import struct
+import tempfile
+import zipfile
+from typing import Dict, Tuple
+
+import numpy as np
+
+from .readers import map_file
+
+META_MEMBER = 'meta.json'
+ARRAY_SUFFIX = '.npy'
+# Fixed part of a zip local file header; the name and extra field lengths sit at its end
+LOCAL_HEADER_SIZE = 30
+LOCAL_HEADER_LENGTHS = struct.Struct('<HH')
+NPY_HEADER_READERS = {(1, 0): np.lib.format.read_array_header_1_0,
+                      (2, 0): np.lib.format.read_array_header_2_0}
+
+
+def write_snapshot(path: str, meta: dict, arrays: Dict[str, np.ndarray]) -> None:
+    """
+    Write arrays and JSON metadata into an uncompressed `.npz` archive.
+
+    Members are stored without compression so `read_snapshot` can map them in
+    place; the file also opens with `np.load`. It is written to a temporary
+    file first and moved into place, so readers never see a partial snapshot.
+
+    Args:
+        path (str): Destination file.
+        meta (dict): JSON-serializable metadata.
+        arrays (Dict[str, np.ndarray]): Arrays by member name (without '.npy').
+
+    Raises:
+        ValueError: If an array holds Python objects.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as fh, zipfile.ZipFile(fh, 'w', zipfile.ZIP_STORED) as archive:
+            archive.writestr(META_MEMBER, json.dumps(meta))
+            for name, array in arrays.items():
+                array = np.asanyarray(array)
+                if array.dtype.hasobject:
+                    raise ValueError(f"Cannot store object array {name} in a snapshot")
+                with archive.open(name + ARRAY_SUFFIX, 'w', force_zip64=True) as member:
+                    np.lib.format.write_array(member, array, allow_pickle=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_snapshot(path: str) -> Tuple[dict, Dict[str, np.ndarray]]:
+    """
+    Map a snapshot written by `write_snapshot`.
+
+    The file is memory-mapped once and every array is a read-only view of
+    its member, so loading copies no data and pages are read on first use.
+
+    Args:
+        path (str): Snapshot file.
+
+    Returns:
+        Tuple[dict, Dict[str, np.ndarray]]: Metadata and arrays by member name.
+
+    Raises:
+        ValueError: If a member is compressed or the metadata is missing.
+    """
+    mm = map_file(path)
+    if mm is None:
+        raise ValueError(f"Empty snapshot file: {path}")
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as fh:
+        names = archive.namelist()
+        if META_MEMBER not in names:
+            raise ValueError(f"Not a model snapshot: {path}")
+        meta = json.loads(archive.read(META_MEMBER))
+        for info in archive.infolist():
+            if not info.filename.endswith(ARRAY_SUFFIX):
+                continue
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Snapshot member {info.filename} is compressed and cannot be mapped")
+            name_length, extra_length = LOCAL_HEADER_LENGTHS.unpack_from(mm, info.header_offset + 26)
+            fh.seek(info.header_offset + LOCAL_HEADER_SIZE + name_length + extra_length)
+            version = np.lib.format.read_magic(fh)
+            if version not in NPY_HEADER_READERS:
+                raise ValueError(f"Unsupported .npy version {version} of snapshot member {info.filename}")
+            shape, fortran_order, dtype = NPY_HEADER_READERS[version](fh)
+            arrays[info.filename[:-len(ARRAY_SUFFIX)]] = np.ndarray(
+                shape, dtype, buffer=mm, offset=fh.tell(), order='F' if fortran_order else 'C')
+    return meta, arrays
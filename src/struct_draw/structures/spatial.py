@@ -0,0 +1,184 @@
+from itertools import product
+from typing import Tuple
+
+import numpy as np
+
+# Offsets of the 27 cells around (and including) a cell
+NEIGHBOR_OFFSETS = np.array(list(product((-1, 0, 1), repeat=3)), dtype=np.int64)
+# Half of them: every unordered pair of neighboring cells is visited once
+FORWARD_OFFSETS = NEIGHBOR_OFFSETS[14:]
+
+
+def _expand(first_starts: np.ndarray, first_counts: np.ndarray,
+            second_starts: np.ndarray, second_counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    All (u, v) combinations of the members of paired contiguous ranges.
+
+    Args:
+        first_starts (np.ndarray): Start of the first range of every pair.
+        first_counts (np.ndarray): Length of the first range of every pair.
+        second_starts (np.ndarray): Start of the second range of every pair.
+        second_counts (np.ndarray): Length of the second range of every pair.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Positions of both members of every combination.
+    """
+    sizes = first_counts * second_counts
+    block = np.repeat(np.arange(len(sizes)), sizes)
+    local = np.arange(int(sizes.sum())) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    width = second_counts[block]
+    return first_starts[block] + local // width, second_starts[block] + local % width
+
+
+class CellList:
+    """
+    Uniform grid over 3-D points for fixed-radius neighbor queries.
+
+    Points are bucketed into cubic cells of `cell_size` and sorted by cell, so
+    every non-empty cell is a contiguous slice of `order`. A query with a
+    radius up to the cell size only visits the 27 cells around a point, so
+    building the index and answering queries take time linear in the number
+    of points and neighbors instead of comparing every pair.
+
+    Attributes:
+        points (np.ndarray): float (n, 3) indexed positions.
+        cell_size (float): Edge of the cubic cells; the largest query radius.
+        order (np.ndarray): Point indices sorted by cell.
+        cell_keys (np.ndarray): Sorted linear keys of the non-empty cells.
+        cell_starts (np.ndarray): len(cell_keys) + 1 offsets into `order`.
+    """
+
+    def __init__(self, points: np.ndarray, cell_size: float):
+        """
+        Args:
+            points (np.ndarray): (n, 3) positions.
+            cell_size (float): Edge of the cells, in the units of `points`.
+
+        Raises:
+            ValueError: If cell_size is not positive or points are not finite (n, 3) positions.
+        """
+        points = np.asarray(points, dtype=float)
+        if cell_size <= 0:
+            raise ValueError(f"Cell size must be positive, got {cell_size}")
+        if points.ndim != 2 or points.shape[1] != 3 or not np.isfinite(points).all():
+            raise ValueError("Points must be a finite (n, 3) array")
+        self.points = points
+        self.cell_size = float(cell_size)
+        self._origin = points.min(axis=0) if len(points) else np.zeros(3)
+        cells = self._cells_of(points)
+        # One extra cell per axis keeps neighbor lookups of the last cells in range
+        self._shape = (cells.max(axis=0) if len(points) else np.zeros(3, dtype=np.int64)) + 2
+        keys = self._linear(cells)
+        self.order = np.argsort(keys, kind='stable')
+        self.cell_keys, first = np.unique(keys[self.order], return_index=True)
+        self.cell_starts = np.append(first, len(points)).astype(np.int64)
+        self._cells = cells[self.order[first]]
+        # Coordinates in cell order, one contiguous array per axis, for cache-friendly gathers
+        self._sorted_axes = [np.ascontiguousarray(points[self.order, axis]) for axis in range(3)]
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _cells_of(self, points: np.ndarray) -> np.ndarray:
+        return np.floor((points - self._origin) / self.cell_size).astype(np.int64)
+
+    def _linear(self, cells: np.ndarray) -> np.ndarray:
+        # Cells are shifted by one so that offsets of -1 stay non-negative
+        shifted = cells + 1
+        return (shifted[:, 0] * (self._shape[1] + 1) + shifted[:, 1]) * (self._shape[2] + 1) + shifted[:, 2]
+
+    def _find_cells(self, cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Position of every cell in `cell_keys` and a mask of the non-empty ones.
+        """
+        inside = np.all((cells >= -1) & (cells < self._shape), axis=1)
+        keys = self._linear(np.where(inside[:, None], cells, -1))
+        positions = np.minimum(np.searchsorted(self.cell_keys, keys), max(len(self.cell_keys) - 1, 0))
+        found = inside & (self.cell_keys[positions] == keys) if len(self.cell_keys) else inside & False
+        return positions, found
+
+    def _check_radius(self, radius: float) -> None:
+        if not 0 <= radius <= self.cell_size:
+            raise ValueError(f"Query radius must be between 0 and the cell size ({self.cell_size}), got {radius}")
+
+    def pairs(self, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        All pairs of indexed points closer than `radius` (inclusive).
+
+        Args:
+            radius (float): Distance cutoff, at most `cell_size`.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Indices of both points of every pair, first < second.
+
+        Raises:
+            ValueError: If radius is negative or larger than the cell size.
+        """
+        self._check_radius(radius)
+        starts, counts = self.cell_starts[:-1], np.diff(self.cell_starts)
+        limit = radius ** 2
+        # Pairs inside a cell, then with the forward half of the neighboring cells
+        u, v = _expand(starts, counts, starts, counts)
+        keep = u < v
+        u, v = self._within(u[keep], v[keep], limit)
+        firsts, seconds = [u], [v]
+        for offset in FORWARD_OFFSETS:
+            positions, found = self._find_cells(self._cells + offset)
+            cells = np.flatnonzero(found)
+            u, v = self._within(*_expand(starts[cells], counts[cells], starts[positions[cells]],
+                                         counts[positions[cells]]), limit)
+            firsts.append(u)
+            seconds.append(v)
+        first, second = self.order[np.concatenate(firsts)], self.order[np.concatenate(seconds)]
+        return np.minimum(first, second), np.maximum(first, second)
+
+    def _within(self, u: np.ndarray, v: np.ndarray, limit: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Candidate pairs (positions in `order`) whose squared distance is at most `limit`.
+        """
+        distance = np.zeros(len(u))
+        for axis in self._sorted_axes:
+            distance += (axis[u] - axis[v]) ** 2
+        close = distance <= limit
+        return u[close], v[close]
+
+    def query(self, points: np.ndarray, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Indexed points within `radius` (inclusive) of every query point, in a CSR layout.
+
+        Args:
+            points (np.ndarray): (m, 3) query positions.
+            radius (float): Distance cutoff, at most `cell_size`.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: m + 1 offsets and the indices of the
+            neighbors of every query point, sorted within each row.
+
+        Raises:
+            ValueError: If radius is negative or larger than the cell size.
+        """
+        self._check_radius(radius)
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        cells = self._cells_of(points)
+        counts = np.diff(self.cell_starts)
+        queries, neighbors = [], []
+        for offset in NEIGHBOR_OFFSETS:
+            positions, found = self._find_cells(cells + offset)
+            rows = np.flatnonzero(found)
+            q, member = _expand(rows, np.ones(len(rows), dtype=np.int64),
+                                self.cell_starts[positions[rows]], counts[positions[rows]])
+            queries.append(q)
+            neighbors.append(self.order[member])
+        query, neighbor = np.concatenate(queries), np.concatenate(neighbors)
+        close = np.sum((points[query] - self.points[neighbor]) ** 2, axis=1) <= radius ** 2
+        query, neighbor = query[close], neighbor[close]
+        order = np.lexsort((neighbor, query))
+        offsets = np.searchsorted(query[order], np.arange(len(points) + 1)).astype(np.int64)
+        return offsets, neighbor[order]
+
+    def count(self, points: np.ndarray, radius: float) -> np.ndarray:
+        """
+        Number of indexed points within `radius` of every query point.
+        """
+        offsets, _ = self.query(points, radius)
+        return np.diff(offsets)
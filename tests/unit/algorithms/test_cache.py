@@ -0,0 +1,141 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import numpy as np
+
+from struct_draw.algorithms import AlgorithmCache
+from struct_draw.algorithms.base_algorithm import BaseAlgorithm
+from struct_draw.algorithms.stride import Stride
+
+
+class CountingAlgorithm(BaseAlgorithm):
+    def __init__(self, cache=None, flags=(), banner='fake 1.0'):
+        super().__init__('fake_algo', None, cache)
+        self.flags = list(flags)
+        self.banner = banner
+        self.calls = 0
+
+    def command(self, pdb_file):
+        return [self._algorithm_sub_name] + self.flags + [pdb_file]
+
+    def version(self):
+        return self.banner
+
+    def run(self, pdb_file):
+        self.calls += 1
+        with open(pdb_file) as fh:
+            return f"out:{fh.read()}" * 50
+
+    def process_data(self, algorithm_out):
+        return np.array([])
+
+
+@pytest.fixture
+def pdb_file(tmp_path):
+    path = tmp_path / "model.pdb"
+    path.write_text("ATOM 1\n")
+    return str(path)
+
+
+class TestAlgorithmCache:
+    def test_hit_after_miss(self, tmp_path, pdb_file):
+        algo = CountingAlgorithm(AlgorithmCache(str(tmp_path / "cache")))
+        first, second = algo.run_cached(pdb_file), algo.run_cached(pdb_file)
+        assert first == second == algo.run(pdb_file)
+        assert algo.calls == 2
+        assert (algo.cache.stats.hits, algo.cache.stats.misses) == (1, 1)
+        assert algo.cache.stats.hit_rate == 0.5
+
+    def test_shared_between_instances_and_paths(self, tmp_path, pdb_file):
+        cache_dir = str(tmp_path / "cache")
+        CountingAlgorithm(AlgorithmCache(cache_dir)).run_cached(pdb_file)
+        copy = tmp_path / "copy.pdb"
+        copy.write_text("ATOM 1\n")
+        algo = CountingAlgorithm(AlgorithmCache(cache_dir))
+        algo.run_cached(str(copy))
+        assert algo.calls == 0
+
+    @pytest.mark.parametrize(
+        "changed",
+        [
+            pytest.param(dict(flags=['--extra']), id='arguments'),
+            pytest.param(dict(banner='fake 2.0'), id='version'),
+        ]
+    )
+    def test_key_covers_command(self, tmp_path, pdb_file, changed):
+        cache = AlgorithmCache(str(tmp_path / "cache"))
+        CountingAlgorithm(cache).run_cached(pdb_file)
+        algo = CountingAlgorithm(cache, **changed)
+        algo.run_cached(pdb_file)
+        assert algo.calls == 1
+
+    def test_content_change_misses(self, tmp_path, pdb_file):
+        algo = CountingAlgorithm(AlgorithmCache(str(tmp_path / "cache")))
+        algo.run_cached(pdb_file)
+        with open(pdb_file, 'a') as fh:
+            fh.write("ATOM 2\n")
+        assert "ATOM 2" in algo.run_cached(pdb_file)
+        assert algo.calls == 2
+
+    def test_lru_eviction(self, tmp_path):
+        cache = AlgorithmCache(str(tmp_path / "cache"))
+        algo = CountingAlgorithm(cache)
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"model{i}.pdb"
+            path.write_text(f"ATOM {i}\n")
+            paths.append(str(path))
+        algo.run_cached(paths[0])
+        entry_size = cache._size
+        cache.max_bytes = 2 * entry_size
+        algo.run_cached(paths[1])
+        os.utime(cache._path(cache.key(algo, paths[0])), (0, 0))
+        os.utime(cache._path(cache.key(algo, paths[1])), (1, 1))
+        algo.run_cached(paths[0])        # hit refreshes the oldest entry
+        algo.run_cached(paths[2])        # evicts paths[1]
+        assert cache.stats.evictions == 1
+        assert cache.get(cache.key(algo, paths[1])) is None
+        assert cache.get(cache.key(algo, paths[0])) is not None
+        assert cache._size <= cache.max_bytes
+
+    def test_empty_output_not_stored(self, tmp_path, pdb_file):
+        cache = AlgorithmCache(str(tmp_path / "cache"))
+        algo = CountingAlgorithm(cache)
+        algo.run = lambda path: ""
+        algo.run_cached(pdb_file)
+        assert cache.get(cache.key(algo, pdb_file)) is None
+
+    def test_no_cache(self, pdb_file):
+        algo = CountingAlgorithm()
+        algo.run_cached(pdb_file)
+        algo.run_cached(pdb_file)
+        assert algo.calls == 2
+
+    def test_counters_from_threads(self, tmp_path, pdb_file):
+        algo = CountingAlgorithm(AlgorithmCache(str(tmp_path / "cache")))
+        algo.run_cached(pdb_file)
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lambda _: algo.run_cached(pdb_file), range(400)))
+        assert (algo.cache.stats.hits, algo.cache.stats.misses) == (400, 1)
+
+    def test_eviction_from_threads(self, tmp_path):
+        cache = AlgorithmCache(str(tmp_path / "cache"), max_bytes=20_000)
+        outputs = [os.urandom(1500).hex() for _ in range(8)]
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lambda i: cache.put(f"{i:064x}", outputs[i % 8]), range(200)))
+        on_disk = [os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(cache.cache_dir)
+                   for name in files]
+        assert cache._size == sum(on_disk) <= cache.max_bytes
+        assert cache.stats.evictions == 200 - len(on_disk)
+
+
+def test_version_without_flag_fingerprints_executable(tmp_path):
+    executable = tmp_path / "stride"
+    executable.write_text("#!/bin/sh\necho usage\n")
+    executable.chmod(0o755)
+    first = Stride(str(executable)).version()
+    assert first.startswith(str(executable.resolve())) and "usage" not in first
+    executable.write_text("#!/bin/sh\necho new usage banner\n")
+    assert Stride(str(executable)).version() != first
+    assert Stride(str(tmp_path / "missing")).version() == ''
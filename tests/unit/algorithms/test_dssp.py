@@ -1,6 +1,7 @@
 import pytest
 
 from struct_draw.algorithms import DSSP
+from struct_draw.algorithms.columns import fixed_width_rows, text_to_buffer
 
 
 @pytest.fixture(scope="session")
@@ -55,7 +56,7 @@ class TestDSSP:
             dssp = make_algorithm(DSSP, "dssp", None)
             body = "\n".join(make_line(*args) for args in lines)
             algorithm_out = header + body + "\n"
-            arr = dssp.process_data(algorithm_out)
+            arr = dssp.process_data(algorithm_out).to_array()
             assert len(arr) == expected_len
             assert arr.dtype.names == ("residue_index", "insertion_code", "chain_id", "AA", "SS", "SS_code")
             if expected_len:
@@ -74,7 +75,7 @@ class TestDSSP:
             line = make_line(1, " ", "A", "A", "H")  # SS_code=H
             # by default H should be translated as 'Helix', but with custom it has to be 'Other'
             
-            arr = dssp.process_data(header + line + "\n")
+            arr = dssp.process_data(header + line + "\n").to_array()
             assert len(arr) == 1
             assert arr["SS_code"][0] == "H"
             assert arr["SS"][0] == "Other"
@@ -83,7 +84,7 @@ class TestDSSP:
             dssp = make_algorithm(DSSP, "dssp", None)  # default table
             header = "XXX RESIDUE AA STRUCTURE XXX\n"
             line = make_line(2, " ", "A", "G", "X")  # There is no 'X' in deault table
-            arr = dssp.process_data(header + line + "\n")
+            arr = dssp.process_data(header + line + "\n").to_array()
             assert arr["SS_code"][0] == "X"
             assert arr["SS"][0] == "Other"
             
@@ -92,4 +93,93 @@ class TestDSSP:
             mapping = default_table_dssp # default table
             dssp = make_algorithm(DSSP, "dssp", mapping)
             _ = dssp.SS_TRANSLATION['H'] 
-            assert mapping['H'] == 'Helix'
\ No newline at end of file
+            assert mapping['H'] == 'Helix'
+
+        def test_matches_line_by_line_parser(self, make_algorithm, make_line, default_table_dssp):
+            """Columnar parser must give exactly the same array as a plain per-line parse."""
+            dssp = make_algorithm(DSSP, "dssp", None)
+            rows = [(1, " ", "A", "M", "H"), (-2, "A", "A", "K", "E"), (3, " ", "B", "G", "H", True),
+                    (1024, "B", "B", "W", "T"), (99999, " ", "C", "P", "S")]
+            lines = [make_line(*args) for args in rows]
+            lines.insert(2, "    3        !              0   0    0")  # chain break
+            lines.insert(4, "")
+            lines[-1] = lines[-1].rstrip() + "  "  # lines of different width
+            algorithm_out = "HEADER\n  #  RESIDUE AA STRUCTURE BP1\n" + "\n".join(lines)
+
+            expected = []
+            for line in lines:
+                if not line or line[11] == ' ':
+                    continue
+                ss_code = line[16] if line[16] != ' ' else '-'
+                expected.append((int(line[5:10]), line[10], line[11], line[13],
+                                 default_table_dssp.get(ss_code, 'Other'), ss_code))
+            arr = dssp.process_data(algorithm_out).to_array()
+            assert arr.tolist() == expected
+            assert arr.dtype == dssp.process_data("").to_array().dtype
+
+        def test_short_lines_spanning_the_stride(self, make_algorithm, make_line):
+            """Lines shorter than the first one must not be read as one fixed-width row."""
+            dssp = make_algorithm(DSSP, "dssp", None)
+            line = make_line(1, chain="A", ss_code="H")
+            header = "  #  RESIDUE AA STRUCTURE BP1".ljust(len(line))
+            # Two short lines whose lengths (with their newlines) add up to a full line
+            short = [make_line(2, chain="B", ss_code="E")[:20], make_line(3, chain="C", ss_code="T")[:len(line) - 21]]
+            algorithm_out = "\n".join([header, line] + short + [line]) + "\n"
+            assert fixed_width_rows(text_to_buffer(algorithm_out)) is None
+            assert fixed_width_rows(text_to_buffer("\n".join([header, line, line]) + "\n")) is not None
+            arr = dssp.process_data(algorithm_out).to_array()
+            assert arr["chain_id"].tolist() == ["A", "B", "C", "A"]
+            assert arr["SS_code"].tolist() == ["H", "E", "T", "H"]
+
+        def test_parse_stream_matches_process_data(self, make_algorithm, make_line):
+            dssp = make_algorithm(DSSP, "dssp", None)
+            lines = [make_line(i, chain="AB"[i % 2], ss_code="HE T"[i % 4]) for i in range(1, 40)]
+            algorithm_out = "HEADER\n  #  RESIDUE AA STRUCTURE BP1\n" + "\n".join(lines) + "\n"
+            text_lines = algorithm_out.splitlines(keepends=True)
+            # Chunks of whole lines, the first one ending right at the header
+            chunks = [text_lines[:2]] + [text_lines[i:i + 7] for i in range(2, len(text_lines), 7)]
+            arr = dssp.parse_stream(text_to_buffer("".join(chunk)) for chunk in chunks).to_array()
+            assert arr.tolist() == dssp.process_data(algorithm_out).to_array().tolist()
+
+        def test_include_only_skips_other_chains(self, make_algorithm, make_line):
+            dssp = make_algorithm(DSSP, "dssp", None)
+            lines = [make_line(i, chain="ABC"[i % 3]) for i in range(1, 30)]
+            algorithm_out = "  #  RESIDUE AA STRUCTURE BP1\n" + "\n".join(lines) + "\n"
+            full = dssp.process_data(algorithm_out).to_array()
+            arr = dssp.process_data(algorithm_out, ["A", "C", "XY"]).to_array()
+            assert arr.tolist() == full[full['chain_id'] != "B"].tolist()
+            assert len(dssp.parse_output(algorithm_out, [])) == 0
+
+        def test_residue_range_skips_other_residues(self, make_algorithm, make_line):
+            dssp = make_algorithm(DSSP, "dssp", None)
+            lines = [make_line(i, chain="AB"[i % 2]) for i in range(1, 30)]
+            algorithm_out = "  #  RESIDUE AA STRUCTURE BP1\n" + "\n".join(lines) + "\n"
+            full = dssp.process_data(algorithm_out).to_array()
+            arr = dssp.parse_output(algorithm_out, ["A"], (5, 12)).to_array()
+            expected = full[(full['chain_id'] == "A") & (full['residue_index'] >= 5) & (full['residue_index'] <= 12)]
+            assert arr.tolist() == expected.tolist()
+
+        def test_author_chain_ids(self, make_algorithm, make_line):
+            dssp = make_algorithm(DSSP, "dssp", None)
+            header = ("  #  RESIDUE AA STRUCTURE BP1 BP2  ACC     N-H-->O    O-->H-N    N-H-->O    O-->H-N"
+                      "    TCO  KAPPA ALPHA  PHI   PSI    X-CA   Y-CA   Z-CA            CHAIN AUTHCHAIN\n")
+            coordinates_end = header.index("Z-CA") + 4
+            # 'A' and 'AA' share the one-character chain column
+            chains = [("A", "A"), ("B", "AA"), ("C", "A10"), ("D", "AA")]
+            lines = [make_line(i, chain=auth[0]).ljust(coordinates_end) + f"             {label:>4} {auth:>4}"
+                     for i, (label, auth) in enumerate(chains, start=1)]
+            records = dssp.process_data(header + "\n".join(lines) + "\n")
+            assert records.chain_ids.tolist() == ["A", "A10", "AA"]
+            assert records.data['chain_code'].tolist() == [0, 2, 1, 2]
+            assert records.chain_id.tolist() == ["A", "AA", "A10", "AA"]
+            assert dssp.process_data(header + "\n".join(lines) + "\n", ["AA"]).data['residue_index'].tolist() == [2, 4]
+
+        def test_chunks_merge_chain_dictionaries(self, make_algorithm, make_line):
+            dssp = make_algorithm(DSSP, "dssp", None)
+            header = "  #  RESIDUE AA STRUCTURE BP1\n"
+            chunks = [header + make_line(1, chain="C") + "\n",
+                      make_line(2, chain="A") + "\n" + make_line(3, chain="C") + "\n",
+                      make_line(4, chain="B") + "\n"]
+            records = dssp.parse_stream(text_to_buffer(chunk) for chunk in chunks)
+            assert records.chain_ids.tolist() == ["A", "B", "C"]
+            assert records.chain_id.tolist() == ["C", "A", "C", "B"]
@@ -0,0 +1,160 @@
+import pytest
+import numpy as np
+
+from struct_draw.algorithms import AlgorithmCache, DSSP
+from struct_draw.algorithms.numpy_dssp import (NumpyDSSP, _Geometry, _bridges, _ladders, ANTIPARALLEL,
+                                               hbond_energy)
+from struct_draw.compression import InMemoryFile
+from struct_draw.structures import PDB, PDBx
+
+N_RESIDUES = 20
+
+
+def place(a, b, c, bond, angle, torsion):
+    """
+    Position of the atom bonded to `c`, from its bond length, angle and torsion (NeRF).
+    """
+    bc = (c - b) / np.linalg.norm(c - b)
+    normal = np.cross(b - a, bc)
+    normal /= np.linalg.norm(normal)
+    frame = np.stack((bc, np.cross(normal, bc), normal), axis=1)
+    angle, torsion = np.radians(angle), np.radians(torsion)
+    return c + frame @ [-bond * np.cos(angle), bond * np.sin(angle) * np.cos(torsion),
+                        bond * np.sin(angle) * np.sin(torsion)]
+
+
+def ideal_backbone(phi, psi, n=N_RESIDUES):
+    n_atom, ca, c = np.array([0.0, 1.4, 0.0]), np.zeros(3), np.array([1.5, 0.0, 0.0])
+    residues = [(n_atom, ca, c)]
+    for _ in range(n - 1):
+        n_atom = place(n_atom, ca, c, 1.33, 116.2, psi)
+        ca = place(ca, c, n_atom, 1.46, 121.7, 180.0)
+        c = place(c, n_atom, ca, 1.52, 111.2, phi)
+        residues.append((n_atom, ca, c))
+    next_n = [residues[k + 1][0] for k in range(n - 1)] + [None]
+    return [(n_atom, ca, c, place(nxt, ca, c, 1.23, 120.5, 180.0) if nxt is not None
+             else place(n_atom, ca, c, 1.23, 120.5, psi + 180.0))
+            for (n_atom, ca, c), nxt in zip(residues, next_n)]
+
+
+def pdb_text(residues, chain="A", first=1):
+    lines = []
+    for number, atoms in enumerate(residues, start=first):
+        for name, (x, y, z) in zip((" N  ", " CA ", " C  ", " O  "), atoms):
+            lines.append(f"ATOM  {len(lines) + 1:5d} {name} ALA {chain}{number:4d}    "
+                         f"{x:8.3f}{y:8.3f}{z:8.3f}  1.00 10.00           {name.strip()[0]}  ")
+    return "\n".join(lines) + "\nEND\n"
+
+
+def cif_text(residues):
+    rows = [f"ATOM {serial} {name} ALA A 1 {number} ? {x:.3f} {y:.3f} {z:.3f} 1"
+            for number, atoms in enumerate(residues, start=1)
+            for serial, (name, (x, y, z)) in enumerate(zip(("N", "CA", "C", "O"), atoms), start=1)]
+    return ("data_test\nloop_\n_atom_site.group_PDB\n_atom_site.id\n_atom_site.label_atom_id\n"
+            "_atom_site.label_comp_id\n_atom_site.label_asym_id\n_atom_site.label_entity_id\n"
+            "_atom_site.label_seq_id\n_atom_site.pdbx_PDB_ins_code\n_atom_site.Cartn_x\n_atom_site.Cartn_y\n"
+            "_atom_site.Cartn_z\n_atom_site.pdbx_PDB_model_num\n" + "\n".join(rows) + "\n#\n")
+
+
+def assigned(text, suffix=".pdb", **kwargs):
+    records = NumpyDSSP(**kwargs).run_streaming(InMemoryFile(text.encode(), suffix))
+    return "".join(records.data['SS_code'])
+
+
+HELICES = [
+    pytest.param(-57, -47, "H", id='alpha'),
+    pytest.param(-49, -26, "G", id='3-10'),
+    pytest.param(-57, -70, "I", id='pi'),
+]
+
+
+class TestNumpyDSSP:
+    @pytest.mark.parametrize("phi, psi, code", HELICES)
+    def test_ideal_helices(self, phi, psi, code):
+        assert assigned(pdb_text(ideal_backbone(phi, psi))) == "-" + code * (N_RESIDUES - 2) + "-"
+
+    def test_extended_strand_is_loop(self):
+        assert assigned(pdb_text(ideal_backbone(-139, 135))) == "-" * N_RESIDUES
+
+    def test_pi_helix_preference(self):
+        # A pi-helix does not override alpha-helix residues without the preference
+        helix = ideal_backbone(-57, -70)
+        assert assigned(pdb_text(helix), prefer_pi_helices=False) == "-" + "I" * (N_RESIDUES - 2) + "-"
+
+    def test_chain_break_splits_helix(self):
+        helix = ideal_backbone(-57, -47)
+        shifted = [tuple(atom + 50.0 for atom in atoms) for atoms in helix[10:]]
+        codes = assigned(pdb_text(helix[:10] + shifted))
+        assert "H" * 8 in codes[:10] and "H" * 8 in codes[10:]
+        assert codes[9] == "-" and codes[10] == "-"
+
+    def test_cif_matches_pdb(self):
+        helix = ideal_backbone(-57, -47)
+        assert assigned(cif_text(helix), suffix=".cif") == assigned(pdb_text(helix))
+
+    def test_run_output_parses_like_rows(self):
+        dssp = NumpyDSSP()
+        source = InMemoryFile(pdb_text(ideal_backbone(-57, -47)).encode(), ".pdb")
+        rows = dssp.run_streaming(source, include_only=["A"], residue_range=(3, 8))
+        parsed = DSSP('mkdssp').parse_output(dssp.run(source), ["A"], (3, 8))
+        assert parsed.to_array().tolist() == rows.to_array().tolist()
+        assert rows.data['residue_index'].tolist() == list(range(3, 9))
+
+    def test_model_without_subprocess(self, tmp_path):
+        path = tmp_path / "helix.pdb"
+        path.write_text(pdb_text(ideal_backbone(-57, -47)))
+        model = PDB(NumpyDSSP(), pdb_file=str(path))
+        chain = model.get_chain("A")
+        assert [residue.ss_code for residue in chain.residues][1:-1] == ["H"] * (N_RESIDUES - 2)
+        assert set(chain.dssp_data['AA'].tolist()) == {"A"}
+
+    @pytest.mark.parametrize("model_class, reader, text", [
+        pytest.param(PDB, "read_pdb_atoms", pdb_text, id='pdb'),
+        pytest.param(PDBx, "read_cif_atoms", cif_text, id='pdbx'),
+    ])
+    def test_model_reads_file_once(self, monkeypatch, model_class, reader, text):
+        from struct_draw.structures import pdb_model
+        calls = []
+        read = getattr(pdb_model, reader)
+        monkeypatch.setattr(pdb_model, reader, lambda pdb_file: calls.append(pdb_file) or read(pdb_file))
+        model = model_class(NumpyDSSP(), pdb_file=text(ideal_backbone(-57, -47)).encode())
+        model.compute_contacts()
+        assert model.get_chain("A").residues[5].ss_code == "H"
+        assert len(calls) == 1
+
+    def test_model_from_cached_output(self, tmp_path):
+        text = cif_text(ideal_backbone(-57, -47))
+        algorithm = NumpyDSSP(cache=AlgorithmCache(str(tmp_path / "cache")))
+        first = PDBx(algorithm, pdb_file=text.encode())
+        second = PDBx(algorithm, pdb_file=text.encode())
+        assert algorithm.cache.stats.hits == 1
+        assert (second.get_chain("A").dssp_data.tolist() == first.get_chain("A").dssp_data.tolist())
+
+
+class TestGeometry:
+    def test_hbond_energy(self):
+        # Linear N-H...O=C with H...O = 1.9 Å
+        n, h = np.array([[0.0, 0.0, 0.0]]), np.array([[1.0, 0.0, 0.0]])
+        o, c = np.array([[2.9, 0.0, 0.0]]), np.array([[4.13, 0.0, 0.0]])
+        expected = -27.888 * (1 / 1.9 - 1 / 3.13 + 1 / 4.13 - 1 / 2.9)
+        np.testing.assert_allclose(hbond_energy(n, h, c, o), [expected])
+        assert hbond_energy(n, h, h + 0.1, h + 0.2)[0] == -9.9
+
+    def test_antiparallel_ladder(self):
+        # Hairpin: residues 2 and 4 pair with 12 and 10 through two H-bonds each
+        acceptors = np.full((16, 2), -1)
+        for donor, acceptor in ((2, 12), (12, 2), (4, 10), (10, 4)):
+            acceptors[donor, 0] = acceptor
+        geometry = _Geometry(acceptors, np.zeros(15, dtype=bool))
+        i, j, kind = _bridges(geometry)
+        assert sorted(zip(i.tolist(), j.tolist())) == [(2, 12), (3, 11), (4, 10)]
+        assert (kind == ANTIPARALLEL).all()
+        assert _ladders(geometry, i, j, kind) == [[ANTIPARALLEL, 2, 4, 10, 12, 3]]
+
+    def test_bridge_across_chain_break(self):
+        acceptors = np.full((16, 2), -1)
+        for donor, acceptor in ((2, 12), (12, 2)):
+            acceptors[donor, 0] = acceptor
+        breaks = np.zeros(15, dtype=bool)
+        breaks[11] = True
+        assert len(_bridges(_Geometry(acceptors, breaks))[0]) == 0
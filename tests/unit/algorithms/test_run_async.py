@@ -0,0 +1,89 @@
+import asyncio
+import sys
+import time
+
+import pytest
+
+from struct_draw.algorithms import DSSP
+from struct_draw.algorithms.cache import AlgorithmCache
+from struct_draw.algorithms.base_algorithm import AlgorithmError, AlgorithmTimeoutError
+
+SLEEP_AND_ECHO = "import sys, time; time.sleep(float(sys.argv[1])); print(open(sys.argv[2]).read(), end='')"
+
+
+class ScriptDSSP(DSSP):
+    def __init__(self, delay: float = 0.0, cache: AlgorithmCache = None):
+        super().__init__('mkdssp', cache=cache)
+        self.delay = delay
+
+    def command(self, pdb_file):
+        return [sys.executable, "-c", SLEEP_AND_ECHO, str(self.delay), pdb_file]
+
+
+@pytest.fixture
+def pdb_file(tmp_path):
+    path = tmp_path / "model.pdb"
+    path.write_text("ATOM 1\nATOM 2\n")
+    return str(path)
+
+
+class TestRunAsync:
+    def test_output(self, pdb_file):
+        assert asyncio.run(ScriptDSSP().run_async(pdb_file)) == "ATOM 1\nATOM 2\n"
+
+    def test_semaphore_limits_concurrency(self, pdb_file):
+        algo = ScriptDSSP(delay=0.3)
+        algo.max_concurrent_runs = 2
+
+        async def main():
+            return await asyncio.gather(*(algo.run_async(pdb_file) for _ in range(4)))
+
+        start = time.perf_counter()
+        outs = asyncio.run(main())
+        assert time.perf_counter() - start >= 0.6
+        assert len(set(outs)) == 1
+
+    def test_timeout_kills_process(self, pdb_file):
+        start = time.perf_counter()
+        with pytest.raises(AlgorithmTimeoutError):
+            asyncio.run(ScriptDSSP(delay=30).run_async(pdb_file, timeout=0.3))
+        assert time.perf_counter() - start < 10
+
+    def test_failure_carries_status_and_stderr(self, pdb_file):
+        with pytest.raises(AlgorithmError, match="ValueError") as info:
+            asyncio.run(ScriptDSSP(delay='not a number').run_async(pdb_file))
+        assert info.value.returncode == 1
+
+    def test_reusable_across_event_loops(self, pdb_file):
+        algo = ScriptDSSP()
+        assert asyncio.run(algo.run_async(pdb_file)) == asyncio.run(algo.run_async(pdb_file))
+
+    def test_cached_run_keeps_loop_responsive(self, pdb_file, tmp_path):
+        class SlowVersionDSSP(ScriptDSSP):
+            def version(self):
+                time.sleep(0.5)
+                return 'slow'
+
+        algo = SlowVersionDSSP(cache=AlgorithmCache(str(tmp_path / "cache")))
+
+        async def main():
+            gaps = []
+
+            async def ticker():
+                last = time.perf_counter()
+                while True:
+                    await asyncio.sleep(0.01)
+                    now = time.perf_counter()
+                    gaps.append(now - last)
+                    last = now
+
+            task = asyncio.create_task(ticker())
+            await asyncio.sleep(0.05)
+            outs = [await algo.run_cached_async(pdb_file) for _ in range(2)]
+            task.cancel()
+            return outs, max(gaps)
+
+        outs, max_gap = asyncio.run(main())
+        assert outs[0] == outs[1] == "ATOM 1\nATOM 2\n"
+        assert algo.cache.stats.hits == 1
+        assert max_gap < 0.25
@@ -0,0 +1,73 @@
+import sys
+import time
+
+import pytest
+
+from struct_draw.algorithms import DSSP, AlgorithmError, AlgorithmTimeoutError
+
+# Prints the file given as last argument, then sleeps and exits with the requested status
+SCRIPT = ("import sys, time; sys.stdout.write(open(sys.argv[-1]).read()); sys.stdout.flush(); "
+          "sys.stderr.write(sys.argv[3]); time.sleep(float(sys.argv[1])); sys.exit(int(sys.argv[2]))")
+
+
+class ScriptDSSP(DSSP):
+    def __init__(self, delay=0.0, status=0, message="", timeout=None):
+        super().__init__('mkdssp', timeout=timeout)
+        self.args = [str(delay), str(status), message]
+
+    def command(self, pdb_file):
+        return [sys.executable, "-c", SCRIPT] + self.args + [pdb_file]
+
+
+@pytest.fixture
+def dssp_output(tmp_path):
+    lines = ["HEADER", "  #  RESIDUE AA STRUCTURE BP1"]
+    lines += [f"{i:5d}{i:5d} {'AB'[i % 2]} {'GAV'[i % 3]}  {'HE '[i % 3]}".ljust(40) for i in range(1, 500)]
+    path = tmp_path / "dssp.out"
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+class TestRunStreaming:
+    def test_matches_process_data(self, dssp_output):
+        dssp = ScriptDSSP()
+        with open(dssp_output) as fh:
+            expected = dssp.process_data(fh.read())
+        arr = dssp.run_streaming(dssp_output, chunk_size=256)
+        assert len(arr) == 499
+        assert arr.to_array().tolist() == expected.to_array().tolist()
+
+    @pytest.mark.parametrize("runner", ["run_streaming", "run"])
+    def test_failure_carries_status_and_stderr(self, dssp_output, runner):
+        dssp = ScriptDSSP(status=3, message="input file is broken")
+        with pytest.raises(AlgorithmError, match="input file is broken") as info:
+            getattr(dssp, runner)(dssp_output)
+        assert info.value.returncode == 3
+        assert info.value.stderr == "input file is broken"
+
+    @pytest.mark.parametrize("runner", ["run_streaming", "run"])
+    def test_timeout_kills_process(self, dssp_output, runner):
+        dssp = ScriptDSSP(delay=30, timeout=0.5)
+        start = time.perf_counter()
+        with pytest.raises(AlgorithmTimeoutError) as info:
+            getattr(dssp, runner)(dssp_output)
+        assert time.perf_counter() - start < 10
+        assert info.value.returncode is None
+
+    def test_overridden_run_is_not_bypassed(self, dssp_output):
+        class FileDSSP(DSSP):
+            def run(self, pdb_file):
+                with open(pdb_file) as fh:
+                    return fh.read()
+
+        dssp = FileDSSP('not-an-executable')
+        expected = dssp.process_data(dssp.run(dssp_output))
+        assert dssp.run_streaming(dssp_output).to_array().tolist() == expected.to_array().tolist()
+
+    def test_interrupt_propagates(self, dssp_output):
+        class InterruptedDSSP(ScriptDSSP):
+            def _parse_chunks(self, chunks, include_only, residue_range):
+                raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            InterruptedDSSP(delay=30, status=3).run_streaming(dssp_output)
@@ -2,8 +2,13 @@ import subprocess
 import importlib
 
 import pytest
+import numpy as np
 
 from struct_draw.algorithms import DSSP, Stride
+from struct_draw.algorithms.base_algorithm import BaseAlgorithm, ResidueRecords, concatenate_residues
+
+LEGACY_DTYPE = [('residue_index', 'i4'), ('insertion_code', 'U1'), ('chain_id', 'U1'),
+                ('AA', 'U1'), ('SS', 'U6'), ('SS_code', 'U1')]
 
 @pytest.fixture(scope='session')
 def make_module():
@@ -47,10 +52,11 @@ class TestShared():
         cls, subcmd = algo_params
         algo = make_algorithm(cls, subcmd, None)
         class _DummyProc:
+            returncode = 0
             def __init__(self, *args, **kwargs):
                         self.args = args
                         self.kwargs = kwargs
-            def communicate(self):
+            def communicate(self, timeout=None):
                         return (communicate_out, "")
 
         if cls is DSSP:
@@ -67,8 +73,32 @@ class TestShared():
             assert kwargs["universal_newlines"] is True
             return _DummyProc()
         
-        module = make_module(cls)
+        # The subprocess is spawned by the shared BaseAlgorithm runner
+        module = make_module(BaseAlgorithm)
         monkeypatch.setattr(module.subprocess, "Popen", _fake_popen, raising=True)
 
         out = algo.run(str(pdb_path))
         assert out == communicate_out
+
+
+class TestResidueRecords:
+    def test_array_round_trip(self):
+        array = np.array([(1, ' ', 'AB', 'M', 'Helix', 'H'), (2, ' ', 'A', 'K', 'Other', '-'),
+                          (3, 'A', 'AB', 'G', 'Strand', 'E')],
+                         dtype=[('residue_index', 'i4'), ('insertion_code', 'U1'), ('chain_id', 'U4'),
+                                ('AA', 'U1'), ('SS', 'U6'), ('SS_code', 'U1')])
+        records = ResidueRecords.from_array(array)
+        assert records.chain_ids.tolist() == ['A', 'AB']
+        assert records.data['chain_code'].dtype == np.uint16
+        assert records.data['chain_code'].tolist() == [1, 0, 1]
+        assert records.to_array().tolist() == array.tolist()
+        assert records.codes_of(['AB', 'C']).tolist() == [1]
+
+    def test_concatenate_merges_dictionaries(self):
+        first = ResidueRecords.from_array(np.array([(1, ' ', 'B', 'M', 'Helix', 'H')], dtype=LEGACY_DTYPE))
+        second = ResidueRecords.from_array(np.array([(2, ' ', 'C', 'K', 'Other', '-'),
+                                                     (3, ' ', 'A', 'G', 'Other', '-')], dtype=LEGACY_DTYPE))
+        records = concatenate_residues([first, second])
+        assert records.chain_ids.tolist() == ['A', 'B', 'C']
+        assert records.chain_id.tolist() == ['B', 'C', 'A']
+        assert len(concatenate_residues([])) == 0
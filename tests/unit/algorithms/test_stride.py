@@ -1,6 +1,7 @@
 import pytest
 
 from struct_draw.algorithms import Stride
+from struct_draw.algorithms.columns import text_to_buffer
 
 
 @pytest.fixture(scope="session")
@@ -55,7 +56,7 @@ class TestStride:
             alg = make_algorithm(Stride, "stride", None)
             body = "\n".join(make_line(*args) for args in lines)
             algorithm_out = body + "\n"
-            arr = alg.process_data(algorithm_out)
+            arr = alg.process_data(algorithm_out).to_array()
             assert len(arr) == expected_len
             assert arr.dtype.names == ("residue_index", "insertion_code", "chain_id", "AA", "SS", "SS_code")
             if expected_len:
@@ -76,7 +77,7 @@ class TestStride:
             alg = make_algorithm(Stride, "stride", ss_custom)
             line = make_line(1, "", "A", "ALA", "H")  # SS_code=H
             # by default H should be translated as 'Helix', but with custom it has to be 'Other'
-            arr = alg.process_data(line + "\n")
+            arr = alg.process_data(line + "\n").to_array()
             assert len(arr) == 1
             assert arr["SS_code"][0] == "H"
             assert arr["SS"][0] == "Other"
@@ -84,7 +85,7 @@ class TestStride:
         def test_process_data_unknown_code_falls_back_to_other(self, make_algorithm, make_line):
             alg = make_algorithm(Stride, "stride", None)  # default table
             line = make_line(2, " ", "A", "G", "X")  # There is no 'X' in deault table
-            arr = alg.process_data(line + "\n")
+            arr = alg.process_data(line + "\n").to_array()
             assert arr["SS_code"][0] == "X"
             assert arr["SS"][0] == "Other"
             
@@ -94,3 +95,51 @@ class TestStride:
             alg = make_algorithm(Stride, "stride", mapping)
             _ = alg.SS_TRANSLATION['H'] 
             assert mapping['H'] == 'Helix'
+            
+        def test_matches_line_by_line_parser(self, make_algorithm, make_line, default_table_stride):
+            """Vectorized ASG parser must give exactly the same array as a plain per-line parse."""
+            from struct_draw.algorithms.stride import AMINO_ACIDS
+            alg = make_algorithm(Stride, "stride", None)
+            rows = [(1, "", "A", "MET", "C"), (27, "A", "A", "LYS", "E"), (-3, "", "B", "HOH", "H"),
+                    (1024, "B", "B", "TRP", "T"), (5, "", "C", "PRO", "G")]
+            lines = ["REM  |---Residue---|    |--Structure--|   |-Phi-|   |-Psi-|  |-Area-|      ~~~~"]
+            lines += [make_line(*args) for args in rows]
+            lines.insert(3, "LOC  AlphaHelix   ALA     1 A      ALA     14 A                         ~~~~")
+            lines[-1] = lines[-1].rstrip()  # lines of different width
+            algorithm_out = "\n".join(lines) + "\n"
+
+            expected = []
+            for line in lines:
+                if not line.startswith("ASG"):
+                    continue
+                resid = line[10:15].replace(" ", "")
+                ins = resid[-1] if not resid[-1].isdigit() else ""
+                index = int(resid[:-1]) if ins else int(resid)
+                expected.append((index, ins, line[9], AMINO_ACIDS.get(line[5:8], 'X'),
+                                 default_table_stride.get(line[24], 'Other'), line[24]))
+            arr = alg.process_data(algorithm_out).to_array()
+            assert arr.tolist() == expected
+
+        def test_parse_stream_matches_process_data(self, make_algorithm, make_line):
+            stride = make_algorithm(Stride, "stride", None)
+            lines = ["REM  header"] + [make_line(i, chain="AB"[i % 2], ss_code="HET"[i % 3]) for i in range(1, 40)]
+            algorithm_out = "\n".join(lines) + "\n"
+            text_lines = algorithm_out.splitlines(keepends=True)
+            chunks = [text_lines[i:i + 6] for i in range(0, len(text_lines), 6)]
+            arr = stride.parse_stream(text_to_buffer("".join(chunk)) for chunk in chunks).to_array()
+            assert arr.tolist() == stride.process_data(algorithm_out).to_array().tolist()
+
+        def test_include_only_skips_other_chains(self, make_algorithm, make_line):
+            stride = make_algorithm(Stride, "stride", None)
+            algorithm_out = "\n".join(make_line(i, chain="AB"[i % 2]) for i in range(1, 30)) + "\n"
+            full = stride.process_data(algorithm_out).to_array()
+            arr = stride.parse_output(algorithm_out, ["B"]).to_array()
+            assert arr.tolist() == full[full['chain_id'] == "B"].tolist()
+
+        def test_residue_range_skips_other_residues(self, make_algorithm, make_line):
+            stride = make_algorithm(Stride, "stride", None)
+            algorithm_out = "\n".join(make_line(i, chain="AB"[i % 2]) for i in range(1, 30)) + "\n"
+            full = stride.process_data(algorithm_out).to_array()
+            arr = stride.process_data(algorithm_out, residue_range=(10, 20)).to_array()
+            expected = full[(full['residue_index'] >= 10) & (full['residue_index'] <= 20)]
+            assert arr.tolist() == expected.tolist()
@@ -0,0 +1,52 @@
+import pytest
+import numpy as np
+
+from struct_draw.algorithms.base_algorithm import RESIDUE_DTYPE
+from struct_draw.plotter.chain_components.color_mods import create_mode
+from struct_draw.structures.pdb_model import Chain
+from struct_draw.structures.readers import ChainBFactors, B_FACTOR_STATS
+
+
+@pytest.fixture(scope='module')
+def chain():
+    rows = [(i, ' ', 0, aa, ss, ss[0]) for i, (aa, ss) in
+            enumerate(zip("MKGXVW", ["Helix", "Strand", "Other", "Helix", "Odd", "Other"]), start=1)]
+    chain = Chain('A', 'dssp', 'model', np.array(rows, dtype=RESIDUE_DTYPE))
+    values = np.array([5.0, 25.0, 45.0, 65.0, 85.0, 95.0, 15.0], dtype=np.float32)
+    offsets = np.array([0, 1, 2, 3, 4, 6, 7])
+    stats = {name: np.array([5.0, 25.0, 45.0, 65.0, 90.0, 15.0]) for name in B_FACTOR_STATS}
+    chain.b_factors = ChainBFactors(values, offsets, stats)
+    chain.table.contacts = {'total': np.array([0, 5, 9, 14, 30, 2], dtype=np.int32),
+                            'interface': np.array([0, 1, 4, 0, 7, 2], dtype=np.int32)}
+    chain.align_seq("MK-GXV--W")
+    return chain
+
+
+@pytest.mark.parametrize(
+    "mode, sub_mode",
+    [
+        pytest.param('structure', 'secondary', id='structure'),
+        pytest.param('aa', 'hydrophilicity', id='hydrophilicity'),
+        pytest.param('aa', 'single_aa', id='single_aa'),
+        pytest.param('b_factor', 'mean', id='b_factor_mean'),
+        pytest.param('b_factor', 'a_fold', id='a_fold'),
+        pytest.param('contacts', 'burial', id='contacts_burial'),
+        pytest.param('contacts', 'interface', id='contacts_interface'),
+    ]
+)
+def test_column_colors_match_per_residue_colors(chain, mode, sub_mode):
+    palette = create_mode(mode, sub_mode)
+    expected = [palette.get_color(residue) for residue in chain.residues]
+    assert palette.get_colors(chain.table).tolist() == expected
+
+
+def test_contact_colors(chain):
+    colors = create_mode('contacts', 'interface').get_colors(chain.table)
+    # Gap columns count no contacts
+    assert colors.tolist() == ['#D9D9D9', '#9ECAE1', '#D9D9D9', '#4292C6', '#D9D9D9', '#08306B',
+                               '#D9D9D9', '#D9D9D9', '#9ECAE1']
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError, match="contacts"):
+        create_mode('depth', 'mean')
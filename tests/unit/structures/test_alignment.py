@@ -0,0 +1,67 @@
+import pytest
+
+from struct_draw.algorithms import DSSP
+from struct_draw.structures import Alignment
+from struct_draw.structures.alignment import ModelBuildError
+
+
+class LineDSSP(DSSP):
+    """DSSP stand-in producing mkdssp-style output from the CA records of a PDB file."""
+
+    def run(self, pdb_file: str) -> str:
+        lines = ["  #  RESIDUE AA STRUCTURE BP1"]
+        with open(pdb_file) as fh:
+            for n, line in enumerate(fh, start=1):
+                if line.startswith("BROKEN"):
+                    raise RuntimeError("mkdssp crashed")
+                lines.append(f"{n:5d}{int(line[22:26]):5d} {line[21]} A  H".ljust(40))
+        return "\n".join(lines) + "\n"
+
+
+def atom_line(chain, res_seq, b_factor):
+    return (f"ATOM  {res_seq:5d}  CA  ALA {chain}{res_seq:>4}    "
+            f"{1.0:8.3f}{2.0:8.3f}{3.0:8.3f}{1.0:6.2f}{b_factor:6.2f}           C  \n")
+
+
+@pytest.fixture
+def alignment_dir(tmp_path):
+    headers = []
+    for i in range(6):
+        (tmp_path / f"m{i}.pdb").write_text("".join(atom_line("A", r, 10.0 * i + r) for r in range(1, 4)))
+        headers.append(f">m{i}|pdb|A\nA-AA\n")
+    (tmp_path / "aln.fasta").write_text("".join(headers))
+    return tmp_path
+
+
+class TestInitModels:
+    @pytest.mark.parametrize("max_workers", [None, 3])
+    def test_order_and_alignment(self, alignment_dir, max_workers):
+        alignment = Alignment(str(alignment_dir / "aln.fasta"), str(alignment_dir), LineDSSP('mkdssp'),
+                              max_workers=max_workers)
+        assert [model.get_chain('A').model_id for model in alignment.models] == [f"m{i}" for i in range(6)]
+        for i, model in enumerate(alignment.models):
+            residues = model.get_chain('A').residues
+            assert [res.secondary_structure for res in residues] == ['Helix', 'gap', 'Helix', 'Helix']
+            assert residues[0].b_factors.tolist() == [10.0 * i + 1]
+
+    def test_failing_model_in_pools(self, alignment_dir):
+        (alignment_dir / "m2.pdb").write_text("BROKEN\n")
+        with pytest.raises(ModelBuildError, match="m2") as info:
+            Alignment(str(alignment_dir / "aln.fasta"), str(alignment_dir), LineDSSP('mkdssp'), max_workers=3)
+        assert info.value.model_key == "m2"
+        assert isinstance(info.value.__cause__, RuntimeError)
+
+    def test_failing_model_keeps_error_type(self, alignment_dir):
+        (alignment_dir / "m2.pdb").write_text("BROKEN\n")
+        with pytest.raises(RuntimeError, match="mkdssp crashed") as info:
+            Alignment(str(alignment_dir / "aln.fasta"), str(alignment_dir), LineDSSP('mkdssp'))
+        assert not isinstance(info.value, ModelBuildError)
+        assert "m2" in "".join(getattr(info.value, '__notes__', ["m2"]))
+
+    @pytest.mark.parametrize("max_workers", [None, 3])
+    def test_missing_chain_raises_value_error(self, alignment_dir, max_workers):
+        with open(alignment_dir / "aln.fasta", "a") as fh:
+            fh.write(">m1|pdb|Z\nAAA\n")
+        with pytest.raises(ValueError, match="chain: Z"):
+            Alignment(str(alignment_dir / "aln.fasta"), str(alignment_dir), LineDSSP('mkdssp'),
+                      max_workers=max_workers)
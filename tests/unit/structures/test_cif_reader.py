@@ -0,0 +1,262 @@
+import bz2
+
+import pytest
+import numpy as np
+
+from struct_draw.compression import InMemoryFile
+from struct_draw.structures.cif_reader import (read_cif_atom_site, read_cif_atoms, read_cif_b_factors, read_cif_coordinates,
+                                               read_cif_plddt, parse_cif_ints, parse_cif_floats)
+
+HEADER = """data_test
+#
+loop_
+_atom_type.symbol
+C
+N
+#
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.label_atom_id
+_atom_site.label_asym_id
+_atom_site.label_seq_id
+_atom_site.pdbx_PDB_ins_code
+_atom_site.B_iso_or_equiv
+"""
+
+
+@pytest.fixture
+def write_cif(tmp_path):
+    def _write(body: str, header: str = HEADER):
+        path = tmp_path / "model.cif"
+        path.write_text(header + body)
+        return str(path)
+    return _write
+
+
+class TestReadCifAtomSite:
+    def test_plain_loop(self, write_cif):
+        path = write_cif("ATOM 1 N A 1 ? 10.50\nATOM 2 CA A 1 ? 11.25\nHETATM 3 O B . ? 5.00\n#\n")
+        columns = read_cif_atom_site(path, ['label_atom_id', 'label_asym_id', 'missing_tag'])
+        assert columns['label_atom_id'].tolist() == [b'N', b'CA', b'O']
+        assert columns['label_asym_id'].tolist() == [b'A', b'A', b'B']
+        assert 'missing_tag' not in columns
+
+    def test_quoted_values_and_comments(self, write_cif):
+        body = ("ATOM 1 \"O5'\" A 1 ? 10.50\n"
+                "ATOM 2 'C 1' A 1 ? 11.25 # trailing comment\n"
+                "ATOM 3 O3' AB 2 ? 12.00\n"
+                "#\n")
+        columns = read_cif_atom_site(write_cif(body), ['label_atom_id', 'label_asym_id', 'B_iso_or_equiv'])
+        assert columns['label_atom_id'].tolist() == [b"O5'", b"C 1", b"O3'"]
+        assert columns['label_asym_id'].tolist() == [b'A', b'A', b'AB']
+        assert columns['B_iso_or_equiv'].tolist() == [b'10.50', b'11.25', b'12.00']
+
+    def test_multi_line_text_field(self, write_cif):
+        body = "ATOM 1\n;N\n;\nA 1 ? 10.50\nATOM 2 CA A 1 ? 11.25\n"
+        columns = read_cif_atom_site(write_cif(body), ['label_atom_id', 'id'])
+        assert columns['label_atom_id'].tolist() == [b'N', b'CA']
+        assert columns['id'].tolist() == [b'1', b'2']
+
+    def test_rows_spread_over_lines(self, write_cif):
+        body = "ATOM 1 N\nA 1 ? 10.50 ATOM 2\nCA A 1 ? 11.25\n"
+        columns = read_cif_atom_site(write_cif(body), ['label_atom_id'])
+        assert columns['label_atom_id'].tolist() == [b'N', b'CA']
+
+    def test_incomplete_row_raises(self, write_cif):
+        with pytest.raises(ValueError):
+            read_cif_atom_site(write_cif("ATOM 1 N A 1 ?\n"), ['label_atom_id'])
+
+    def test_single_row_category(self, write_cif):
+        header = "data_test\n#\n_atom_site.id 1\n_atom_site.label_asym_id A\n_atom_site.B_iso_or_equiv 7.5\n#\n"
+        columns = read_cif_atom_site(write_cif("", header=header), ['label_asym_id', 'B_iso_or_equiv'])
+        assert columns == {'label_asym_id': np.array([b'A']), 'B_iso_or_equiv': np.array([b'7.5'])}
+
+
+class TestParseCifNumbers:
+    def test_floats_match_python(self):
+        raw = [b'10.50', b'-0.020', b'83.82', b'+1.5', b'7', b'.5', b'1e3', b'.', b'?', b'1.2.3', b'-']
+        values, valid = parse_cif_floats(np.array(raw))
+        for token, value, ok in zip(raw, values, valid):
+            try:
+                expected = float(token)
+            except ValueError:
+                assert not ok
+            else:
+                assert ok and value == expected
+
+    def test_ints(self):
+        values, valid = parse_cif_ints(np.array([b'1', b'-12', b'.', b'?', b'3.0']))
+        assert valid.tolist() == [True, True, False, False, False]
+        assert values[:2].tolist() == [1, -12]
+
+
+def test_read_cif_b_factors_groups_residues(write_cif):
+    body = ("ATOM 1 N A 1 ? 10.50\nATOM 2 CA A 1 ? 11.25\nATOM 3 CA A 2 B 9.00\n"
+            "HETATM 4 O A . ? 5.00\nATOM 5 CA AB 1 ? 1.00\n#\n")
+    b_factors = read_cif_b_factors(write_cif(body))
+    positions, found = b_factors.lookup('A', np.array([1, 2, 3]), np.array([ord(' '), ord('B'), ord(' ')]))
+    assert found.tolist() == [True, True, False]
+    assert b_factors.get(positions[0]).tolist() == [10.5, 11.25]
+    assert b_factors.get(positions[1]).tolist() == [9.0]
+    positions, found = b_factors.lookup('AB', np.array([1]), np.array([ord(' ')]))
+    assert found[0] and b_factors.get(positions[0]).tolist() == [1.0]
+
+
+def test_read_cif_b_factors_include_only(write_cif):
+    body = "ATOM 1 N A 1 ? 10.50\nATOM 2 CA B 1 ? 11.25\nATOM 3 CA AB 1 ? 1.00\n#\n"
+    b_factors = read_cif_b_factors(write_cif(body), ['AB', 'C'])
+    assert b_factors.chain_ids.tolist() == ['AB']
+    assert b_factors.values.tolist() == [1.0]
+
+
+def test_read_cif_b_factors_residue_range(write_cif):
+    body = "ATOM 1 N A 1 ? 10.50\nATOM 2 CA A 2 ? 11.25\nATOM 3 CA A 3 ? 1.00\nATOM 4 O A . ? 5.00\n#\n"
+    b_factors = read_cif_b_factors(write_cif(body), residue_range=(2, 3))
+    assert b_factors.values.tolist() == [11.25, 1.0]
+
+
+def test_read_cif_b_factors_from_compressed_file(tmp_path):
+    body = "ATOM 1 N A 1 ? 10.50\nATOM 2 CA A 1 ? 11.25\n#\n"
+    path = tmp_path / "model.cif.bz2"
+    path.write_bytes(bz2.compress((HEADER + body).encode()))
+    b_factors = read_cif_b_factors(str(path))
+    positions, found = b_factors.lookup('A', np.array([1]), np.array([ord(' ')]))
+    assert found[0] and b_factors.get(positions[0]).tolist() == [10.5, 11.25]
+
+
+def test_read_cif_b_factors_from_memory():
+    body = "ATOM 1 N A 1 ? 10.50\nATOM 2 CA A 1 ? 11.25\n#\n"
+    b_factors = read_cif_b_factors(InMemoryFile.from_source(bz2.compress((HEADER + body).encode()), '.cif'))
+    positions, found = b_factors.lookup('A', np.array([1]), np.array([ord(' ')]))
+    assert found[0] and b_factors.get(positions[0]).tolist() == [10.5, 11.25]
+
+
+def test_read_cif_b_factors_prefers_author_ids(write_cif):
+    header = HEADER + "_atom_site.auth_seq_id\n_atom_site.auth_asym_id\n"
+    body = "ATOM 1 N A 1 ? 10.50 15 AA\nATOM 2 CA B 1 ? 11.25 15 A\n#\n"
+    b_factors = read_cif_b_factors(write_cif(body, header), ['AA'])
+    positions, found = b_factors.lookup('AA', np.array([15]), np.array([ord(' ')]))
+    assert b_factors.chain_ids.tolist() == ['AA']
+    assert found[0] and b_factors.get(positions[0]).tolist() == [10.5]
+
+
+def test_read_cif_b_factors_reads_first_model(write_cif):
+    header = HEADER + "_atom_site.pdbx_PDB_model_num\n"
+    body = "ATOM 1 CA A 1 ? 10.50 1\nATOM 2 CA A 2 ? 11.25 1\nATOM 3 CA A 1 ? 99.00 2\n#\n"
+    b_factors = read_cif_b_factors(write_cif(body, header))
+    assert b_factors.values.tolist() == [10.5, 11.25]
+    assert read_cif_plddt(write_cif(body, header)).values.tolist() == [10.5, 11.25]
+
+
+def test_read_cif_coordinates_reads_first_model():
+    header = ("data_test\nloop_\n_atom_site.group_PDB\n_atom_site.label_asym_id\n_atom_site.label_seq_id\n"
+              "_atom_site.Cartn_x\n_atom_site.Cartn_y\n_atom_site.Cartn_z\n_atom_site.pdbx_PDB_model_num\n")
+    body = ("ATOM A 1 1.0 2.0 3.0 1\nATOM A 1 1.5 2.5 3.5 1\nATOM B 4 -1 0 ? 1\nATOM B 5 0 0 0 1\n"
+            "ATOM A 1 9.0 9.0 9.0 2\n#\n")
+    coordinates = read_cif_coordinates(InMemoryFile((header + body).encode(), ".cif"))
+    assert coordinates.chain_ids.tolist() == ["A", "B"]
+    positions, found = coordinates.lookup("A", np.array([1]), np.array([ord(" ")]))
+    assert found[0] and coordinates.get(positions[0]).tolist() == [[1.0, 2.0, 3.0], [1.5, 2.5, 3.5]]
+    # An unknown coordinate drops the atom
+    positions, found = coordinates.lookup("B", np.array([4, 5]), np.array([ord(" "), ord(" ")]))
+    assert found.tolist() == [False, True]
+
+
+def test_read_cif_atoms():
+    header = ("data_test\nloop_\n_atom_site.group_PDB\n_atom_site.label_atom_id\n_atom_site.label_comp_id\n"
+              "_atom_site.label_asym_id\n_atom_site.auth_asym_id\n_atom_site.label_seq_id\n"
+              "_atom_site.pdbx_PDB_ins_code\n_atom_site.Cartn_x\n_atom_site.Cartn_y\n_atom_site.Cartn_z\n"
+              "_atom_site.occupancy\n_atom_site.B_iso_or_equiv\n_atom_site.type_symbol\n"
+              "_atom_site.pdbx_PDB_model_num\n")
+    body = ("ATOM N GLY A X 1 ? 1.0 2.0 3.0 1.0 10.5 N 1\n"
+            "ATOM CA GLY A X 1 ? 1.5 2.5 3.5 0.5 ? C 1\n"
+            "HETATM CA MSE B Y 2 A 0 0 0 1.0 20.0 C 1\n"
+            "ATOM CA GLY A X . ? 0 0 0 1.0 30.0 C 1\n"   # no residue number
+            "ATOM N GLY A X 1 ? 9.0 9.0 9.0 1.0 99.0 N 2\n#\n")
+    atoms = read_cif_atoms(InMemoryFile((header + body).encode(), ".cif"))
+    assert len(atoms) == 3
+    assert atoms.chain_ids[atoms.chain_index].tolist() == ["X", "X", "Y"]
+    assert atoms.residue_index.tolist() == [1, 1, 2]
+    assert atoms.insertion_code.tolist() == [ord(" "), ord(" "), ord("A")]
+    assert atoms.atom_name.tolist() == [b"N", b"CA", b"CA"]
+    assert atoms.residue_name.tolist() == [b"GLY", b"GLY", b"MSE"]
+    assert atoms.element.tolist() == [b"N", b"C", b"C"]
+    assert atoms.is_hetatm.tolist() == [False, False, True]
+    assert atoms.coordinates[1].tolist() == [1.5, 2.5, 3.5]
+    assert atoms.occupancy.tolist() == [1.0, 0.5, 1.0]
+    assert atoms.b_factor[0] == 10.5 and np.isnan(atoms.b_factor[1])
+    # Per-residue features include HETATM records and skip unknown values
+    assert atoms.b_factors().values.tolist() == [10.5, 20.0]
+    assert atoms.plddt().values.tolist() == [20.0]
+
+
+QA_METRIC = """#
+loop_
+_ma_qa_metric.id
+_ma_qa_metric.mode
+_ma_qa_metric.name
+_ma_qa_metric.type
+1 global pLDDT pLDDT
+2 local pLDDT pLDDT
+3 local PAE other
+#
+loop_
+_ma_qa_metric_local.label_asym_id
+_ma_qa_metric_local.label_seq_id
+_ma_qa_metric_local.metric_id
+_ma_qa_metric_local.metric_value
+_ma_qa_metric_local.model_id
+_ma_qa_metric_local.ordinal_id
+A 1 2 91.50 1 1
+A 1 3 0.00 1 2
+A 2 2 42.25 1 3
+B 1 2 70.00 1 4
+#
+"""
+
+POLY_SEQ_SCHEME = """loop_
+_pdbx_poly_seq_scheme.asym_id
+_pdbx_poly_seq_scheme.seq_id
+_pdbx_poly_seq_scheme.pdb_strand_id
+_pdbx_poly_seq_scheme.pdb_seq_num
+_pdbx_poly_seq_scheme.pdb_ins_code
+A 1 X 10 .
+A 2 X 10 A
+#
+"""
+
+
+class TestReadCifPlddt:
+    def test_reads_local_metric_without_atoms(self, write_cif):
+        # Malformed atom records prove the atom site loop is not parsed
+        b_factors = read_cif_plddt(write_cif("ATOM 1 CA\n#\n", QA_METRIC + HEADER))
+        assert b_factors.chain_ids.tolist() == ['A', 'B']
+        assert b_factors.offsets.tolist() == [0, 1, 2, 3]
+        positions, found = b_factors.lookup('A', np.array([1, 2]), np.array([ord(' '), ord(' ')]))
+        assert found.all() and b_factors.values[positions].tolist() == [91.5, 42.25]
+
+    def test_maps_label_ids_to_author_ids(self, write_cif):
+        b_factors = read_cif_plddt(write_cif("ATOM 1 CA\n#\n", POLY_SEQ_SCHEME + QA_METRIC + HEADER), ['X'])
+        positions, found = b_factors.lookup('X', np.array([10, 10]), np.array([ord(' '), ord('A')]))
+        assert found.all() and b_factors.values[positions].tolist() == [91.5, 42.25]
+
+    def test_filters(self, write_cif):
+        b_factors = read_cif_plddt(write_cif("", QA_METRIC + HEADER), ['A'], residue_range=(2, 5))
+        assert b_factors.values.tolist() == [42.25]
+
+    def test_falls_back_to_ca_atoms(self, write_cif):
+        body = ("ATOM 1 N A 1 ? 10.50\nATOM 2 CA A 1 ? 11.25\nATOM 3 CA A 1 ? 12.00\n"
+                "ATOM 4 CA A 2 B 9.00\nATOM 5 O A 2 B 1.00\n#\n")
+        b_factors = read_cif_plddt(write_cif(body))
+        assert b_factors.offsets.tolist() == [0, 1, 2]
+        assert b_factors.values.tolist() == [11.25, 9.0]
+
+    def test_atom_table_serves_only_the_fallback(self, write_cif):
+        body = "ATOM 1 CA A 1 ? 11.25\nATOM 2 CA A 2 B 9.00\n#\n"
+        # Values only the given table has show it is used instead of the file
+        atoms = read_cif_atoms(write_cif(body.replace("11.25", "50.00")))
+        assert read_cif_plddt(write_cif(body), atoms=atoms).values.tolist() == [50.0, 9.0]
+        # The ModelCIF score table wins over the atom B-factors
+        scored = write_cif(body, QA_METRIC + HEADER)
+        assert read_cif_plddt(scored, ['A'], atoms=atoms).values.tolist() == [91.5, 42.25]
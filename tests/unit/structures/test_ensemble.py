@@ -0,0 +1,116 @@
+import gzip
+
+import pytest
+
+import numpy as np
+
+from struct_draw.algorithms.base_algorithm import BaseAlgorithm
+from struct_draw.structures import Ensemble
+from struct_draw.structures.ensemble import MISSING_SS_CODE
+
+
+class FakeAlgorithm(BaseAlgorithm):
+    """
+    Reads the SS code of every residue from the element column of its CA atom.
+    """
+    def __init__(self):
+        super().__init__('fake_algo', {'H': 'Helix', 'G': 'Helix', 'E': 'Strand'})
+        self.runs = 0
+
+    def run(self, pdb_file: str) -> str:
+        self.runs += 1
+        with open(pdb_file) as fh:
+            return "".join(f"{line[21]} {line[22:26].strip()} {line[77]}\n"
+                           for line in fh if line.startswith("ATOM"))
+
+    def process_data(self, algorithm_out: str) -> np.ndarray:
+        rows = [line.split(" ") for line in algorithm_out.splitlines()]
+        return np.array([(chain, int(number), " ", "A", self.SS_TRANSLATION.get(code, "Other"), code)
+                         for chain, number, code in rows],
+                        dtype=[("chain_id", "U1"), ("residue_index", "i4"), ("insertion_code", "U1"),
+                               ("AA", "U1"), ("SS", "U6"), ("SS_code", "U1")])
+
+
+def atom_line(chain, res_seq, ss_code):
+    return (f"ATOM  {res_seq:5d}  CA  ALA {chain}{res_seq:>4}    "
+            f"{1.0:8.3f}{2.0:8.3f}{3.0:8.3f}{1.0:6.2f}{10.0:6.2f}           {ss_code} ")
+
+
+# SS codes of chain A (residues 1-4) and B (residue 1) in every model; '.' is a missing residue
+MODELS = [("HHEE", "H"),
+          ("HGE.", "E"),
+          ("HTTE", "E")]
+
+
+@pytest.fixture
+def ensemble_file(tmp_path):
+    lines = ["HEADER    TEST"]
+    for number, (chain_a, chain_b) in enumerate(MODELS, start=1):
+        lines.append(f"MODEL     {number:>4}")
+        lines += [atom_line("A", i, code) for i, code in enumerate(chain_a, start=1) if code != "."]
+        lines.append(atom_line("B", 1, chain_b))
+        lines.append("ENDMDL")
+    path = tmp_path / "ensemble.pdb"
+    path.write_text("\n".join(lines + ["END"]) + "\n")
+    return path
+
+
+class TestEnsemble:
+    def test_ss_matrix(self, ensemble_file):
+        algorithm = FakeAlgorithm()
+        ensemble = Ensemble(algorithm, str(ensemble_file))
+        assert algorithm.runs == len(MODELS)
+        assert len(ensemble) == len(MODELS)
+        assert ensemble.get_chain_ids() == ["A", "B"]
+        assert ensemble.ss_codes.dtype == np.uint8
+        expected = [[ord(code) if code != "." else MISSING_SS_CODE for code in chain_a + chain_b]
+                    for chain_a, chain_b in MODELS]
+        assert ensemble.ss_codes.tolist() == expected
+
+    def test_precomputed_outputs_match_runs(self, ensemble_file, tmp_path):
+        gz_file = tmp_path / "ensemble.pdb.gz"
+        gz_file.write_bytes(gzip.compress(ensemble_file.read_bytes()))
+        algorithm = FakeAlgorithm()
+        outputs = ("".join(f"A {i} {code}\n" for i, code in enumerate(chain_a, start=1) if code != ".")
+                   + f"B 1 {chain_b}\n" for chain_a, chain_b in MODELS)
+        precomputed = Ensemble(algorithm, algorithm_outs=outputs)
+        streamed = Ensemble(algorithm, str(gz_file))
+        assert precomputed.ss_codes.tolist() == streamed.ss_codes.tolist()
+
+    def test_include_only_and_residue_range(self, ensemble_file):
+        ensemble = Ensemble(FakeAlgorithm(), str(ensemble_file), include_only=["A"], residue_range=(2, 3))
+        assert ensemble.get_chain_ids() == ["A"]
+        assert ensemble.ss_codes.tolist() == [[ord("H"), ord("E")], [ord("G"), ord("E")], [ord("T"), ord("T")]]
+
+    def test_model_chain(self, ensemble_file):
+        ensemble = Ensemble(FakeAlgorithm(), str(ensemble_file))
+        chain = ensemble.model_chain(1, "A")
+        assert chain.model_id == "ensemble/2"
+        assert [residue.ss_code for residue in chain.residues] == ["H", "G", "E", ""]
+        assert [residue.secondary_structure for residue in chain.residues] == ["Helix", "Helix", "Strand", "gap"]
+        assert [c.model_id for c in ensemble.model_chains("B")] == ["ensemble/1", "ensemble/2", "ensemble/3"]
+
+    def test_ss_frequency(self, ensemble_file):
+        ensemble = Ensemble(FakeAlgorithm(), str(ensemble_file))
+        labels, frequency = ensemble.ss_frequency("A")
+        assert labels.tolist() == ["Helix", "Other", "Strand", "gap"]
+        np.testing.assert_allclose(frequency.sum(axis=0), 1.0)
+        np.testing.assert_allclose(frequency[0], [1.0, 2 / 3, 0.0, 0.0])
+        np.testing.assert_allclose(frequency[3], [0.0, 0.0, 0.0, 1 / 3])
+
+    def test_consensus_chain(self, ensemble_file):
+        ensemble = Ensemble(FakeAlgorithm(), str(ensemble_file))
+        chain = ensemble.consensus_chain("A")
+        assert chain.model_id == "ensemble/consensus"
+        assert [residue.secondary_structure for residue in chain.residues] == ["Helix", "Helix", "Strand", "Strand"]
+        assert [residue.ss_code for residue in chain.residues] == ["H", "G", "E", "E"]
+        np.testing.assert_allclose(chain.table.b_factor_stat("mean"), [100.0, 200 / 3, 200 / 3, 200 / 3], rtol=1e-6)
+
+    def test_unknown_chain(self, ensemble_file):
+        ensemble = Ensemble(FakeAlgorithm(), str(ensemble_file))
+        with pytest.raises(ValueError):
+            ensemble.consensus_chain("Z")
+
+    def test_requires_input(self):
+        with pytest.raises(ValueError):
+            Ensemble(FakeAlgorithm())
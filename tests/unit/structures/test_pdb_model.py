@@ -1,9 +1,14 @@
+import asyncio
+import io
+
 import pytest
 
 import numpy as np
 
 from struct_draw.algorithms.base_algorithm import BaseAlgorithm
+from struct_draw.compression import InMemoryFile
 from struct_draw.structures import PDB, PDBx, BaseModel
+from struct_draw.structures.readers import group_by_residue
 
 class TestShared:
     class DummyModel(BaseModel):
@@ -61,4 +66,185 @@ class TestShared:
         
         assert all([chain.algorithm == 'fake_algo' for chain in chains.values()])
         assert all([chain.model_id == 'fake_file' for chain in chains.values()])
-        assert set(chains.keys()) == ref_key_set            
\ No newline at end of file
+        assert set(chains.keys()) == ref_key_set            
+
+    def test_create_async(self, fake_algorithm_rows):
+        fake_algorithm = self.FakeAlgorithm()
+
+        async def run_async(pdb_file, timeout=None):
+            await asyncio.sleep(0)
+            return fake_algorithm_rows
+        fake_algorithm.run_async = run_async
+
+        async def main():
+            return await asyncio.gather(*(self.DummyModel.create_async(fake_algorithm, 'fake_file', include_only=["A"])
+                                          for _ in range(3)))
+
+        models = asyncio.run(main())
+        assert all(set(model.get_chain_list().keys()) == {"A"} for model in models)
+
+    def test_chain_grouping_keeps_residue_order(self, fake_algorithm_rows):
+        rows = fake_algorithm_rows + [
+            dict(chain_id="A", residue_index=3, insertion_code=" ", AA="K", SS="Strand", SS_code="E"),
+            dict(chain_id="B", residue_index=2, insertion_code=" ", AA="W", SS="Other", SS_code="-"),
+        ]
+        model = self.DummyModel(algorithm=self.FakeAlgorithm(), algorithm_out=rows, pdb_file='fake_file')
+        chains = model.get_chain_list()
+
+        assert list(chains.keys()) == ["A", "B"]
+        assert chains["A"].dssp_data['residue_index'].tolist() == [1, 2, 3]
+        assert chains["B"].dssp_data['AA'].tolist() == ["G", "W"]
+        # Every chain is a view into one shared sorted array
+        assert np.shares_memory(chains["A"].dssp_data, chains["B"].dssp_data.base)
+
+    def test_lazy_chains(self, fake_algorithm_rows):
+        model = self.DummyModel(algorithm=self.FakeAlgorithm(), algorithm_out=fake_algorithm_rows,
+                                pdb_file='fake_file', lazy=True)
+        chains = model.get_chain_list()
+
+        assert len(chains) == 2 and "A" in chains and "C" not in chains
+        assert list(chains.materialized()) == []
+        b_factors = group_by_residue(np.array(["A", "B"]), np.array([0, 0, 1]), np.array([1, 2, 1]),
+                                     np.full(3, ord(' '), dtype=np.uint8), np.array([10.0, 20.0, 30.0]))
+        model._attach_b_factors(b_factors)
+        assert list(chains.materialized()) == []
+
+        chain = model.get_chain("B")
+        assert [c.chain_id for c in chains.materialized()] == ["B"]
+        assert chain.residues[0].b_factors.tolist() == [30.0]
+        assert model.get_chain("B") is chain
+        with pytest.raises(ValueError):
+            model.get_chain("C")
+
+    def test_residue_range(self, fake_algorithm_rows):
+        model = self.DummyModel(algorithm=self.FakeAlgorithm(), algorithm_out=fake_algorithm_rows,
+                                pdb_file='fake_file', residue_range=(2, 10))
+        chains = model.get_chain_list()
+        assert list(chains.keys()) == ["A"]
+        assert chains["A"].dssp_data['residue_index'].tolist() == [2]
+
+    def test_multi_character_chain_ids(self, fake_algorithm_rows):
+        rows = fake_algorithm_rows + [
+            dict(chain_id="AB", residue_index=1, insertion_code=" ", AA="K", SS="Strand", SS_code="E"),
+            dict(chain_id="A", residue_index=3, insertion_code=" ", AA="W", SS="Other", SS_code="-"),
+        ]
+        model = self.DummyModel(algorithm=self.FakeAlgorithm(), algorithm_out=rows, pdb_file='fake_file',
+                                include_only=["A", "AB"])
+        chains = model.get_chain_list()
+
+        assert list(chains.keys()) == ["A", "AB"]
+        assert all(type(chain_id) is str for chain_id in chains)
+        assert chains["A"].dssp_data['residue_index'].tolist() == [1, 2, 3]
+        assert model.get_chain("AB").dssp_data['AA'].tolist() == ["K"]
+
+    @pytest.mark.parametrize("source", [
+        pytest.param(b"ATOM\n", id='bytes'),
+        pytest.param(io.BytesIO(b"ATOM\n"), id='file'),
+    ])
+    def test_in_memory_input(self, fake_algorithm_rows, source):
+        model = self.DummyModel(algorithm=self.FakeAlgorithm(), algorithm_out=fake_algorithm_rows,
+                                pdb_file=source)
+        assert isinstance(model._pdb_file, InMemoryFile)
+        assert bytes(model._pdb_file.data) == b"ATOM\n"
+        assert model.get_chain("A").model_id is None
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_snapshot_round_trip(self, tmp_path, fake_algorithm_rows, lazy):
+        model = self.DummyModel(algorithm=self.FakeAlgorithm(), algorithm_out=fake_algorithm_rows,
+                                pdb_file='fake_file', residue_range=(1, 5))
+        b_factors = group_by_residue(np.array(["A", "B"]), np.array([0, 0, 0, 1]), np.array([1, 1, 2, 1]),
+                                     np.full(4, ord(' '), dtype=np.uint8), np.array([10.0, 12.0, 20.0, 30.0]))
+        model._attach_b_factors(b_factors)
+        model.get_chain("A").align_seq("M-E")
+        model._lazy = lazy
+        path = tmp_path / "model.npz"
+        model.save(str(path))
+
+        loaded = BaseModel.load(str(path))
+        assert type(loaded) is self.DummyModel
+        assert loaded._residue_range == (1, 5)
+        assert list(loaded.get_chain_list().materialized()) == ([] if lazy else list(loaded.get_chain_list().values()))
+        assert list(loaded.get_chain_list().keys()) == ["A", "B"]
+        for chain_id in ("A", "B"):
+            chain, restored = model.get_chain(chain_id), loaded.get_chain(chain_id)
+            assert restored.algorithm == 'fake_algo' and restored.model_id == 'fake_file'
+            assert restored.dssp_data.tolist() == chain.dssp_data.tolist()
+            assert restored.column_to_residue.tolist() == chain.column_to_residue.tolist()
+            assert restored.residue_to_column.tolist() == chain.residue_to_column.tolist()
+            assert ([repr(residue) for residue in restored.residues]
+                    == [repr(residue) for residue in chain.residues])
+            assert ([residue.b_factors.tolist() for residue in restored.residues]
+                    == [residue.b_factors.tolist() for residue in chain.residues])
+        # Arrays are read-only views of the mapped file
+        assert not loaded.get_chain("A").table.ss.flags.writeable
+
+    def test_snapshot_of_path_input(self, tmp_path, fake_algorithm_rows):
+        pdb_path = tmp_path / "fake_file.pdb"
+        model = self.DummyModel(algorithm=self.FakeAlgorithm(), algorithm_out=fake_algorithm_rows,
+                                pdb_file=pdb_path)
+        model.save(tmp_path / "model.npz")
+        loaded = BaseModel.load(tmp_path / "model.npz")
+        assert loaded._pdb_file == str(pdb_path)
+        assert loaded.get_chain("A").model_id == model.get_chain("A").model_id
+
+    def test_load_rejects_other_files(self, tmp_path):
+        path = tmp_path / "arrays.npz"
+        np.savez(path, x=np.arange(3))
+        with pytest.raises(ValueError):
+            BaseModel.load(str(path))
+
+
+class TestContacts:
+    ATOMS = [("A", 1, 0.0, 0.0), ("A", 1, 1.0, 0.0), ("A", 2, 4.0, 0.0), ("B", 1, 8.0, 0.0),
+             ("C", 1, 8.0, 3.0)]  # chain C has no algorithm records but still counts
+
+    @pytest.fixture
+    def pdb_content(self):
+        lines = [f"ATOM  {serial:5d}  CA  ALA {chain}{res_seq:4d}    {x:8.3f}{y:8.3f}{0.0:8.3f}  1.00 10.00"
+                 for serial, (chain, res_seq, x, y) in enumerate(self.ATOMS, start=1)]
+        return ("\n".join(lines) + "\nEND\n").encode()
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_counts_attached_to_chains(self, pdb_content, fake_algorithm_rows, lazy):
+        model = PDB(TestShared.FakeAlgorithm(), pdb_file=pdb_content, algorithm_out=fake_algorithm_rows, lazy=lazy)
+        contacts = model.compute_contacts(radius=4.5)
+        assert len(contacts.pairs) == 3
+        chain_a, chain_b = model.get_chain("A"), model.get_chain("B")
+        assert chain_a.table.contact_count('total').tolist() == [1, 2]
+        assert chain_a.table.contact_count('interface').tolist() == [0, 1]
+        assert [residue.contact_count('interface') for residue in chain_b.residues] == [2]
+        chain_a.align_seq("-M-E")
+        assert chain_a.table.contact_count('total').tolist() == [0, 1, 0, 2]
+
+    @pytest.mark.parametrize("plddt", [False, True])
+    def test_b_factors_without_atom_table(self, monkeypatch, pdb_content, fake_algorithm_rows, plddt):
+        from struct_draw.structures import pdb_model
+        monkeypatch.setattr(pdb_model, "read_pdb_atoms", lambda pdb_file: pytest.fail("atom table read"))
+        model = PDB(TestShared.FakeAlgorithm(), pdb_file=pdb_content, algorithm_out=fake_algorithm_rows,
+                    plddt=plddt)
+        assert model._atoms is None
+        assert model.get_chain("A").b_factors.stats['mean'].tolist() == [10.0, 10.0]
+
+    def test_neighbor_index(self, pdb_content, fake_algorithm_rows):
+        model = PDB(TestShared.FakeAlgorithm(), pdb_file=pdb_content, algorithm_out=fake_algorithm_rows)
+        offsets, atoms = model.neighbor_index(5.0).query(np.array([[8.0, 0.0, 0.0]]), 5.0)
+        assert atoms.tolist() == [2, 3, 4]
+        assert model.coordinates.atom_residue[atoms].tolist() == [1, 2, 3]
+
+    def test_snapshot_keeps_counts(self, tmp_path, pdb_content, fake_algorithm_rows):
+        model = PDB(TestShared.FakeAlgorithm(), pdb_file=pdb_content, algorithm_out=fake_algorithm_rows)
+        model.compute_contacts()
+        model.save(str(tmp_path / "model.npz"))
+        loaded = BaseModel.load(str(tmp_path / "model.npz"))
+        assert loaded.get_chain("A").table.contact_count('total').tolist() == [1, 2]
+
+    def test_without_structure_file(self, fake_algorithm_rows):
+        model = TestShared.DummyModel(algorithm=TestShared.FakeAlgorithm(), algorithm_out=fake_algorithm_rows)
+        with pytest.raises(ValueError, match="structure file"):
+            model.compute_contacts()
+
+    def test_model_without_atom_reader(self, pdb_content, fake_algorithm_rows):
+        model = TestShared.DummyModel(algorithm=TestShared.FakeAlgorithm(), pdb_file=pdb_content,
+                                      algorithm_out=fake_algorithm_rows)
+        with pytest.raises(TypeError, match="DummyModel"):
+            model.compute_contacts()
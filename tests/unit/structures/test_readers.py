@@ -0,0 +1,313 @@
+import gzip
+import re
+from collections import defaultdict
+
+import pytest
+import numpy as np
+
+from struct_draw.compression import InMemoryFile
+from struct_draw.structures.readers import (ATOM_FEATURE_COLUMNS, chain_b_factors, iter_file_chunks,
+                                            iter_pdb_models, read_pdb_atoms, read_pdb_b_factors, read_pdb_backbone,
+                                            read_pdb_coordinates, read_pdb_plddt)
+
+
+def atom_line(serial, chain, res_seq, b_factor, ins=" ", record="ATOM  "):
+    return (f"{record}{serial:5d}  CA  ALA {chain}{res_seq:>4}{ins}   "
+            f"{1.0:8.3f}{2.0:8.3f}{3.0:8.3f}{1.0:6.2f}{b_factor:>6}           C  ")
+
+
+@pytest.fixture
+def pdb_text():
+    lines = ["HEADER    TEST",
+             atom_line(1, "A", 1, " 10.50"),
+             atom_line(2, "A", 1, " 11.25"),
+             atom_line(3, "A", 2, "  9.00", ins="A"),
+             atom_line(4, "A", -3, "  9.00"),           # non-digit resSeq is skipped
+             atom_line(5, "A", 3, " -1.00"),            # malformed B-factor is skipped
+             atom_line(6, "B", 1, "100.00"),
+             atom_line(7, " ", 7, "  5.50"),
+             atom_line(8, "A", 1, "  1.00", record="HETATM"),
+             atom_line(9, "A", 1, " 12.75"),
+             "TER",
+             "END"]
+    return "\n".join(lines) + "\n"
+
+
+@pytest.fixture
+def ensemble_text():
+    models = []
+    for model in range(1, 4):
+        models += [f"MODEL     {model:>4}",
+                   atom_line(1, "A", 1, f"{model:6.2f}"),
+                   atom_line(2, "A", 2, f"{model:6.2f}"),
+                   "ENDMDL"]
+    return "\n".join(["HEADER    TEST", "CRYST1"] + models + ["END"]) + "\n"
+
+
+def legacy_b_factors(path):
+    bf_raw = defaultdict(list)
+    b_pattern = re.compile(r'^\d+\.\d{2}$')
+    with open(path, 'r') as fh:
+        for line in fh:
+            if not line.startswith('ATOM'):
+                continue
+            seq_str = line[22:26].strip()
+            if not seq_str.isdigit():
+                continue
+            b_str = line[60:66].strip()
+            if not b_pattern.match(b_str):
+                continue
+            bf_raw[(line[21].strip(), int(seq_str), line[26].strip() or ' ')].append(float(b_str))
+    return bf_raw
+
+
+class TestReadPdbBFactors:
+    @pytest.mark.parametrize("newline", ["\n", "\r\n"])
+    @pytest.mark.parametrize("fixed_width", [False, True])
+    def test_matches_line_by_line_reader(self, tmp_path, pdb_text, newline, fixed_width):
+        if fixed_width:
+            pdb_text = "".join(line.ljust(80) + "\n" for line in pdb_text.splitlines())
+        path = tmp_path / "model.pdb"
+        path.write_bytes(pdb_text.replace("\n", newline).encode())
+        b_factors = read_pdb_b_factors(str(path))
+        expected = legacy_b_factors(path)
+
+        assert len(b_factors.keys) == len(expected)
+        for (chain, res_seq, ins), b_values in expected.items():
+            positions, found = b_factors.lookup(chain, np.array([res_seq]), np.array([ord(ins)]))
+            assert found[0]
+            assert b_factors.get(positions[0]).tolist() == b_values
+
+    def test_gzip_matches_plain(self, tmp_path, pdb_text):
+        plain = tmp_path / "model.pdb"
+        plain.write_text(pdb_text)
+        packed = tmp_path / "model.pdb.gz"
+        packed.write_bytes(gzip.compress(pdb_text.encode()))
+        expected, b_factors = read_pdb_b_factors(str(plain)), read_pdb_b_factors(str(packed))
+        assert b_factors.keys.tolist() == expected.keys.tolist()
+        assert b_factors.values.tolist() == expected.values.tolist()
+
+    def test_in_memory_matches_file(self, tmp_path, pdb_text):
+        path = tmp_path / "model.pdb"
+        path.write_text(pdb_text)
+        expected = read_pdb_b_factors(str(path))
+        b_factors = read_pdb_b_factors(InMemoryFile(memoryview(pdb_text.encode())))
+        assert b_factors.keys.tolist() == expected.keys.tolist()
+        assert b_factors.values.tolist() == expected.values.tolist()
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.pdb"
+        path.write_bytes(b"")
+        b_factors = read_pdb_b_factors(str(path))
+        assert len(b_factors.keys) == 0 and len(b_factors.values) == 0
+        assert b_factors.offsets.tolist() == [0]
+
+    @pytest.mark.parametrize(
+        "include_only, chain_ids",
+        [
+            pytest.param(["B"], ["B"], id='one_chain'),
+            pytest.param(["A", "", "Z"], ["", "A"], id='blank_chain_and_missing_chain'),
+            pytest.param([], [], id='no_chain'),
+        ]
+    )
+    def test_include_only(self, tmp_path, pdb_text, include_only, chain_ids):
+        path = tmp_path / "model.pdb"
+        path.write_text(pdb_text)
+        full = read_pdb_b_factors(str(path))
+        b_factors = read_pdb_b_factors(str(path), include_only)
+        assert b_factors.chain_ids.tolist() == chain_ids
+        for chain in chain_ids:
+            positions, found = b_factors.lookup(chain, np.array([1, 2, 7]), np.array([ord(' '), ord('A'), ord(' ')]))
+            full_positions, full_found = full.lookup(chain, np.array([1, 2, 7]), np.array([ord(' '), ord('A'), ord(' ')]))
+            assert found.tolist() == full_found.tolist()
+            assert all(b_factors.get(p).tolist() == full.get(q).tolist()
+                       for p, q in zip(positions[found], full_positions[full_found]))
+
+    def test_residue_range(self, tmp_path, pdb_text):
+        path = tmp_path / "model.pdb"
+        path.write_text(pdb_text)
+        b_factors = read_pdb_b_factors(str(path), ["A", "B"], residue_range=(2, 5))
+        positions, found = b_factors.lookup("A", np.array([1, 2]), np.array([ord(' '), ord('A')]))
+        assert found.tolist() == [False, True]
+        assert b_factors.get(positions[1]).tolist() == [9.0]
+        assert b_factors.chain_ids.tolist() == ["A"]
+
+    def test_multi_model_reads_first_model(self, tmp_path, ensemble_text):
+        path = tmp_path / "ensemble.pdb"
+        path.write_text(ensemble_text)
+        b_factors = read_pdb_b_factors(str(path))
+        assert len(b_factors.keys) == 2
+        assert b_factors.values.tolist() == [1.0, 1.0]
+
+
+def test_read_pdb_plddt_reads_first_ca_per_residue(tmp_path):
+    lines = [atom_line(1, "A", 1, " 50.00").replace(" CA ", " N  "),
+             atom_line(2, "A", 1, " 91.25"),
+             atom_line(3, "A", 1, " 80.00"),
+             atom_line(4, "A", 2, " 42.50", ins="B"),
+             atom_line(5, "B", 1, " 70.00")]
+    path = tmp_path / "model.pdb"
+    path.write_text("\n".join(lines) + "\n")
+    b_factors = read_pdb_plddt(str(path), ["A"])
+    assert b_factors.offsets.tolist() == [0, 1, 2]
+    assert b_factors.values.tolist() == [91.25, 42.5]
+
+
+def test_read_pdb_backbone(tmp_path):
+    def record(name, res_name, res_seq, x, alt=" ", kind="ATOM  "):
+        return (f"{kind}    1 {name}{alt}{res_name} A{res_seq:4d}    "
+                f"{x:8.3f}{1.0:8.3f}{-2.5:8.3f}  1.00 10.00           C  ")
+    lines = [record(name, "GLY", 1, x) for name, x in ((" N  ", 1), (" CA ", 2), (" C  ", 3), (" O  ", 4))]
+    # Alternate locations keep the first one; HETATM residues count
+    lines += [record(" N  ", "MSE", 2, 5, "A", "HETATM"), record(" N  ", "MSE", 2, 50, "B", "HETATM")]
+    lines += [record(name, "MSE", 2, x, " ", "HETATM") for name, x in ((" CA ", 6), (" C  ", 7), (" O  ", 8))]
+    # No O atom
+    lines += [record(name, "ALA", 3, x) for name, x in ((" N  ", 9), (" CA ", 10), (" C  ", 11))]
+    path = tmp_path / "model.pdb"
+    path.write_text("\n".join(lines + ["HETATM    9  O   HOH A 100       0.000   0.000   0.000"]) + "\n")
+    backbone = read_pdb_backbone(str(path))
+    assert backbone.chain_ids.tolist() == ["A"]
+    assert backbone.residue_index.tolist() == [1, 2]
+    assert backbone.residue_name.tolist() == [b"GLY", b"MSE"]
+    assert backbone.coordinates[:, :, 0].tolist() == [[1, 2, 3, 4], [5, 6, 7, 8]]
+    assert backbone.coordinates[0, 0].tolist() == [1.0, 1.0, -2.5]
+
+
+def test_read_pdb_coordinates(pdb_text, ensemble_text):
+    coordinates = read_pdb_coordinates(InMemoryFile(pdb_text.encode(), ".pdb"))
+    assert coordinates.chain_ids.tolist() == ["", "A", "B"]
+    # HETATM records are left out, like in read_pdb_b_factors; a malformed B-factor does not matter
+    positions, found = coordinates.lookup("A", np.array([1, 2, 3]), np.array([ord(" "), ord("A"), ord(" ")]))
+    assert found.all()
+    assert coordinates.get(positions[0]).tolist() == [[1.0, 2.0, 3.0]] * 3
+    assert coordinates.values.dtype == np.float32
+    assert np.diff(coordinates.offsets).sum() == len(coordinates.atom_residue) == 7
+    assert len(read_pdb_coordinates(InMemoryFile(ensemble_text.encode(), ".pdb")).values) == 2
+
+
+class TestReadPdbAtoms:
+    def test_columns(self, pdb_text):
+        atoms = read_pdb_atoms(InMemoryFile(pdb_text.encode(), ".pdb"))
+        # The non-digit resSeq is dropped, the HETATM record is kept and flagged
+        assert len(atoms) == 8
+        assert atoms.chain_ids[atoms.chain_index].tolist() == ["A", "A", "A", "A", "B", "", "A", "A"]
+        assert atoms.residue_index.tolist() == [1, 1, 2, 3, 1, 7, 1, 1]
+        assert atoms.insertion_code.tolist() == [ord(" "), ord(" "), ord("A")] + [ord(" ")] * 5
+        assert atoms.is_hetatm.tolist() == [False] * 6 + [True, False]
+        assert set(atoms.atom_name.tolist()) == {b"CA"}
+        assert set(atoms.residue_name.tolist()) == {b"ALA"}
+        assert set(atoms.element.tolist()) == {b"C"}
+        assert atoms.occupancy.tolist() == [1.0] * 8
+        assert atoms.coordinates.dtype == np.float32 and atoms.coordinates[0].tolist() == [1.0, 2.0, 3.0]
+        # A malformed B-factor is NaN, not an error
+        assert np.isnan(atoms.b_factor[3]) and atoms.b_factor[0] == 10.5
+
+    def test_features_match_dedicated_readers(self, tmp_path, pdb_text):
+        path = tmp_path / "model.pdb"
+        path.write_text(pdb_text)
+        atoms = read_pdb_atoms(str(path))
+        for derived, read in ((atoms.b_factors(["A"]), read_pdb_b_factors(str(path), ["A"])),
+                              (atoms.plddt(), read_pdb_plddt(str(path))),
+                              (atoms.residue_coordinates(), read_pdb_coordinates(str(path)))):
+            assert derived.chain_ids.tolist() == read.chain_ids.tolist()
+            assert derived.keys.tolist() == read.keys.tolist()
+            assert derived.values.tolist() == read.values.tolist()
+
+    def test_columns_decoded_on_demand(self, pdb_text):
+        source = InMemoryFile(pdb_text.encode(), ".pdb")
+        atoms = read_pdb_atoms(source)
+        rows = np.flatnonzero(atoms.select(["A"]))
+        # Per-residue features decode only the selected rows and keep nothing
+        assert atoms.b_factors(["A"]).values.tolist() == [10.5, 11.25, 12.75, 9.0]
+        assert not atoms._decoded
+        full = read_pdb_atoms(source)
+        for name in ATOM_FEATURE_COLUMNS:
+            np.testing.assert_array_equal(atoms.values(name, rows), full.column(name)[rows])
+        assert atoms.coordinates is atoms.coordinates and list(atoms._decoded) == ["coordinates"]
+
+    def test_occupancies_and_blank_fields(self):
+        line = atom_line(1, "A", 1, " 10.00")
+        text = line[:54] + "  0.50" + line[60:] + "\n" + line[:54] + "\n"  # second line ends before occupancy
+        atoms = read_pdb_atoms(InMemoryFile(text.encode(), ".pdb"))
+        assert atoms.occupancy[0] == 0.5 and np.isnan(atoms.occupancy[1]) and np.isnan(atoms.b_factor[1])
+        assert atoms.occupancies().values.tolist() == [0.5]
+
+    def test_multi_model_reads_first_model(self, ensemble_text):
+        atoms = read_pdb_atoms(InMemoryFile(ensemble_text.encode(), ".pdb"))
+        assert atoms.b_factor.tolist() == [1.0, 1.0]
+
+
+class TestIterPdbModels:
+    @pytest.mark.parametrize("chunk_size", [1 << 20, 90, 7])
+    @pytest.mark.parametrize("compressed", [False, True])
+    def test_one_buffer_per_model(self, tmp_path, ensemble_text, chunk_size, compressed):
+        path = tmp_path / "ensemble.pdb"
+        path.write_bytes(gzip.compress(ensemble_text.encode()) if compressed else ensemble_text.encode())
+        models = [model.tobytes().decode() for model in iter_pdb_models(str(path), chunk_size)]
+        assert len(models) == 3
+        for number, model in enumerate(models, start=1):
+            lines = model.splitlines()
+            assert lines[:3] == ["HEADER    TEST", "CRYST1", f"MODEL     {number:>4}"]
+            assert lines[-1] == "ENDMDL"
+            assert all(line[60:66] == f"{number:6.2f}" for line in lines if line.startswith("ATOM"))
+
+    def test_model_without_endmdl(self, tmp_path, ensemble_text):
+        path = tmp_path / "ensemble.pdb"
+        path.write_text(ensemble_text.replace("ENDMDL\n", ""))
+        models = [model.tobytes().decode() for model in iter_pdb_models(str(path))]
+        assert [model.count("ATOM") for model in models] == [2, 2, 2]
+
+    def test_single_model_file(self, tmp_path, pdb_text):
+        path = tmp_path / "model.pdb"
+        path.write_text(pdb_text)
+        assert [model.tobytes().decode() for model in iter_pdb_models(str(path))] == [pdb_text]
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_iter_file_chunks_keeps_whole_lines(tmp_path, pdb_text, compressed):
+    path = tmp_path / "model.pdb"
+    path.write_bytes(gzip.compress(pdb_text.encode()) if compressed else pdb_text.encode())
+    chunks = [chunk.tobytes() for chunk in iter_file_chunks(str(path), chunk_size=100)]
+    assert b"".join(chunks) == pdb_text.encode()
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+
+
+class TestChainBFactors:
+    @pytest.fixture
+    def b_factors(self, tmp_path, pdb_text):
+        path = tmp_path / "model.pdb"
+        path.write_text(pdb_text)
+        return read_pdb_b_factors(str(path))
+
+    def lookup_chain_a(self, b_factors):
+        # Residue 5 has no atoms and stays empty
+        return b_factors.lookup('A', np.array([1, 5, 2]), np.array([ord(' '), ord(' '), ord('A')]))
+
+    def test_rows_and_stats(self, b_factors):
+        chain = chain_b_factors(b_factors, *self.lookup_chain_a(b_factors))
+        expected = [[10.5, 11.25, 12.75], [], [9.0]]
+        assert chain.offsets.tolist() == [0, 3, 3, 4]
+        for row, values in enumerate(expected):
+            assert chain.get(row).tolist() == values
+            empty = not values
+            assert chain.stat('mean', row) == (0.0 if empty else pytest.approx(np.mean(values)))
+            assert chain.stat('median', row) == (0.0 if empty else np.median(values))
+            assert chain.stat('min', row) == (0.0 if empty else min(values))
+            assert chain.stat('max', row) == (0.0 if empty else max(values))
+
+    @pytest.mark.parametrize(
+        "dtype, tolerance",
+        [
+            pytest.param('float16', 0.01, id='float16'),
+            pytest.param('uint8', (12.75 - 9.0) / 255, id='uint8'),
+        ]
+    )
+    def test_quantized_values_keep_exact_stats(self, b_factors, dtype, tolerance):
+        chain = chain_b_factors(b_factors, *self.lookup_chain_a(b_factors), dtype=dtype)
+        assert chain.values.dtype == np.dtype(dtype)
+        assert np.allclose(chain.get(0), [10.5, 11.25, 12.75], atol=tolerance)
+        assert chain.stat('mean', 0) == pytest.approx(11.5)
+
+    def test_unknown_dtype(self, b_factors):
+        with pytest.raises(ValueError):
+            chain_b_factors(b_factors, *self.lookup_chain_a(b_factors), dtype='int64')
@@ -0,0 +1,91 @@
+import pytest
+import numpy as np
+
+from struct_draw.algorithms.base_algorithm import RESIDUE_DTYPE
+from struct_draw.structures.pdb_model import Chain
+from struct_draw.structures.readers import ChainBFactors, B_FACTOR_STATS
+
+
+@pytest.fixture
+def records():
+    rows = [(1, ' ', 0, 'M', 'Helix', 'H'),
+            (2, 'A', 0, 'K', 'Strand', 'E'),
+            (3, ' ', 0, 'G', 'Other', '-')]
+    return np.array(rows, dtype=RESIDUE_DTYPE)
+
+
+@pytest.fixture
+def chain(records):
+    chain = Chain('A', 'dssp', 'model', records)
+    values = np.array([1.0, 3.0, 5.0, 7.0], dtype=np.float32)
+    offsets = np.array([0, 2, 2, 4])
+    stats = {name: np.array([2.0, 0.0, 6.0]) for name in B_FACTOR_STATS}
+    chain.b_factors = ChainBFactors(values, offsets, stats)
+    return chain
+
+
+class TestResidueTable:
+    def test_columns(self, chain):
+        table = chain.table
+        assert table.residue_index.dtype == np.int32
+        assert all(column.dtype == np.uint8 for column in
+                   (table.insertion_code, table.amino_acid, table.ss, table.ss_code))
+        assert table.secondary_structure.tolist() == ['Helix', 'Strand', 'Other']
+        assert table.amino_acids.tolist() == ['M', 'K', 'G']
+
+    def test_residue_proxies(self, chain):
+        residues = chain.residues
+        assert len(residues) == 3
+        res = residues[1]
+        assert (res.index, res.insertion_code, res.amino_acid, res.secondary_structure, res.ss_code) == \
+            (2, 'A', 'K', 'Strand', 'E')
+        assert residues[0].b_factors.tolist() == [1.0, 3.0]
+        assert residues[-1].b_factor_stat('mean') == 6.0
+        assert [r.amino_acid for r in residues[1:]] == ['K', 'G']
+        with pytest.raises(IndexError):
+            residues[3]
+
+    def test_align_seq_inserts_gaps(self, chain):
+        chain.align_seq('-MK--G')
+        table = chain.table
+        assert table.data_row.tolist() == [-1, 0, 1, -1, -1, 2]
+        assert table.secondary_structure.tolist() == ['gap', 'Helix', 'Strand', 'gap', 'gap', 'Other']
+        assert table.b_factor_stat('mean').tolist() == [0.0, 2.0, 0.0, 0.0, 0.0, 6.0]
+        gap = chain.residues[0]
+        assert (gap.index, gap.insertion_code, gap.amino_acid, gap.secondary_structure, gap.ss_code) == \
+            ('-', ' ', '', 'gap', '-')
+        assert gap.b_factors.size == 0 and gap.b_factor_stat('max') == 0.0
+        assert chain.residues[5].b_factors.tolist() == [5.0, 7.0]
+
+    def test_empty_chain(self):
+        chain = Chain('A', 'dssp', 'model', np.array([], dtype=RESIDUE_DTYPE))
+        chain.align_seq('--')
+        assert chain.table.secondary_structure.tolist() == ['gap', 'gap']
+
+
+class TestAlignSeq:
+    def test_index_maps(self, chain):
+        assert chain.column_to_residue.tolist() == [0, 1, 2]
+        chain.align_seq('-MK--G')
+        assert chain.column_to_residue.dtype == np.int32
+        assert chain.column_to_residue.tolist() == [-1, 0, 1, -1, -1, 2]
+        assert chain.residue_to_column.tolist() == [1, 2, 5]
+
+    def test_realignment_composes_maps(self, chain):
+        chain.align_seq('M-KG')
+        chain.align_seq('-MXXX-')
+        assert chain.column_to_residue.tolist() == [-1, 0, -1, 1, 2, -1]
+        assert chain.residue_to_column.tolist() == [1, 3, 4]
+        assert chain.table.amino_acids.tolist() == ['', 'M', '', 'K', 'G', '']
+
+    @pytest.mark.parametrize(
+        "aligned_seq",
+        [
+            pytest.param('-MK-', id='too_few_residues'),
+            pytest.param('MKGA-', id='too_many_residues'),
+        ]
+    )
+    def test_length_mismatch(self, chain, aligned_seq):
+        with pytest.raises(ValueError, match="has 3"):
+            chain.align_seq(aligned_seq)
+        assert len(chain.table) == 3
@@ -0,0 +1,115 @@
+import gzip
+
+import pytest
+import numpy as np
+
+from struct_draw.compression import InMemoryFile
+from struct_draw.structures import BaseModel, SequenceModel, SequenceRecords, iter_sequence_models, read_sequence_records
+
+SS_TXT = """>101M:A:sequence
+MVLSEGEWQL
+VLHV
+>101M:A:secstr
+    HHHHHH
+HH
+>101M:B:sequence
+MK
+>101M:B:secstr
+EE
+>102L:A:sequence
+ACD
+>102L:A:secstr
+ G
+"""
+
+
+def ss_codes(chain):
+    return ''.join(chain.dssp_data['SS_code'].tolist())
+
+
+class TestSequenceModel:
+    def test_chain_from_strings(self):
+        model = SequenceModel.from_strings("MKVLAG", "CHHHE-", model_id="pred", algorithm="psipred")
+        chain = model.get_chain("A")
+        assert chain.dssp_data['residue_index'].tolist() == [1, 2, 3, 4, 5, 6]
+        assert ''.join(chain.dssp_data['AA'].tolist()) == "MKVLAG"
+        assert chain.dssp_data['SS'].tolist() == ['Other', 'Helix', 'Helix', 'Helix', 'Strand', 'Other']
+        assert (chain.model_id, chain.algorithm) == ("pred", "psipred")
+        assert chain.b_factors is None
+
+    def test_confidence_as_b_factors(self):
+        model = SequenceModel.from_strings("MKV", "HHE", confidence=[90.0, np.nan, 40.0], chain_id="X")
+        b_factors = model.get_chain("X").b_factors
+        assert b_factors.offsets.tolist() == [0, 1, 1, 2]
+        assert b_factors.stats['min'][[0, 2]].tolist() == [90.0, 40.0]
+
+    def test_multiple_chains_and_filters(self):
+        records = SequenceRecords.from_strings({"B": ("MKVL", "HHHH"), "A": ("GG", "EE")}, {"B": [1, 2, 3, 4]},
+                                               entry_id="1ABC")
+        model = SequenceModel(records, include_only=["B"], residue_range=(2, 3), first_residue=0, lazy=True)
+        assert list(model.get_chain_list()) == ["B"]
+        chain = model.get_chain("B")
+        assert chain.dssp_data['residue_index'].tolist() == [2, 3]
+        assert chain.b_factors.stats['mean'].tolist() == [3.0, 4.0]
+        assert chain.model_id == "1ABC"
+
+    @pytest.mark.parametrize("chains, confidence", [
+        pytest.param({"A": ("MKV", "HH")}, None, id='ss_length'),
+        pytest.param({"A": ("MKV", "HHH")}, {"A": [1.0]}, id='confidence_length'),
+    ])
+    def test_length_mismatch(self, chains, confidence):
+        with pytest.raises(ValueError, match="residues"):
+            SequenceRecords.from_strings(chains, confidence)
+
+    def test_snapshot(self, tmp_path):
+        model = SequenceModel.from_strings("MKV", "HHE", confidence=[1.0, 2.0, 3.0], model_id="pred")
+        model.save(str(tmp_path / "model.npz"))
+        loaded = BaseModel.load(str(tmp_path / "model.npz"))
+        assert isinstance(loaded, SequenceModel)
+        assert ss_codes(loaded.get_chain("A")) == "HHE"
+        assert loaded.get_chain("A").b_factors.stats['max'].tolist() == [1.0, 2.0, 3.0]
+
+
+class TestReadSequenceRecords:
+    @pytest.mark.parametrize("newline", ["\n", "\r\n"])
+    def test_wrapped_pairs(self, newline):
+        records = read_sequence_records(InMemoryFile(SS_TXT.replace("\n", newline).encode(), ".txt"))
+        assert records.entry_ids.tolist() == ["101M", "101M", "102L"]
+        assert records.chain_ids.tolist() == ["A", "B", "A"]
+        assert records.offsets.tolist() == [0, 14, 16, 19]
+        assert records.aa.tobytes() == b"MVLSEGEWQLVLHVMKACD"
+        # Spaces are coils and short SS strings are padded with coils
+        assert records.ss.tobytes() == b"----HHHHHHHH--EE-G-"
+        assert records.entry_bounds().tolist() == [0, 2, 3]
+
+    def test_headers_without_kind(self, tmp_path):
+        path = tmp_path / "pred.fa.gz"
+        path.write_bytes(gzip.compress(b">P1\nMKV\n>P1\nHHE\n>P2\nAC\n>P2\nCC\n"))
+        records = read_sequence_records(str(path))
+        assert records.entry_ids.tolist() == ["P1", "P2"]
+        assert records.chain_ids.tolist() == ["A", "A"]
+        assert records.ss.tobytes() == b"HHECC"
+
+    def test_empty(self):
+        records = read_sequence_records(InMemoryFile(b"", ".txt"))
+        assert len(records) == 0 and records.offsets.tolist() == [0]
+        assert list(iter_sequence_models(InMemoryFile(b"", ".txt"))) == []
+
+    @pytest.mark.parametrize("text, match", [
+        pytest.param(">1:A:sequence\nMK\n", "pairs", id='odd_count'),
+        pytest.param(">1:A:secstr\nHH\n>1:A:sequence\nMK\n", "followed", id='swapped'),
+        pytest.param(">1:A:sequence\nMK\n>1:B:secstr\nHH\n", "different chains", id='other_chain'),
+        pytest.param(">1:A:sequence\nMK\n>1:A:secstr\nHHH\n", "longer", id='long_ss'),
+    ])
+    def test_invalid(self, text, match):
+        with pytest.raises(ValueError, match=match):
+            read_sequence_records(InMemoryFile(text.encode(), ".txt"))
+
+
+def test_iter_sequence_models():
+    models = list(iter_sequence_models(InMemoryFile(SS_TXT.encode(), ".txt"), algorithm="pdb"))
+    assert [model.model_id for model in models] == ["101M", "102L"]
+    assert list(models[0].get_chain_list()) == ["A", "B"]
+    assert ss_codes(models[0].get_chain("B")) == "EE"
+    assert ss_codes(models[1].get_chain("A")) == "-G-"
+    assert models[1].get_chain("A").algorithm == "pdb"
@@ -0,0 +1,84 @@
+import pytest
+import numpy as np
+
+from struct_draw.structures.contacts import residue_contacts
+from struct_draw.structures.readers import ResidueCoordinates, pack_residue_keys
+from struct_draw.structures.spatial import CellList
+
+
+def brute_force_pairs(points, radius):
+    distances = np.linalg.norm(points[:, None] - points[None], axis=2)
+    first, second = np.nonzero(np.triu(distances <= radius, 1))
+    return sorted(zip(first.tolist(), second.tolist()))
+
+
+POINT_SETS = [
+    pytest.param(np.zeros((0, 3)), id='empty'),
+    pytest.param(np.array([[1.0, 2.0, 3.0]]), id='single'),
+    pytest.param(np.random.default_rng(0).uniform(0, 20, (400, 3)), id='dense'),
+    pytest.param(np.random.default_rng(1).uniform(-100, 100, (300, 3)), id='sparse'),
+    pytest.param(np.repeat(np.random.default_rng(2).uniform(0, 5, (20, 3)), 3, axis=0), id='duplicates'),
+]
+
+
+class TestCellList:
+    @pytest.mark.parametrize("points", POINT_SETS)
+    @pytest.mark.parametrize("radius", [1.0, 2.5])
+    def test_pairs_match_brute_force(self, points, radius):
+        first, second = CellList(points, 2.5).pairs(radius)
+        assert (first < second).all()
+        assert sorted(zip(first.tolist(), second.tolist())) == brute_force_pairs(points, radius)
+
+    @pytest.mark.parametrize("points", POINT_SETS)
+    def test_query_matches_brute_force(self, points):
+        # Query points reach past the grid on every side
+        queries = np.random.default_rng(3).uniform(-30, 30, (60, 3)) + (points.mean(axis=0) if len(points) else 0)
+        index = CellList(points, 3.0)
+        offsets, neighbors = index.query(queries, 3.0)
+        for row, query in enumerate(queries):
+            expected = np.flatnonzero(np.linalg.norm(points - query, axis=1) <= 3.0)
+            assert neighbors[offsets[row]:offsets[row + 1]].tolist() == expected.tolist()
+        assert index.count(queries, 3.0).tolist() == np.diff(offsets).tolist()
+
+    def test_radius_larger_than_cells(self):
+        with pytest.raises(ValueError, match="cell size"):
+            CellList(np.zeros((2, 3)), 2.0).pairs(2.5)
+
+    @pytest.mark.parametrize("points, cell_size", [
+        pytest.param(np.zeros((2, 2)), 1.0, id='not_3d'),
+        pytest.param(np.array([[0.0, np.nan, 0.0]]), 1.0, id='nan'),
+        pytest.param(np.zeros((2, 3)), 0.0, id='zero_cell'),
+    ])
+    def test_invalid_input(self, points, cell_size):
+        with pytest.raises(ValueError):
+            CellList(points, cell_size)
+
+
+def make_coordinates(residues):
+    """
+    ResidueCoordinates from {(chain_id, residue number): [atom positions]}, chains given in sorted order.
+    """
+    chain_ids = np.array(sorted({chain_id for chain_id, _ in residues}))
+    ordered = sorted(residues, key=lambda key: (np.searchsorted(chain_ids, key[0]), key[1]))
+    keys = pack_residue_keys(np.array([np.searchsorted(chain_ids, chain_id) for chain_id, _ in ordered]),
+                             np.array([number for _, number in ordered]), np.full(len(ordered), ord(' ')))
+    sizes = [len(residues[key]) for key in ordered]
+    offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+    values = np.array([atom for key in ordered for atom in residues[key]], dtype=np.float32)
+    return ResidueCoordinates(chain_ids, keys, offsets, values)
+
+
+def test_residue_contacts():
+    coordinates = make_coordinates({
+        ('A', 1): [(0, 0, 0), (1, 0, 0)],
+        ('A', 2): [(4, 0, 0), (5, 0, 0)],      # 3 Å from A1
+        ('A', 3): [(30, 0, 0)],                # isolated
+        ('B', 1): [(9, 0, 0), (9, 1, 0)],      # 4 Å from A2
+        ('B', 2): [(9, 4, 0)],                 # 3 Å from B1, 5.7 Å from A2
+    })
+    contacts = residue_contacts(coordinates, radius=4.5)
+    assert contacts.pairs.tolist() == [[0, 1], [1, 3], [3, 4]]
+    assert contacts.counts['total'].tolist() == [1, 2, 0, 2, 1]
+    assert contacts.counts['interface'].tolist() == [0, 1, 0, 1, 0]
+    positions, found = contacts.lookup('B', np.array([2, 1, 7]), np.full(3, ord(' ')))
+    assert contacts.chain_counts(positions, found)['total'].tolist() == [1, 2, 0]
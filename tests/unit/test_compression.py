@@ -0,0 +1,92 @@
+import bz2
+import gzip
+import io
+import lzma
+import subprocess
+
+import pytest
+
+from struct_draw.compression import (InMemoryFile, algorithm_input, detect_compression, open_text,
+                                     strip_compression_suffix)
+
+CONTENT = "".join(f"ATOM  {i:5d}\n" for i in range(20000))
+
+COMPRESSORS = [
+    pytest.param(gzip.compress, '.gz', 'gzip', id='gzip'),
+    pytest.param(bz2.compress, '.bz2', 'bz2', id='bz2'),
+    pytest.param(lzma.compress, '.xz', 'xz', id='xz'),
+]
+
+
+@pytest.fixture
+def write_compressed(tmp_path):
+    def _write(compress, suffix):
+        path = tmp_path / f"model.pdb{suffix}"
+        path.write_bytes(compress(CONTENT.encode()))
+        return str(path)
+    return _write
+
+
+@pytest.mark.parametrize("compress, suffix, name", COMPRESSORS)
+def test_detect_and_open_text(write_compressed, compress, suffix, name):
+    path = write_compressed(compress, suffix)
+    assert detect_compression(path) == name
+    assert strip_compression_suffix(path).endswith("model.pdb")
+    with open_text(path) as fh:
+        assert fh.read() == CONTENT
+
+
+def test_plain_file(tmp_path):
+    path = tmp_path / "model.pdb"
+    path.write_text(CONTENT)
+    assert detect_compression(str(path)) is None
+    with algorithm_input(str(path)) as source:
+        assert source.path == str(path) and source.pass_fds == ()
+
+
+@pytest.mark.parametrize("use_pipe", [pytest.param(True, id='pipe'), pytest.param(False, id='scratch')])
+@pytest.mark.parametrize("compress, suffix, name", COMPRESSORS)
+def test_algorithm_input(write_compressed, compress, suffix, name, use_pipe):
+    path = write_compressed(compress, suffix)
+    with algorithm_input(path, use_pipe) as source:
+        if not use_pipe:
+            assert source.path.endswith('.pdb')
+        out = subprocess.run(["cat", source.path], pass_fds=source.pass_fds,
+                             capture_output=True, text=True, check=True).stdout
+    assert out == CONTENT
+
+
+def test_reader_stops_early(write_compressed):
+    path = write_compressed(gzip.compress, '.gz')
+    with algorithm_input(path) as source:
+        out = subprocess.run(["head", "-c", "5", source.path], pass_fds=source.pass_fds,
+                             capture_output=True, text=True, check=True).stdout
+    assert out == CONTENT[:5]
+
+
+@pytest.mark.parametrize("source", [
+    pytest.param(lambda data: data, id='bytes'),
+    pytest.param(memoryview, id='memoryview'),
+    pytest.param(io.BytesIO, id='file'),
+    pytest.param(gzip.compress, id='gzip'),
+])
+def test_in_memory_file_from_source(source):
+    in_memory = InMemoryFile.from_source(source(CONTENT.encode()), '.pdb')
+    assert bytes(in_memory.data) == CONTENT.encode()
+    assert in_memory.suffix == '.pdb'
+    assert detect_compression(in_memory) is None
+
+
+def test_in_memory_file_keeps_buffer():
+    data = bytearray(CONTENT.encode())
+    assert InMemoryFile.from_source(memoryview(data)).data.obj is data
+
+
+@pytest.mark.parametrize("use_pipe", [pytest.param(True, id='pipe'), pytest.param(False, id='scratch')])
+def test_algorithm_input_in_memory(use_pipe):
+    with algorithm_input(InMemoryFile(CONTENT.encode(), '.cif'), use_pipe) as source:
+        if not use_pipe:
+            assert source.path.endswith('.cif')
+        out = subprocess.run(["cat", source.path], pass_fds=source.pass_fds,
+                             capture_output=True, text=True, check=True).stdout
+    assert out == CONTENT